@@ -0,0 +1,162 @@
+# ABOUTME: Benchmarks the hot cache queries on a synthetic library, with and without managed indexes.
+# ABOUTME: Prints each query's plan and median time; run with `uv run python benchmarks/cache_queries.py`.
+
+"""Time the cache queries a scrape/embed/sync run issues, with and without the managed indexes."""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from booklore_enrich.commands.discover import filter_known_books
+from booklore_enrich.commands.scrape import CLAIM_BATCH_SIZE
+from booklore_enrich.db import INDEXES, Database
+
+# Indexes that predate the managed set; kept in both runs
+BASELINE_INDEXES = {"idx_books_file_path", "idx_scrape_jobs_claim"}
+
+TAG_VOCABULARY = 300
+
+
+def build_cache(db: Database, books: int, seed: int = 1):
+    """Fill the cache with a library that looks like a mostly-enriched one."""
+    rng = random.Random(seed)
+    db.upsert_books_by_path_bulk(
+        {"file_path": f"/nas/books/Author {i % 5000}/Book {i}.epub",
+         "title": f"Book {i}", "author": f"Author {i % 5000}"}
+        for i in range(books))
+    with db.transaction():
+        db.conn.executemany(
+            "INSERT INTO tags (name, category, source) VALUES (?, ?, 'romance.io')",
+            [(f"trope-{t}", "subgenre" if t % 10 == 0 else "trope")
+             for t in range(TAG_VOCABULARY)])
+        ids = [row[0] for row in db.execute("SELECT id FROM books").fetchall()]
+        matched = [i for i in ids if rng.random() < 0.85]
+        db.conn.executemany(
+            """UPDATE books SET romance_io_id = printf('%024x', id),
+                   last_scraped_at = CURRENT_TIMESTAMP WHERE id = ?""",
+            [(i,) for i in matched])
+        db.conn.executemany(
+            "UPDATE books SET booknaut_id = printf('bn%d', id) WHERE id = ?",
+            [(i,) for i in ids if rng.random() < 0.6])
+        db.conn.executemany(
+            "UPDATE books SET embedded_at = CURRENT_TIMESTAMP WHERE id = ?",
+            [(i,) for i in matched if rng.random() < 0.75])
+        db.conn.executemany(
+            "INSERT OR IGNORE INTO book_tags (book_id, tag_id) VALUES (?, ?)",
+            [(i, rng.randint(1, TAG_VOCABULARY)) for i in matched for _ in range(8)])
+        db.conn.executemany(
+            "INSERT INTO book_steam (book_id, level) VALUES (?, ?)",
+            [(i, rng.randint(1, 5)) for i in matched if rng.random() < 0.8])
+        # Every book has been through the queue once; most misses are in backoff
+        db.conn.executemany(
+            """INSERT INTO scrape_jobs (book_id, source, status, enqueued_at)
+               VALUES (?, 'romance.io', 'done', '2026-01-01T00:00:00+00:00')""",
+            [(i,) for i in ids])
+        unmatched = set(ids) - set(matched)
+        db.conn.executemany(
+            """INSERT INTO scrape_attempts
+                   (book_id, source, attempts, last_outcome, last_attempt_at, next_attempt_at)
+               VALUES (?, 'romance.io', ?, 'not_found', '2026-01-01T00:00:00+00:00', ?)""",
+            [(i, rng.randint(1, 5),
+              "2000-01-01T00:00:00+00:00" if rng.random() < 0.3 else "2999-01-01T00:00:00+00:00")
+             for i in unmatched])
+    # The rerun's queue: misses out of backoff are pending again
+    db.enqueue_scrape_jobs("romance.io")
+
+
+def queries(db: Database, candidates):
+    """(label, setup or None, call) per hot query; setup runs untimed before each call."""
+    def finish_pass():
+        db.execute("UPDATE scrape_jobs SET status = 'done'")
+        db.conn.commit()
+
+    def requeue():
+        db.execute("UPDATE scrape_jobs SET status = 'pending' WHERE status != 'done'")
+        db.release_worker_jobs("bench")
+
+    return [
+        ("enqueue_scrape_jobs", finish_pass, lambda: db.enqueue_scrape_jobs("romance.io")),
+        ("claim_scrape_jobs", requeue,
+         lambda: db.claim_scrape_jobs("romance.io", "bench", CLAIM_BATCH_SIZE)),
+        ("filter_known_books", None, lambda: filter_known_books(db, candidates, "romance.io")),
+        ("count_embeddable_books", None, db.count_embeddable_books),
+        ("iter_embeddable_books", None, lambda: sum(1 for _ in db.iter_embeddable_books())),
+        ("iter_enriched_books", None, lambda: sum(1 for _ in db.iter_enriched_books())),
+    ]
+
+
+def traced_sql(db: Database, call) -> str:
+    """The first statement a call issues, with its parameters bound, for EXPLAIN."""
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        result = call()
+        if not isinstance(result, (int, list)):
+            next(result, None)
+    finally:
+        db.conn.set_trace_callback(None)
+    return next(sql for sql in statements if not sql.startswith(("BEGIN", "SAVEPOINT")))
+
+
+def median_seconds(setup, call, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run(db: Database, repeats: int, candidates):
+    """Time each query end to end and print the plan of its (first) statement."""
+    # Put back any batch the last run left claimed, so both runs ANALYZE the same data
+    db.release_worker_jobs("bench")
+    db.execute("ANALYZE")
+    db.conn.commit()
+    results = {}
+    for label, setup, call in queries(db, candidates):
+        if setup:
+            setup()
+        sql = traced_sql(db, call)
+        plan = [row[3] for row in db.execute(f"EXPLAIN QUERY PLAN {sql}")]
+        results[label] = median_seconds(setup, call, repeats)
+        print(f"  {label:<24} {results[label] * 1000:7.1f} ms   {' / '.join(plan)}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--books", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "bench.db")
+        start = time.perf_counter()
+        build_cache(db, args.books)
+        print(f"Built a {args.books:,}-book cache in {time.perf_counter() - start:.1f}s\n")
+        candidates = [{"source_id": f"{i:024x}"} for i in range(0, args.books * 2, 7)]
+
+        managed = [name for name in INDEXES if name not in BASELINE_INDEXES]
+        for name in managed:
+            db.execute(f"DROP INDEX {name}")
+        print("Without managed indexes:")
+        before = run(db, args.repeats, candidates)
+
+        db._ensure_indexes()
+        print("\nWith managed indexes:")
+        after = run(db, args.repeats, candidates)
+
+        print("\nSpeedup:")
+        for label, seconds in before.items():
+            print(f"  {label:<24} {seconds / after[label]:6.1f}x")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# ABOUTME: Compressed, content-addressed archive of raw HTML fetched by the scraper.
+# ABOUTME: Lets parser improvements be re-applied offline without re-scraping.
+
+import datetime
+import hashlib
+import lzma
+import sqlite3
+import zlib
+from pathlib import Path
+from typing import Optional, Tuple
+
+DEFAULT_ARCHIVE_PATH = Path.home() / ".config" / "booklore-enrich" / "archive.db"
+DEFAULT_TTL_DAYS = 90
+
+CODECS = {
+    "zlib": (lambda data: zlib.compress(data, 9), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS fetches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    fetched_at TIMESTAMP NOT NULL,
+    digest TEXT NOT NULL,
+    FOREIGN KEY (digest) REFERENCES blobs(digest)
+);
+
+CREATE INDEX IF NOT EXISTS idx_fetches_url ON fetches(url, fetched_at);
+"""
+
+
+def page_kind(url: str) -> str:
+    """Classify a scraped URL as a "book", "search" or "topic" page."""
+    if "/books/" in url:
+        return "book"
+    if "/search" in url:
+        return "search"
+    if "/topics/" in url:
+        return "topic"
+    return "page"
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class HtmlArchive:
+    """Stores every fetched page, deduplicated by SHA-256 of its HTML.
+
+    Each fetch is recorded against its URL and time; identical HTML fetched
+    twice is stored once. Fetches older than `ttl_days` are ignored by lookups
+    and removed by `prune`.
+    """
+
+    def __init__(self, path: Path = DEFAULT_ARCHIVE_PATH, ttl_days: int = DEFAULT_TTL_DAYS,
+                 codec: str = "zlib"):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown archive codec: {codec}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_days = ttl_days
+        self.codec = codec
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(ARCHIVE_SCHEMA)
+        self.conn.commit()
+
+    def _cutoff(self) -> str:
+        return (_utcnow() - datetime.timedelta(days=self.ttl_days)).isoformat()
+
+    def store(self, url: str, html: str, kind: Optional[str] = None) -> Optional[str]:
+        """Archive a page's HTML. Returns its digest, or None for empty pages."""
+        if not html:
+            return None
+        raw = html.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        compress, _ = CODECS[self.codec]
+        exists = self.conn.execute(
+            "SELECT 1 FROM blobs WHERE digest = ?", (digest,)
+        ).fetchone()
+        if not exists:
+            self.conn.execute(
+                "INSERT INTO blobs (digest, codec, size, data) VALUES (?, ?, ?, ?)",
+                (digest, self.codec, len(raw), compress(raw)),
+            )
+        self.conn.execute(
+            "INSERT INTO fetches (url, kind, fetched_at, digest) VALUES (?, ?, ?, ?)",
+            (url, kind or page_kind(url), _utcnow().isoformat(), digest),
+        )
+        self.conn.commit()
+        return digest
+
+    def _load_blob(self, digest: str) -> str:
+        codec, data = self.conn.execute(
+            "SELECT codec, data FROM blobs WHERE digest = ?", (digest,)
+        ).fetchone()
+        _, decompress = CODECS[codec]
+        return decompress(data).decode("utf-8")
+
+    def latest(self, url: str) -> Optional[str]:
+        """Return the newest unexpired HTML archived for exactly this URL."""
+        row = self.conn.execute(
+            """SELECT digest FROM fetches WHERE url = ? AND fetched_at >= ?
+               ORDER BY fetched_at DESC, id DESC LIMIT 1""",
+            (url, self._cutoff()),
+        ).fetchone()
+        return self._load_blob(row[0]) if row else None
+
+    def latest_with_prefix(self, prefix: str) -> Optional[Tuple[str, str]]:
+        """Return (url, html) of the newest unexpired fetch whose URL starts with prefix.
+
+        Book pages are archived as /books/{id}/{slug}; the cache only keeps the
+        id, so lookups match on the /books/{id}/ prefix.
+        """
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        row = self.conn.execute(
+            """SELECT url, digest FROM fetches
+               WHERE url LIKE ? ESCAPE '\\' AND fetched_at >= ?
+               ORDER BY fetched_at DESC, id DESC LIMIT 1""",
+            (escaped + "%", self._cutoff()),
+        ).fetchone()
+        return (row[0], self._load_blob(row[1])) if row else None
+
+    def prune(self) -> int:
+        """Delete expired fetches and any blobs no longer referenced. Returns fetches removed."""
+        cursor = self.conn.execute(
+            "DELETE FROM fetches WHERE fetched_at < ?", (self._cutoff(),)
+        )
+        self.conn.execute(
+            "DELETE FROM blobs WHERE digest NOT IN (SELECT digest FROM fetches)"
+        )
+        self.conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        self.conn.close()
@@ -38,10 +38,47 @@ def export(output, username):
 @click.option("--limit", "-l", type=int, default=0, help="Max books to scrape per source (0=all).")
 @click.option("--from-dir", type=click.Path(exists=True), default=None,
               help="Discover books from filesystem instead of BookLore API")
-def scrape(source, limit, from_dir):
+@click.option("--ignore-backoff", is_flag=True,
+              help="Retry unmatched books even if their backoff window hasn't expired.")
+@click.option("--max-duration", default=None,
+              help="Stop starting new books after this long (e.g. 90m, 2h, 3600).")
+@click.option("--max-requests", type=click.IntRange(min=0), default=0,
+              help="Stop after this many searches/page fetches (0=unlimited).")
+def scrape(source, limit, from_dir, ignore_backoff, max_duration, max_requests):
     """Scrape trope/heat metadata from romance.io and thebooknaut.com."""
-    from booklore_enrich.commands.scrape import run_scrape
-    run_scrape(source=source, limit=limit, from_dir=from_dir)
+    from booklore_enrich.commands.scrape import parse_duration, run_scrape
+
+    try:
+        seconds = parse_duration(max_duration) if max_duration else 0
+    except ValueError:
+        raise click.BadParameter(f"can't parse duration {max_duration!r}", param_hint="--max-duration")
+    if max_duration and not seconds > 0:
+        raise click.BadParameter(f"duration must be positive, got {max_duration!r}",
+                                 param_hint="--max-duration")
+    run_scrape(source=source, limit=limit, from_dir=from_dir, ignore_backoff=ignore_backoff,
+               max_duration=seconds, max_requests=max_requests)
+
+
+@cli.command()
+def reparse():
+    """Rebuild tags and steam levels from archived HTML, without re-scraping."""
+    from booklore_enrich.commands.reparse import run_reparse
+    run_reparse()
+
+
+@cli.command("scraper-daemon")
+@click.option("--socket", "socket_path", type=click.Path(dir_okay=False), default=None,
+              help="Unix socket path (default: ~/.config/booklore-enrich/scraper.sock).")
+@click.option("--pool-size", type=click.IntRange(min=0), default=0,
+              help="Browser pages to keep open (0=max_concurrent per source).")
+def scraper_daemon(socket_path, pool_size):
+    """Keep a warm browser running for scrape and discover to reuse."""
+    from pathlib import Path
+
+    from booklore_enrich.commands.daemon import run_scraper_daemon
+    from booklore_enrich.scraper.daemon import DEFAULT_SOCKET_PATH
+    run_scraper_daemon(Path(socket_path) if socket_path else DEFAULT_SOCKET_PATH,
+                       pool_size=pool_size)
 
 
 @cli.command()
@@ -1,2 +1,2 @@
 # ABOUTME: CLI command implementations for booklore-enrich.
-# ABOUTME: Each module implements one CLI command (export, scrape, tag, discover).
+# ABOUTME: Each module implements one CLI command (export, scrape, reparse, tag, discover, daemon).
@@ -0,0 +1,78 @@
+# ABOUTME: scraper-daemon command that keeps a warm browser serving fetches over a Unix socket.
+# ABOUTME: scrape and discover use it automatically while it runs, skipping browser startup.
+
+import asyncio
+import signal
+from pathlib import Path
+from typing import Optional
+
+from rich.console import Console
+
+from booklore_enrich.archive import HtmlArchive
+from booklore_enrich.commands.scrape import SOURCES
+from booklore_enrich.config import load_config, make_rate_limiter, scraper_options
+from booklore_enrich.scraper.base import BrowserScraper
+from booklore_enrich.scraper.daemon import DEFAULT_SOCKET_PATH, ScraperDaemon
+from booklore_enrich.scraper.rate_limit import HostRateLimiter
+
+console = Console()
+
+# How often the daemon writes its adapted per-host delays to disk
+RATE_STATE_SAVE_INTERVAL = 60.0
+
+
+async def _save_periodically(rate_limiter: HostRateLimiter):
+    while True:
+        await asyncio.sleep(RATE_STATE_SAVE_INTERVAL)
+        rate_limiter.save()
+
+
+async def serve(scraper: BrowserScraper, socket_path: Path,
+                rate_limiter: Optional[HostRateLimiter] = None):
+    """Start the scraper and serve it until SIGINT/SIGTERM."""
+    await scraper.start()
+    daemon = ScraperDaemon(scraper, socket_path)
+    saver = asyncio.create_task(_save_periodically(rate_limiter)) if rate_limiter else None
+    try:
+        await daemon.start()
+        if scraper.is_cdp:
+            mode = f"Chrome via CDP at {', '.join(scraper.connected_endpoints)}"
+        else:
+            mode = "stealth browser"
+        console.print(f"Scraper daemon ({mode}) listening on {socket_path}")
+        console.print("[dim]Press Ctrl+C to stop.[/dim]")
+
+        stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stopping.set)
+        serving = asyncio.create_task(daemon.serve_forever())
+        await stopping.wait()
+        serving.cancel()
+    finally:
+        if saver:
+            saver.cancel()
+        await daemon.stop()
+        await scraper.stop()
+
+
+def run_scraper_daemon(socket_path: Path = DEFAULT_SOCKET_PATH, pool_size: int = 0):
+    """Execute the scraper-daemon command."""
+    config = load_config()
+    archive = None
+    if config.archive_enabled:
+        archive = HtmlArchive(ttl_days=config.archive_ttl_days, codec=config.archive_compression)
+        archive.prune()
+    rate_limiter = make_rate_limiter(config)
+    scraper = BrowserScraper(
+        headless=config.headless, rate_limit=config.rate_limit_seconds,
+        pool_size=pool_size or config.max_concurrent * len(SOURCES),
+        rate_limiter=rate_limiter, archive=archive, **scraper_options(config),
+    )
+    try:
+        asyncio.run(serve(scraper, socket_path, rate_limiter))
+    finally:
+        rate_limiter.save()
+        if archive is not None:
+            archive.close()
+        console.print("Scraper daemon stopped.")
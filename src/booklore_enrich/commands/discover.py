@@ -2,14 +2,16 @@
 # ABOUTME: Checks topic pages for romance, sci-fi, and fantasy recommendations.
 
 import asyncio
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from rich.console import Console
 from rich.table import Table
 
-from booklore_enrich.config import load_config
+from booklore_enrich.config import load_config, make_rate_limiter, scraper_options
 from booklore_enrich.db import Database
-from booklore_enrich.scraper.base import BrowserScraper, parse_search_results
+from booklore_enrich.scraper.base import search_results_from_extract
+from booklore_enrich.scraper.daemon import open_scraper
+from booklore_enrich.scraper.rate_limit import HostRateLimiter
 
 console = Console()
 
@@ -43,14 +45,17 @@ def filter_known_books(db: Database, candidates: List[Dict[str, Any]],
 
 
 async def discover_from_source(db: Database, source: str, tropes: List[str],
-                                headless: bool, rate_limit: float) -> List[Dict[str, Any]]:
+                                headless: bool, rate_limit: float,
+                                rate_limiter: Optional[HostRateLimiter] = None,
+                                options: Optional[Dict[str, Any]] = None
+                                ) -> List[Dict[str, Any]]:
     """Discover new books from a source by checking topic pages."""
     urls = build_topic_urls(source, tropes)
     if not urls:
         return []
 
-    scraper = BrowserScraper(headless=headless, rate_limit=rate_limit)
-    await scraper.start()
+    scraper = await open_scraper(headless=headless, rate_limit=rate_limit,
+                                 rate_limiter=rate_limiter, **(options or {}))
 
     all_candidates = []
     seen_ids = set()
@@ -58,8 +63,8 @@ async def discover_from_source(db: Database, source: str, tropes: List[str],
     try:
         for url in urls:
             console.print(f"  Checking {url}...")
-            html = await scraper.fetch_page(url)
-            results = parse_search_results(html)
+            extract = await scraper.fetch_extract(url)
+            results = search_results_from_extract(extract) if extract else []
             for result in results:
                 if result["source_id"] not in seen_ids:
                     seen_ids.add(result["source_id"])
@@ -94,11 +99,16 @@ def run_discover(source: str, genre: str):
             return
 
         all_new = []
+        rate_limiter = make_rate_limiter(config)
         for src, tropes in sources_and_tropes:
             console.print(f"\nDiscovering from {src}...")
-            new_books = asyncio.run(discover_from_source(
-                db, src, tropes, config.headless, config.rate_limit_seconds
-            ))
+            try:
+                new_books = asyncio.run(discover_from_source(
+                    db, src, tropes, config.headless, config.rate_limit_seconds,
+                    rate_limiter=rate_limiter, options=scraper_options(config),
+                ))
+            finally:
+                rate_limiter.save()
             all_new.extend(new_books)
 
             # Store discoveries
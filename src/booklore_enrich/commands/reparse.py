@@ -0,0 +1,75 @@
+# ABOUTME: Reparse command that rebuilds tags and steam levels from archived HTML.
+# ABOUTME: Re-applies the current parsers offline, without touching romance.io or booknaut.
+
+from typing import Any, Dict
+
+from rich.console import Console
+from rich.progress import Progress
+
+from booklore_enrich.archive import HtmlArchive
+from booklore_enrich.commands.scrape import SOURCES, store_scraped_details
+from booklore_enrich.config import load_config
+from booklore_enrich.db import Database
+from booklore_enrich.scraper.base import parse_book_page
+
+console = Console()
+
+SOURCE_COLUMNS = {
+    "romance.io": "romance_io_id",
+    "booknaut": "booknaut_id",
+}
+
+
+def reparse_book(db: Database, archive: HtmlArchive, book: Dict[str, Any]) -> str:
+    """Rebuild one book's tags and steam level from its archived book pages.
+
+    Returns "reparsed", or "missing" when any source the book was scraped
+    from has no archived page (the book is left untouched in that case, so
+    tags from the other source aren't lost). The clear and the rebuild commit
+    together, and the book's scrape bookkeeping (last_scraped_at, retry
+    backoff) is left alone.
+    """
+    pages = []
+    for source, col in SOURCE_COLUMNS.items():
+        source_id = book.get(col)
+        if not source_id:
+            continue
+        archived = archive.latest_with_prefix(f"{SOURCES[source]}/books/{source_id}/")
+        if archived is None:
+            return "missing"
+        pages.append((source, source_id, archived[1]))
+
+    with db.transaction():
+        db.clear_book_metadata(book["id"])
+        for source, _source_id, html in pages:
+            store_scraped_details(db, book["id"], source, parse_book_page(html))
+    return "reparsed"
+
+
+def run_reparse():
+    """Execute the reparse command."""
+    config = load_config()
+    db = Database()
+    archive = HtmlArchive(ttl_days=config.archive_ttl_days, codec=config.archive_compression)
+
+    try:
+        books = db.get_scraped_books()
+        if not books:
+            console.print("[yellow]No scraped books to reparse.[/yellow]")
+            return
+
+        reparsed = 0
+        missing = 0
+        with Progress(console=console) as progress:
+            task = progress.add_task("Reparsing archived pages...", total=len(books))
+            for book in books:
+                if reparse_book(db, archive, book) == "reparsed":
+                    reparsed += 1
+                else:
+                    missing += 1
+                progress.advance(task)
+
+        console.print(f"  Reparsed {reparsed} books, {missing} without archived pages.")
+    finally:
+        archive.close()
+        db.close()
@@ -2,18 +2,38 @@
 # ABOUTME: Orchestrates browser scraping with rate limiting and SQLite caching.
 
 import asyncio
-from typing import Any, Dict, List
+import datetime
+import json
+import os
+import socket
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
 
 import click
 from rich.console import Console
 from rich.progress import Progress
 
+from booklore_enrich.archive import HtmlArchive
 from booklore_enrich.booklore_client import BookLoreClient
-from booklore_enrich.config import load_config, get_password
-from booklore_enrich.db import Database
+from booklore_enrich.config import (
+    get_password,
+    load_config,
+    make_rate_limiter,
+    scraper_options,
+)
+from booklore_enrich.db import DEFAULT_LEASE, Database
+from booklore_enrich.scraper.rate_limit import HostRateLimiter
+from booklore_enrich.search_cache import SearchCache
 
 console = Console()
 
+# Queue capacity between pipeline stages, per worker
+PIPELINE_BUFFER = 2
+
+# Books leased from scrape_jobs per claim; small, so other processes get a share
+CLAIM_BATCH_SIZE = 5
+
 SOURCES = {
     "romance.io": "https://www.romance.io",
     "booknaut": "https://www.thebooknaut.com",
@@ -22,117 +42,514 @@ SOURCES = {
 
 def sync_books_to_cache(db: Database, booklore_books: List[Dict[str, Any]]) -> int:
     """Sync BookLore book list into the local SQLite cache."""
-    count = 0
-    for book in booklore_books:
-        # BookLore nests book info under "metadata"; fall back to top-level for tests
-        meta = book.get("metadata", book)
-        authors = meta.get("authors", [])
-        # Authors can be strings or dicts with a "name" key
-        if authors and isinstance(authors[0], dict):
-            author = authors[0]["name"]
-        elif authors:
-            author = authors[0]
-        else:
-            author = "Unknown"
-        isbn = meta.get("isbn13", meta.get("isbn", meta.get("isbn10")))
-        db.upsert_book(
-            booklore_id=book["id"],
-            title=meta.get("title", ""),
-            author=author,
-            isbn=isbn,
-        )
-        count += 1
-    return count
-
-
-async def scrape_source(db: Database, source: str, limit: int, headless: bool,
-                        rate_limit: float):
-    """Scrape metadata for unscraped books from a single source."""
-    from booklore_enrich.scraper.base import BrowserScraper
-
+    return db.upsert_books_bulk(_cache_row(book) for book in booklore_books)
+
+
+def _cache_row(book: Dict[str, Any]) -> Dict[str, Any]:
+    # BookLore nests book info under "metadata"; fall back to top-level for tests
+    meta = book.get("metadata", book)
+    authors = meta.get("authors", [])
+    # Authors can be strings or dicts with a "name" key
+    if authors and isinstance(authors[0], dict):
+        author = authors[0]["name"]
+    elif authors:
+        author = authors[0]
+    else:
+        author = "Unknown"
+    return {
+        "booklore_id": book["id"],
+        "title": meta.get("title", ""),
+        "author": author,
+        "isbn": meta.get("isbn13", meta.get("isbn", meta.get("isbn10"))),
+    }
+
+
+def store_scraped_details(db: Database, book_id: int, source: str, metadata: Dict[str, Any]):
+    """Persist scraped tags, series and steam level for a book, without marking it scraped."""
+    with db.transaction():
+        # Store tags with categories
+        for tag in metadata.get("categorized_tags", []):
+            tag_id = db.get_or_create_tag(
+                tag["name"], category=tag["category"], source=source
+            )
+            db.add_book_tag(book_id, tag_id)
+
+        # Update series data from scraped page (overwrites filesystem-parsed)
+        series = metadata.get("series")
+        if series:
+            db.update_book_series(
+                book_id,
+                series=series,
+                series_index=metadata.get("series_index"),
+                series_total=metadata.get("series_total"),
+            )
+
+        # Store steam level
+        if metadata.get("steam_level"):
+            db.set_steam_level(book_id, metadata["steam_level"],
+                               metadata.get("steam_label"))
+
+
+def store_book_metadata(db: Database, book_id: int, source: str, source_id: str,
+                        metadata: Dict[str, Any]):
+    """Persist scraped tags, series and steam level for a book and mark it scraped.
+
+    All of it lands in one commit, so a crash never leaves a book half-stored.
+    """
+    with db.transaction():
+        store_scraped_details(db, book_id, source, metadata)
+        db.mark_scraped(book_id, source, source_id)
+
+
+class SlugGuesser:
+    """Decides whether the direct slug-guess lookup is paying off for a source.
+
+    A hit saves one page load and a miss costs one, so guessing stays on
+    only while the hit rate is at least break-even after a short probe.
+    """
+
+    def __init__(self, probe: int = 20, min_hit_rate: float = 0.5):
+        self.probe = probe
+        self.min_hit_rate = min_hit_rate
+        self.attempts = 0
+        self.hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        if self.attempts < self.probe:
+            return True
+        return self.hits / self.attempts >= self.min_hit_rate
+
+    def record(self, hit: bool):
+        self.attempts += 1
+        if hit:
+            self.hits += 1
+
+
+async def resolve_book(scraper, source: str, book: Dict[str, Any],
+                       search_cache: Optional[SearchCache] = None,
+                       guesser: Optional[SlugGuesser] = None
+                       ) -> Tuple[Optional[Dict[str, str]], Optional[Dict[str, Any]], bool]:
+    """Find a book's source_id/slug: search cache, then slug guess, then site search.
+
+    Returns (result, metadata, looked_up). metadata is already filled in when
+    the slug guess landed on the book page; otherwise it is None and the
+    caller still has to scrape the book page. looked_up is False when the
+    answer came from the search cache without touching the site.
+    """
+    title, author = book["title"], book["author"]
+    if search_cache is not None:
+        hit, result = search_cache.lookup(source, title, author)
+        if hit:
+            return result, None, False
+
+    result: Optional[Dict[str, str]] = None
+    metadata: Optional[Dict[str, Any]] = None
+    if guesser is not None and guesser.enabled:
+        guessed = await scraper.lookup_by_slug(SOURCES[source], title, author)
+        guesser.record(guessed is not None)
+        if guessed:
+            result = {"source_id": guessed["source_id"], "slug": guessed["slug"]}
+            metadata = guessed["metadata"]
+
+    if result is None:
+        result = await scraper.search_book(SOURCES[source], title, author)
+    if search_cache is not None:
+        search_cache.store(source, title, author, result)
+    return result, metadata, True
+
+
+def persist_outcome(db: Database, source: str, book: Dict[str, Any],
+                    result: Optional[Dict[str, str]], metadata: Optional[Dict[str, Any]],
+                    error: Optional[Exception] = None, looked_up: bool = True) -> str:
+    """Record how one book went. Returns "found", "skipped" or "failed".
+
+    Synchronous on purpose: concurrent workers never interleave one book's writes.
+    The job completion and the book's metadata commit together, so a crash
+    can't mark a job done without its results (or store results twice).
+    A cached "no match" (looked_up False) isn't a new attempt, so it leaves
+    the book's backoff alone.
+    """
+    if error is not None:
+        console.print(f"\n  [red]Error scraping '{book['title']}': {error}[/red]")
+    with db.transaction():
+        db.complete_scrape_job(book["id"], source)
+        if error is not None:
+            db.record_scrape_attempt(book["id"], source, "error")
+            return "failed"
+        if not result:
+            if looked_up:
+                db.record_scrape_attempt(book["id"], source, "not_found")
+            return "skipped"
+        store_book_metadata(db, book["id"], source, result["source_id"], metadata)
+    return "found"
+
+
+class RunBudget:
+    """Time and request limits for one scrape run; 0 means unlimited.
+
+    Requests are the searches and page fetches the run asks the scraper
+    for (search-cache hits cost nothing). Once spent, no new books start.
+    """
+
+    def __init__(self, max_duration: float = 0, max_requests: int = 0):
+        self.max_duration = max_duration
+        self.max_requests = max_requests
+        self.requests = 0
+        self.started = time.monotonic()
+
+    def spend(self, requests: int = 1):
+        self.requests += requests
+
+    @property
+    def exhausted_reason(self) -> Optional[str]:
+        if self.max_requests and self.requests >= self.max_requests:
+            return f"request budget of {self.max_requests} spent"
+        if self.max_duration and time.monotonic() - self.started >= self.max_duration:
+            return f"time budget of {format_duration(self.max_duration)} spent"
+        return None
+
+    @property
+    def exhausted(self) -> bool:
+        return self.exhausted_reason is not None
+
+
+class BudgetedScraper:
+    """Wraps a scraper so each search and page fetch is charged to a RunBudget."""
+
+    def __init__(self, scraper, budget: RunBudget):
+        self._scraper = scraper
+        self.budget = budget
+
+    def __getattr__(self, name: str):
+        return getattr(self._scraper, name)
+
+    async def search_book(self, base_url: str, title: str, author: str):
+        self.budget.spend()
+        return await self._scraper.search_book(base_url, title, author)
+
+    async def lookup_by_slug(self, base_url: str, title: str, author: str):
+        self.budget.spend()
+        return await self._scraper.lookup_by_slug(base_url, title, author)
+
+    async def scrape_book(self, base_url: str, source_id: str, slug: str):
+        self.budget.spend()
+        return await self._scraper.scrape_book(base_url, source_id, slug)
+
+
+def parse_duration(text: str) -> float:
+    """Parse "90", "45s", "30m" or "2h" into seconds."""
+    text = text.strip().lower()
+    units = {"s": 1, "m": 60, "h": 3600}
+    if text and text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+def format_duration(seconds: float) -> str:
+    if seconds >= 3600 and seconds % 3600 == 0:
+        return f"{seconds / 3600:g}h"
+    if seconds >= 60 and seconds % 60 == 0:
+        return f"{seconds / 60:g}m"
+    return f"{seconds:g}s"
+
+
+def make_worker_id() -> str:
+    """Identify this scrape process in scrape_jobs leases."""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class JobClaimer:
+    """Yields a source's books by leasing small batches from the scrape_jobs queue.
+
+    Batches are claimed only as workers ask for more books, so several scrape
+    processes can drain the same queue side by side. `limit` caps how many
+    books this process takes (0 = no cap); a spent `budget` stops it early.
+    """
+
+    def __init__(self, db: Database, source: str, worker_id: str, limit: int = 0,
+                 batch_size: int = CLAIM_BATCH_SIZE, lease: datetime.timedelta = DEFAULT_LEASE,
+                 budget: Optional[RunBudget] = None):
+        self.db = db
+        self.source = source
+        self.worker_id = worker_id
+        self.limit = limit
+        self.batch_size = batch_size
+        self.lease = lease
+        self.budget = budget
+        self.claimed = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._exhausted = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        if self.budget is not None and self.budget.exhausted:
+            raise StopIteration
+        if not self._buffer and not self._exhausted:
+            want = self.batch_size
+            if self.limit:
+                want = min(want, self.limit - self.claimed)
+            if want > 0:
+                batch = self.db.claim_scrape_jobs(self.source, self.worker_id, want, self.lease)
+                self.claimed += len(batch)
+                self._buffer.extend(batch)
+            self._exhausted = not self._buffer
+        if not self._buffer:
+            raise StopIteration
+        return self._buffer.pop(0)
+
+    def defer(self, book: Dict[str, Any]):
+        """Hand a started book back at release; its checkpoint lets the next run resume it."""
+        self._buffer.append(book)
+
+    def release(self):
+        """Return claimed books no worker started (or finished) to the queue."""
+        if self._buffer:
+            self.db.release_scrape_jobs(self.worker_id, [book["id"] for book in self._buffer])
+            self._buffer.clear()
+
+
+async def keep_leases_alive(db: Database, worker_id: str,
+                            lease: datetime.timedelta = DEFAULT_LEASE):
+    """Heartbeat this worker's leases until cancelled, so long books aren't re-claimed."""
+    while True:
+        await asyncio.sleep(lease.total_seconds() / 3)
+        db.heartbeat_scrape_jobs(worker_id, lease)
+
+
+async def run_workers(books: Iterable[Dict[str, Any]], concurrency: int,
+                      handle: Callable[[Dict[str, Any]], Awaitable[str]]) -> Dict[str, int]:
+    """Run `handle` over books with up to `concurrency` in flight; tally the outcomes.
+
+    Books are pulled lazily, so `books` may be a JobClaimer that leases as it goes.
+    """
+    books = iter(books)
+    counts: Dict[str, int] = {"found": 0, "skipped": 0, "failed": 0}
+
+    async def worker():
+        while (book := next(books, None)) is not None:
+            outcome = await handle(book)
+            counts[outcome] = counts.get(outcome, 0) + 1
+
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    return counts
+
+
+def resume_point(book: Dict[str, Any]) -> Tuple[Optional[str], Optional[Dict[str, str]],
+                                                Optional[Dict[str, Any]]]:
+    """Return (stage, result, metadata) checkpointed for a claimed book by an earlier run.
+
+    "searched" resumes at the book page fetch; "fetched" goes straight to
+    persisting, which is idempotent, so a half-written book is simply redone.
+    """
+    stage = book.get("job_stage")
+    if stage not in ("searched", "fetched"):
+        return None, None, None
+    result = {"source_id": book["job_source_id"], "slug": book["job_slug"]}
+    metadata = json.loads(book["job_metadata"]) if stage == "fetched" else None
+    return stage, result, metadata
+
+
+async def run_pipeline(db: Database, scraper, source: str, books: Iterable[Dict[str, Any]],
+                       concurrency: int, search_cache: Optional[SearchCache] = None,
+                       guesser: Optional[SlugGuesser] = None,
+                       on_done: Optional[Callable[[Dict[str, Any], str], None]] = None,
+                       budget: Optional[RunBudget] = None,
+                       defer: Optional[Callable[[Dict[str, Any]], None]] = None
+                       ) -> Dict[str, int]:
+    """Scrape books through resolve -> fetch -> persist stages joined by bounded queues.
+
+    Each stage has its own workers, so book N's SQLite writes happen while
+    book N+1 is being resolved or fetched. Resolve and fetch share one
+    `concurrency`-sized semaphore, so a source never holds more scraper
+    pages than that. A slug-guess hit skips the fetch stage. Once `budget`
+    is spent, resolved books are passed to `defer` instead of fetched.
+    Returns outcome counts.
+    """
     base_url = SOURCES[source]
-    unscraped = db.get_unscraped_books(source)
-
-    if limit:
-        unscraped = unscraped[:limit]
+    concurrency = max(1, concurrency)
+    fetch_queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * PIPELINE_BUFFER)
+    persist_queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * PIPELINE_BUFFER)
+    counts: Dict[str, int] = {"found": 0, "skipped": 0, "failed": 0}
+    slots = asyncio.Semaphore(concurrency)
+
+    async def resolve(book: Dict[str, Any]) -> str:
+        stage, result, metadata = resume_point(book)
+        if stage is None:
+            try:
+                async with slots:
+                    result, metadata, looked_up = await resolve_book(scraper, source, book,
+                                                                     search_cache, guesser)
+            except Exception as e:
+                await persist_queue.put((book, None, None, e))
+                return "failed"
+            if not result and not looked_up:
+                await persist_queue.put((book, None, None, None, False))
+                return "resolved"
+            if result:
+                db.checkpoint_scrape_job(book["id"], source,
+                                         "fetched" if metadata else "searched", result, metadata)
+        if result and metadata is None:
+            await fetch_queue.put((book, result))
+        else:
+            await persist_queue.put((book, result, metadata, None))
+        return "resolved"
+
+    async def fetch():
+        while (item := await fetch_queue.get()) is not None:
+            book, result = item
+            if budget is not None and budget.exhausted:
+                if defer is not None:
+                    defer(book)
+                continue
+            try:
+                async with slots:
+                    metadata = await scraper.scrape_book(base_url, result["source_id"],
+                                                         result["slug"])
+            except Exception as e:
+                await persist_queue.put((book, result, None, e))
+                continue
+            db.checkpoint_scrape_job(book["id"], source, "fetched", result, metadata)
+            await persist_queue.put((book, result, metadata, None))
+
+    async def persist():
+        while (item := await persist_queue.get()) is not None:
+            outcome = persist_outcome(db, source, *item)
+            counts[outcome] += 1
+            if on_done is not None:
+                on_done(item[0], outcome)
+
+    async def resolve_stage():
+        await run_workers(books, concurrency, resolve)
+        for _ in range(concurrency):
+            await fetch_queue.put(None)
+
+    async def fetch_stage():
+        await asyncio.gather(*(fetch() for _ in range(concurrency)))
+        await persist_queue.put(None)
+
+    await asyncio.gather(resolve_stage(), fetch_stage(), persist())
+    return counts
+
+
+async def scrape_books_from_source(db: Database, scraper, source: str,
+                                   books: Iterable[Dict[str, Any]], concurrency: int,
+                                   progress: Progress,
+                                   search_cache: Optional[SearchCache] = None,
+                                   total: Optional[int] = None,
+                                   budget: Optional[RunBudget] = None) -> str:
+    """Scrape one source's books on a shared scraper; returns a results summary line."""
+    if total is None:
+        total = len(books)
+    task = progress.add_task(f"[cyan]{source}", total=total)
+    guesser = SlugGuesser()
+
+    def done(book: Dict[str, Any], outcome: str):
+        progress.update(task, advance=1,
+                        description=f"[cyan]{source}: {book['title'][:40]}...")
+
+    counts = await run_pipeline(db, scraper, source, books, concurrency,
+                                search_cache, guesser, on_done=done, budget=budget,
+                                defer=getattr(books, "defer", None))
+    return (f"  {source}: {counts['found']} scraped, {counts['skipped']} not found, "
+            f"{counts['failed']} errors "
+            f"({guesser.hits}/{guesser.attempts} direct slug lookups hit)")
+
+
+async def scrape_sources(db: Database, sources: List[str], limit: int, headless: bool,
+                         rate_limit: float, concurrency: int = 1,
+                         archive: Optional[HtmlArchive] = None,
+                         search_cache: Optional[SearchCache] = None,
+                         ignore_backoff: bool = False,
+                         rate_limiter: Optional[HostRateLimiter] = None,
+                         options: Optional[Dict[str, Any]] = None,
+                         budget: Optional[RunBudget] = None):
+    """Scrape metadata for unscraped books from every source at once.
+
+    One browser and one event loop serve all sources. Each source runs up to
+    `concurrency` books at a time, each on its own browser page, and every
+    request goes through the shared limiter's lane for that source's host,
+    so a slow or backed-off source doesn't hold the other one up.
+
+    Books come from the scrape_jobs queue under leases, so other scrape
+    processes sharing the cache split the backlog instead of repeating it.
+    A `budget` stops the run cleanly; unfinished books stay queued.
+    """
+    from booklore_enrich.scraper.daemon import open_scraper
+
+    worker_id = make_worker_id()
+    work: Dict[str, Tuple[JobClaimer, int]] = {}
+    for source in sources:
+        db.enqueue_scrape_jobs(source, ignore_backoff=ignore_backoff)
+        available = db.count_claimable_jobs(source)
+        if limit:
+            available = min(available, limit)
+        if available:
+            work[source] = (JobClaimer(db, source, worker_id, limit=limit, budget=budget),
+                            available)
+            console.print(f"  {source}: {available} unscraped books")
+        else:
+            console.print(f"  No unscraped books for {source}.")
 
-    if not unscraped:
-        console.print(f"  No unscraped books for {source}.")
+    if not work:
         return
 
-    console.print(f"  Scraping {len(unscraped)} books from {source}...")
-
-    scraper = BrowserScraper(headless=headless, rate_limit=rate_limit)
-    await scraper.start()
-
-    if scraper.is_cdp:
-        console.print("  [green]Connected to Chrome via CDP (port 9222)[/green]")
+    concurrency = max(1, concurrency)
+    scraper = await open_scraper(headless=headless, rate_limit=rate_limit,
+                                 pool_size=concurrency * len(work),
+                                 rate_limiter=rate_limiter, archive=archive, **(options or {}))
+    browser = scraper
+    if budget is not None:
+        scraper = BudgetedScraper(scraper, budget)
+
+    if scraper.is_remote:
+        console.print("  [green]Using the running scraper daemon[/green]")
+    elif scraper.is_cdp:
+        endpoints = ", ".join(scraper.connected_endpoints)
+        console.print(f"  [green]Connected to Chrome via CDP ({endpoints})[/green]")
     else:
         console.print("  [dim]Using stealth browser (launch Chrome with --remote-debugging-port=9222 for better Cloudflare bypass)[/dim]")
 
+    heartbeat = asyncio.create_task(keep_leases_alive(db, worker_id))
     try:
         with Progress(console=console) as progress:
-            task = progress.add_task(f"[cyan]Scraping {source}...", total=len(unscraped))
-
-            found = 0
-            skipped = 0
-            failed = 0
-
-            for book in unscraped:
-                progress.update(task, description=f"[cyan]{book['title'][:40]}...")
-
-                try:
-                    # Search for the book
-                    result = await scraper.search_book(base_url, book["title"], book["author"])
-                    if not result:
-                        skipped += 1
-                        progress.advance(task)
-                        continue
-
-                    # Scrape the book page
-                    metadata = await scraper.scrape_book(base_url, result["source_id"], result["slug"])
-
-                    # Store tags with categories
-                    for tag in metadata.get("categorized_tags", []):
-                        tag_id = db.get_or_create_tag(
-                            tag["name"], category=tag["category"], source=source
-                        )
-                        db.add_book_tag(book["id"], tag_id)
-
-                    # Update series data from scraped page (overwrites filesystem-parsed)
-                    series = metadata.get("series")
-                    if series:
-                        db.update_book_series(
-                            book["id"],
-                            series=series,
-                            series_index=metadata.get("series_index"),
-                            series_total=metadata.get("series_total"),
-                        )
-
-                    # Store steam level
-                    if metadata.get("steam_level"):
-                        db.set_steam_level(book["id"], metadata["steam_level"],
-                                           metadata.get("steam_label"))
-
-                    # Mark as scraped
-                    db.mark_scraped(book["id"], source, result["source_id"])
-                    found += 1
-                except Exception as e:
-                    failed += 1
-                    console.print(f"\n  [red]Error scraping '{book['title']}': {e}[/red]")
-
-                progress.advance(task)
-
-            console.print(f"  Results: {found} scraped, {skipped} not found, {failed} errors")
-
+            summaries = await asyncio.gather(*(
+                scrape_books_from_source(db, scraper, source, claimer, concurrency,
+                                         progress, search_cache, total=available,
+                                         budget=budget)
+                for source, (claimer, available) in work.items()
+            ))
+        console.print("  Results:")
+        for summary in summaries:
+            console.print(summary)
+        if getattr(scraper, "recycles", 0):
+            console.print(f"  Browser recycled {scraper.recycles}x "
+                          f"(last after {scraper.last_recycle_reason})")
+        if getattr(scraper, "http_hits", 0):
+            console.print(f"  {scraper.http_hits} pages fetched over plain HTTP, without the browser")
+        if budget is not None and budget.exhausted:
+            console.print(f"  [yellow]Stopped early: {budget.exhausted_reason}. "
+                          "Remaining books stay queued for the next run.[/yellow]")
     finally:
-        await scraper.stop()
+        heartbeat.cancel()
+        # Unstarted, deferred and interrupted (Ctrl-C) books alike go back to
+        # the queue now rather than when their lease runs out
+        db.release_worker_jobs(worker_id)
+        await browser.stop()
 
 
-def run_scrape(source: str = "all", limit: int = 0, from_dir: str | None = None):
+def run_scrape(source: str = "all", limit: int = 0, from_dir: str | None = None,
+               ignore_backoff: bool = False, max_duration: float = 0, max_requests: int = 0):
     """Execute the scrape command."""
+    # The time budget covers the whole run, including the library sync
+    budget = RunBudget(max_duration, max_requests) if max_duration or max_requests else None
     db = Database()
     client = None
+    archive = None
+    search_cache = None
+    config = load_config()
 
     try:
         if from_dir:
@@ -147,7 +564,6 @@ def run_scrape(source: str = "all", limit: int = 0, from_dir: str | None = None)
             console.print(f"Found [green]{len(books)}[/green] epub files")
         else:
             # Existing BookLore API sync path
-            config = load_config()
             if not config.booklore_username:
                 console.print("[red]No BookLore username configured.[/red]")
                 return
@@ -167,13 +583,32 @@ def run_scrape(source: str = "all", limit: int = 0, from_dir: str | None = None)
             headless = config.headless
             rate_limit = config.rate_limit_seconds
 
+        if config.archive_enabled:
+            archive = HtmlArchive(ttl_days=config.archive_ttl_days,
+                                  codec=config.archive_compression)
+            archive.prune()
+        search_cache = SearchCache(no_match_ttl_days=config.search_no_match_ttl_days)
+        rate_limiter = make_rate_limiter(config, rate_limit)
+
         sources = [source] if source != "all" else list(SOURCES.keys())
-        for src in sources:
-            console.print(f"\nScraping {src}...")
-            asyncio.run(scrape_source(db, src, limit, headless, rate_limit))
+        console.print(f"\nScraping {', '.join(sources)}...")
+        try:
+            asyncio.run(scrape_sources(db, sources, limit, headless, rate_limit,
+                                       concurrency=config.max_concurrent, archive=archive,
+                                       search_cache=search_cache,
+                                       ignore_backoff=ignore_backoff,
+                                       rate_limiter=rate_limiter,
+                                       options=scraper_options(config),
+                                       budget=budget))
+        finally:
+            rate_limiter.save()
 
         console.print("\n[green]Scraping complete.[/green]")
     finally:
         if client is not None:
             client.close()
+        if archive is not None:
+            archive.close()
+        if search_cache is not None:
+            search_cache.close()
         db.close()
@@ -4,7 +4,7 @@
 import threading
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 import click
 from rich.console import Console
@@ -31,15 +31,33 @@ def _trope_to_shelf_name(trope: str) -> str:
     return trope.replace("-", " ").title()
 
 
-def build_shelf_plan(db: Database) -> List[Dict[str, Any]]:
-    """Build a plan of shelves to create and which books go on each."""
-    enriched = db.get_enriched_books()
+def _book_tags(book: Dict[str, Any]) -> List[str]:
+    """A book's category tags, deduplicated across sources, plus its spice tag."""
+    seen: set[str] = set()
+    tags: List[str] = []
+    for t in book.get("tags", []):
+        name = t["name"]
+        if name not in seen:
+            seen.add(name)
+            tags.append(name)
+    if book.get("steam_level"):
+        spice_tag = f"spice-{book['steam_level']}"
+        if spice_tag not in seen:
+            tags.append(spice_tag)
+    return tags
+
+
+def build_plans(db: Database) -> Tuple[List[Dict[str, Any]], Dict[int, List[str]]]:
+    """Build the shelf plan and the tag plan in one streamed pass over the cache.
 
+    Returns (shelf_plan, tag_plan); see build_shelf_plan and build_tag_plan.
+    """
     # Group books by trope tag
     trope_books: Dict[str, set] = defaultdict(set)
     steam_books: Dict[str, set] = defaultdict(set)
+    tag_plan: Dict[int, List[str]] = {}
 
-    for book in enriched:
+    for book in db.iter_enriched_books():
         for tag in book.get("tags", []):
             if tag.get("category") == "trope":
                 shelf_name = _trope_to_shelf_name(tag["name"])
@@ -50,34 +68,27 @@ def build_shelf_plan(db: Database) -> List[Dict[str, Any]]:
             if shelf_name:
                 steam_books[shelf_name].add(book["booklore_id"])
 
-    plan = []
+        tags = _book_tags(book)
+        if tags:
+            tag_plan[book["booklore_id"]] = tags
+
+    shelf_plan = []
     for name, book_ids in sorted(trope_books.items()):
-        plan.append({"name": name, "booklore_ids": list(book_ids), "type": "trope"})
+        shelf_plan.append({"name": name, "booklore_ids": list(book_ids), "type": "trope"})
     for name, book_ids in sorted(steam_books.items()):
-        plan.append({"name": name, "booklore_ids": list(book_ids), "type": "steam"})
+        shelf_plan.append({"name": name, "booklore_ids": list(book_ids), "type": "steam"})
 
-    return plan
+    return shelf_plan, tag_plan
+
+
+def build_shelf_plan(db: Database) -> List[Dict[str, Any]]:
+    """Build a plan of shelves to create and which books go on each."""
+    return build_plans(db)[0]
 
 
 def build_tag_plan(db: Database) -> Dict[int, List[str]]:
     """Build a plan of category tags to add to each book."""
-    enriched = db.get_enriched_books()
-    plan: Dict[int, List[str]] = {}
-    for book in enriched:
-        seen: set[str] = set()
-        tags: List[str] = []
-        for t in book.get("tags", []):
-            name = t["name"]
-            if name not in seen:
-                seen.add(name)
-                tags.append(name)
-        if book.get("steam_level"):
-            spice_tag = f"spice-{book['steam_level']}"
-            if spice_tag not in seen:
-                tags.append(spice_tag)
-        if tags:
-            plan[book["booklore_id"]] = tags
-    return plan
+    return build_plans(db)[1]
 
 
 def diff_tags(planned: List[str], existing: List[str]) -> List[str]:
@@ -152,8 +163,7 @@ def run_tag(dry_run: bool, skip_shelves: bool = False, skip_tags: bool = False,
     # workers; a threading.Lock serializes all db access for safety.
     db = Database(check_same_thread=False)
 
-    shelf_plan = build_shelf_plan(db)
-    tag_plan = build_tag_plan(db)
+    shelf_plan, tag_plan = build_plans(db)
 
     effective_shelf_plan = shelf_plan if not skip_shelves else []
     effective_tag_plan = tag_plan if not skip_tags else {}
@@ -4,7 +4,7 @@
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 try:
     import tomllib
@@ -24,8 +24,24 @@ DEFAULT_CONFIG = {
     },
     "scraping": {
         "rate_limit_seconds": 3,
+        "rate_limit_floor_seconds": 1.0,
+        "rate_limit_ceiling_seconds": 30.0,
         "max_concurrent": 1,
         "headless": True,
+        "block_resources": True,
+        "request_allowlist": [],
+        "in_page_extraction": True,
+        "search_no_match_ttl_days": 30,
+        "persist_clearance": True,
+        "http_fast_path": True,
+        "cdp_endpoints": ["http://localhost:9222"],
+        "browser_max_navigations": 2000,
+        "browser_max_rss_mb": 2048,
+    },
+    "archive": {
+        "enabled": True,
+        "ttl_days": 90,
+        "compression": "zlib",
     },
     "discovery": {
         "romance_tropes": ["enemies-to-lovers", "slow-burn", "forced-proximity"],
@@ -40,8 +56,22 @@ class Config:
     booklore_url: str = "http://192.168.7.21:6060"
     booklore_username: str = ""
     rate_limit_seconds: int = 3
+    rate_limit_floor_seconds: float = 1.0
+    rate_limit_ceiling_seconds: float = 30.0
     max_concurrent: int = 1
     headless: bool = True
+    block_resources: bool = True
+    request_allowlist: List[str] = field(default_factory=list)
+    in_page_extraction: bool = True
+    search_no_match_ttl_days: int = 30
+    persist_clearance: bool = True
+    http_fast_path: bool = True
+    cdp_endpoints: List[str] = field(default_factory=lambda: ["http://localhost:9222"])
+    browser_max_navigations: int = 2000
+    browser_max_rss_mb: int = 2048
+    archive_enabled: bool = True
+    archive_ttl_days: int = 90
+    archive_compression: str = "zlib"
     romance_tropes: List[str] = field(
         default_factory=lambda: ["enemies-to-lovers", "slow-burn", "forced-proximity"]
     )
@@ -63,14 +93,37 @@ def load_config(path: Path = DEFAULT_CONFIG_PATH) -> Config:
 
     booklore = data.get("booklore", {})
     scraping = data.get("scraping", {})
+    archive = data.get("archive", {})
     discovery = data.get("discovery", {})
 
     return Config(
         booklore_url=booklore.get("url", Config.booklore_url),
         booklore_username=booklore.get("username", Config.booklore_username),
         rate_limit_seconds=scraping.get("rate_limit_seconds", Config.rate_limit_seconds),
+        rate_limit_floor_seconds=scraping.get(
+            "rate_limit_floor_seconds", Config.rate_limit_floor_seconds
+        ),
+        rate_limit_ceiling_seconds=scraping.get(
+            "rate_limit_ceiling_seconds", Config.rate_limit_ceiling_seconds
+        ),
         max_concurrent=scraping.get("max_concurrent", Config.max_concurrent),
         headless=scraping.get("headless", Config.headless),
+        block_resources=scraping.get("block_resources", Config.block_resources),
+        request_allowlist=scraping.get("request_allowlist", []),
+        in_page_extraction=scraping.get("in_page_extraction", Config.in_page_extraction),
+        search_no_match_ttl_days=scraping.get(
+            "search_no_match_ttl_days", Config.search_no_match_ttl_days
+        ),
+        persist_clearance=scraping.get("persist_clearance", Config.persist_clearance),
+        http_fast_path=scraping.get("http_fast_path", Config.http_fast_path),
+        cdp_endpoints=scraping.get("cdp_endpoints", Config().cdp_endpoints),
+        browser_max_navigations=scraping.get(
+            "browser_max_navigations", Config.browser_max_navigations
+        ),
+        browser_max_rss_mb=scraping.get("browser_max_rss_mb", Config.browser_max_rss_mb),
+        archive_enabled=archive.get("enabled", Config.archive_enabled),
+        archive_ttl_days=archive.get("ttl_days", Config.archive_ttl_days),
+        archive_compression=archive.get("compression", Config.archive_compression),
         romance_tropes=discovery.get("romance_tropes", Config().romance_tropes),
         scifi_tropes=discovery.get("scifi_tropes", Config().scifi_tropes),
         fantasy_tropes=discovery.get("fantasy_tropes", Config().fantasy_tropes),
@@ -87,8 +140,24 @@ def save_config(config: Config, path: Path = DEFAULT_CONFIG_PATH) -> None:
         },
         "scraping": {
             "rate_limit_seconds": config.rate_limit_seconds,
+            "rate_limit_floor_seconds": config.rate_limit_floor_seconds,
+            "rate_limit_ceiling_seconds": config.rate_limit_ceiling_seconds,
             "max_concurrent": config.max_concurrent,
             "headless": config.headless,
+            "block_resources": config.block_resources,
+            "request_allowlist": config.request_allowlist,
+            "in_page_extraction": config.in_page_extraction,
+            "search_no_match_ttl_days": config.search_no_match_ttl_days,
+            "persist_clearance": config.persist_clearance,
+            "http_fast_path": config.http_fast_path,
+            "cdp_endpoints": config.cdp_endpoints,
+            "browser_max_navigations": config.browser_max_navigations,
+            "browser_max_rss_mb": config.browser_max_rss_mb,
+        },
+        "archive": {
+            "enabled": config.archive_enabled,
+            "ttl_days": config.archive_ttl_days,
+            "compression": config.archive_compression,
         },
         "discovery": {
             "romance_tropes": config.romance_tropes,
@@ -100,6 +169,35 @@ def save_config(config: Config, path: Path = DEFAULT_CONFIG_PATH) -> None:
         tomli_w.dump(data, f)
 
 
+def make_rate_limiter(config: Config, rate_limit: Optional[float] = None):
+    """Build the shared adaptive rate limiter, restoring per-host state from earlier runs."""
+    from booklore_enrich.scraper.rate_limit import HostRateLimiter
+
+    limiter = HostRateLimiter(
+        rate_limit if rate_limit is not None else config.rate_limit_seconds,
+        floor=config.rate_limit_floor_seconds,
+        ceiling=config.rate_limit_ceiling_seconds,
+    )
+    limiter.load()
+    return limiter
+
+
+def scraper_options(config: Config) -> Dict[str, Any]:
+    """Config-driven BrowserScraper keyword arguments shared by scrape and discover."""
+    from booklore_enrich.scraper.clearance import ClearanceStore
+
+    return {
+        "block_resources": config.block_resources,
+        "request_allowlist": config.request_allowlist,
+        "extract": config.in_page_extraction,
+        "clearance": ClearanceStore() if config.persist_clearance else None,
+        "http_fast_path": config.http_fast_path,
+        "cdp_endpoints": config.cdp_endpoints,
+        "max_navigations": config.browser_max_navigations,
+        "max_rss_mb": config.browser_max_rss_mb,
+    }
+
+
 def get_password() -> Optional[str]:
     """Get BookLore password from BOOKLORE_PASSWORD env var or interactive prompt."""
     password = os.environ.get("BOOKLORE_PASSWORD")
@@ -2,14 +2,36 @@
 # ABOUTME: Stores books, trope tags, steam levels, and discovery results.
 
 import hashlib
+import json
 import sqlite3
 import datetime
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
 
 
 DEFAULT_DB_PATH = Path.home() / ".config" / "booklore-enrich" / "cache.db"
 
+# Rows written per commit by the bulk upserts; each commit is one WAL fsync
+DEFAULT_BULK_CHUNK_SIZE = 1000
+
+# Rows fetched per round-trip by the iter_* streaming reads
+ITER_PAGE_SIZE = 500
+
+UPSERT_BOOK_SQL = """INSERT INTO books (booklore_id, title, author, isbn)
+   VALUES (?, ?, ?, ?)
+   ON CONFLICT(booklore_id) DO UPDATE SET
+       title=excluded.title, author=excluded.author, isbn=excluded.isbn"""
+
+UPSERT_BOOK_BY_PATH_SQL = """INSERT INTO books
+       (file_path, title, author, series, series_index, series_total)
+   VALUES (?, ?, ?, ?, ?, ?)
+   ON CONFLICT(file_path) DO UPDATE SET
+       title=excluded.title, author=excluded.author,
+       series=excluded.series, series_index=excluded.series_index,
+       series_total=excluded.series_total"""
+
 SCHEMA = """
 CREATE TABLE IF NOT EXISTS books (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -71,6 +93,33 @@ CREATE TABLE IF NOT EXISTS discovery_preferences (
     UNIQUE(source, trope)
 );
 
+CREATE TABLE IF NOT EXISTS scrape_attempts (
+    book_id INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_outcome TEXT,
+    last_attempt_at TIMESTAMP,
+    next_attempt_at TIMESTAMP,
+    PRIMARY KEY (book_id, source),
+    FOREIGN KEY (book_id) REFERENCES books(id)
+);
+
+CREATE TABLE IF NOT EXISTS scrape_jobs (
+    book_id INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker_id TEXT,
+    lease_expires_at TIMESTAMP,
+    heartbeat_at TIMESTAMP,
+    enqueued_at TIMESTAMP NOT NULL,
+    stage TEXT,
+    found_source_id TEXT,
+    found_slug TEXT,
+    metadata_json TEXT,
+    PRIMARY KEY (book_id, source),
+    FOREIGN KEY (book_id) REFERENCES books(id)
+);
+
 CREATE TABLE IF NOT EXISTS tag_cache (
     booklore_id INTEGER PRIMARY KEY,
     tag_hash TEXT NOT NULL,
@@ -78,6 +127,60 @@ CREATE TABLE IF NOT EXISTS tag_cache (
 );
 """
 
+# Indexes created (if missing) every time the cache is opened, after migrations
+# have added the columns they cover. The partial one indexes only books scraped
+# but not yet embedded; embedded books never enter it.
+INDEXES = {
+    "idx_books_file_path":
+        "CREATE UNIQUE INDEX idx_books_file_path ON books(file_path)",
+    "idx_books_unembedded":
+        """CREATE INDEX idx_books_unembedded ON books(id)
+           WHERE file_path IS NOT NULL AND last_scraped_at IS NOT NULL
+             AND embedded_at IS NULL""",
+    "idx_scrape_jobs_claim":
+        "CREATE INDEX idx_scrape_jobs_claim ON scrape_jobs(source, status, lease_expires_at)",
+}
+
+
+# Per-book tag list as a JSON array, so book queries fetch tags in the same round-trip
+BOOK_TAGS_JSON = """(SELECT json_group_array(json_object(
+        'id', t.id, 'name', t.name, 'category', t.category, 'source', t.source))
+     FROM book_tags bt JOIN tags t ON t.id = bt.tag_id
+     WHERE bt.book_id = b.id) AS tags_json"""
+
+
+def _book_with_tags(row: sqlite3.Row) -> Dict[str, Any]:
+    book = dict(row)
+    book["tags"] = json.loads(book.pop("tags_json"))
+    return book
+
+
+# First retry delay per failed outcome; doubles with each further attempt up to the cap
+BACKOFF_BASE = {
+    "not_found": datetime.timedelta(days=1),
+    "error": datetime.timedelta(hours=1),
+}
+BACKOFF_MAX = datetime.timedelta(days=90)
+
+# How long a claimed scrape job stays reserved without a heartbeat
+DEFAULT_LEASE = datetime.timedelta(minutes=10)
+
+# Claim priority over scrape_jobs j, books b and LEFT JOINed scrape_attempts sa:
+# never-attempted books first, then books with an ISBN, then fewest attempts
+CLAIM_ORDER = """sa.book_id IS NOT NULL, COALESCE(b.isbn, '') = '',
+                 COALESCE(sa.attempts, 0), j.enqueued_at, j.book_id"""
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def backoff_delay(outcome: str, attempts: int) -> datetime.timedelta:
+    """Exponential backoff before the next attempt, after `attempts` failures."""
+    base = BACKOFF_BASE.get(outcome, BACKOFF_BASE["error"])
+    # Clamp the exponent so long-failing books can't overflow timedelta
+    return min(base * (2 ** min(max(0, attempts - 1), 16)), BACKOFF_MAX)
+
 
 def compute_tag_hash(tags: List[str]) -> str:
     """Compute a stable hash for a list of tags, independent of input order."""
@@ -92,8 +195,10 @@ class Database:
         self.conn.row_factory = sqlite3.Row
         self.conn.execute("PRAGMA journal_mode=WAL")
         self.conn.execute("PRAGMA foreign_keys=ON")
+        self._tx_depth = 0
         self._create_tables()
         self._migrate()
+        self._ensure_indexes()
 
     def _create_tables(self):
         self.conn.executescript(SCHEMA)
@@ -103,7 +208,7 @@ class Database:
         """Add columns that may be missing from older databases."""
         existing = {row[1] for row in self.execute("PRAGMA table_info(books)").fetchall()}
         # Note: SQLite does not allow ADD COLUMN with UNIQUE constraint.
-        # We add a UNIQUE INDEX separately after the column is created.
+        # The UNIQUE index idx_books_file_path (see INDEXES) is added separately.
         migrations = [
             ("file_path", "TEXT"),
             ("series", "TEXT"),
@@ -114,24 +219,108 @@ class Database:
         for col_name, col_type in migrations:
             if col_name not in existing:
                 self.execute(f"ALTER TABLE books ADD COLUMN {col_name} {col_type}")
-        # Ensure file_path uniqueness even on migrated databases
-        self.execute(
-            "CREATE UNIQUE INDEX IF NOT EXISTS idx_books_file_path ON books(file_path)"
-        )
+        # Resume checkpoints added to scrape_jobs after it was introduced
+        job_cols = {row[1] for row in self.execute("PRAGMA table_info(scrape_jobs)").fetchall()}
+        for col_name in ("stage", "found_source_id", "found_slug", "metadata_json"):
+            if col_name not in job_cols:
+                self.execute(f"ALTER TABLE scrape_jobs ADD COLUMN {col_name} TEXT")
+        self.conn.commit()
+
+    def _ensure_indexes(self):
+        """Create any missing managed index (file_path uniqueness included)."""
+        existing = {row[0] for row in self.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'").fetchall()}
+        for name, sql in INDEXES.items():
+            if name not in existing:
+                self.execute(sql)
         self.conn.commit()
 
     def execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
         return self.conn.execute(sql, params)
 
+    def _commit(self):
+        # Inside transaction() the outermost block commits instead
+        if not self._tx_depth:
+            self.conn.commit()
+
+    @contextmanager
+    def transaction(self) -> Iterator["Database"]:
+        """Group writes into a single commit: `with db.transaction(): ...`.
+
+        The outermost block commits when it exits cleanly and rolls back on
+        an exception. Nested blocks are savepoints, so a failing inner block
+        undoes only its own writes.
+        """
+        if self._tx_depth:
+            savepoint = f"sp_{self._tx_depth}"
+            self.conn.execute(f"SAVEPOINT {savepoint}")
+            self._tx_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self.conn.execute(f"ROLLBACK TO {savepoint}")
+                self.conn.execute(f"RELEASE {savepoint}")
+                raise
+            else:
+                self.conn.execute(f"RELEASE {savepoint}")
+            finally:
+                self._tx_depth -= 1
+            return
+        if not self.conn.in_transaction:
+            # IMMEDIATE takes the write lock up front; a deferred transaction that
+            # reads first can fail outright if another process writes meanwhile
+            self.conn.execute("BEGIN IMMEDIATE")
+        self._tx_depth = 1
+        try:
+            yield self
+        except BaseException:
+            self.conn.rollback()
+            raise
+        else:
+            self.conn.commit()
+        finally:
+            self._tx_depth = 0
+
+    def _iter_books(self, select: str, where: str, params: List[Any],
+                    convert: Callable[[sqlite3.Row], Dict[str, Any]] = dict,
+                    page_size: int = ITER_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """Stream a query over `books b` in pages keyed on b.id.
+
+        Each page is its own statement, so no cursor stays open while the
+        caller writes (e.g. marking books embedded as it goes).
+        """
+        last_id = 0
+        while True:
+            rows = self.conn.execute(
+                f"{select} WHERE ({where}) AND b.id > ? ORDER BY b.id LIMIT ?",
+                [*params, last_id, page_size],
+            ).fetchall()
+            yield from (convert(row) for row in rows)
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1]["id"]
+
     def upsert_book(self, booklore_id: int, title: str, author: str, isbn: str = None):
-        self.conn.execute(
-            """INSERT INTO books (booklore_id, title, author, isbn)
-               VALUES (?, ?, ?, ?)
-               ON CONFLICT(booklore_id) DO UPDATE SET
-                   title=excluded.title, author=excluded.author, isbn=excluded.isbn""",
-            (booklore_id, title, author, isbn),
-        )
-        self.conn.commit()
+        self.conn.execute(UPSERT_BOOK_SQL, (booklore_id, title, author, isbn))
+        self._commit()
+
+    def _executemany_chunked(self, sql: str, rows: Iterable[tuple], chunk_size: int) -> int:
+        count = 0
+        rows = iter(rows)
+        while chunk := list(islice(rows, chunk_size)):
+            self.conn.executemany(sql, chunk)
+            self._commit()
+            count += len(chunk)
+        return count
+
+    def upsert_books_bulk(self, books: Iterable[Dict[str, Any]],
+                          chunk_size: int = DEFAULT_BULK_CHUNK_SIZE) -> int:
+        """Upsert BookLore books (booklore_id/title/author/isbn dicts), one commit per chunk.
+
+        Returns how many rows were written.
+        """
+        rows = ((b["booklore_id"], b["title"], b["author"], b.get("isbn")) for b in books)
+        return self._executemany_chunked(UPSERT_BOOK_SQL, rows, chunk_size)
 
     def get_book_by_booklore_id(self, booklore_id: int) -> Optional[Dict[str, Any]]:
         row = self.conn.execute(
@@ -147,7 +336,7 @@ class Database:
             "INSERT INTO tags (name, category, source) VALUES (?, ?, ?)",
             (name, category, source),
         )
-        self.conn.commit()
+        self._commit()
         return cursor.lastrowid
 
     def add_book_tag(self, book_id: int, tag_id: int):
@@ -155,7 +344,7 @@ class Database:
             "INSERT OR IGNORE INTO book_tags (book_id, tag_id) VALUES (?, ?)",
             (book_id, tag_id),
         )
-        self.conn.commit()
+        self._commit()
 
     def get_book_tags(self, book_id: int) -> List[Dict[str, Any]]:
         rows = self.conn.execute(
@@ -172,7 +361,7 @@ class Database:
                ON CONFLICT(book_id) DO UPDATE SET level=excluded.level, label=excluded.label""",
             (book_id, level, label),
         )
-        self.conn.commit()
+        self._commit()
 
     def get_steam_level(self, book_id: int) -> Optional[Dict[str, Any]]:
         row = self.conn.execute(
@@ -187,15 +376,194 @@ class Database:
             f"UPDATE books SET {col} = ?, last_scraped_at = ? WHERE id = ?",
             (source_id, now, book_id),
         )
-        self.conn.commit()
+        self.conn.execute(
+            "DELETE FROM scrape_attempts WHERE book_id = ? AND source = ?",
+            (book_id, source),
+        )
+        self._commit()
 
-    def get_unscraped_books(self, source: str) -> List[Dict[str, Any]]:
+    def record_scrape_attempt(self, book_id: int, source: str, outcome: str):
+        """Record a failed lookup ("not_found" or "error") and schedule the next retry."""
+        now = datetime.datetime.now(datetime.timezone.utc)
+        row = self.conn.execute(
+            "SELECT attempts FROM scrape_attempts WHERE book_id = ? AND source = ?",
+            (book_id, source),
+        ).fetchone()
+        attempts = (row["attempts"] if row else 0) + 1
+        next_attempt = now + backoff_delay(outcome, attempts)
+        self.conn.execute(
+            """INSERT INTO scrape_attempts
+               (book_id, source, attempts, last_outcome, last_attempt_at, next_attempt_at)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT(book_id, source) DO UPDATE SET
+                   attempts=excluded.attempts, last_outcome=excluded.last_outcome,
+                   last_attempt_at=excluded.last_attempt_at,
+                   next_attempt_at=excluded.next_attempt_at""",
+            (book_id, source, attempts, outcome, now.isoformat(), next_attempt.isoformat()),
+        )
+        self._commit()
+
+    def get_scrape_attempt(self, book_id: int, source: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            "SELECT * FROM scrape_attempts WHERE book_id = ? AND source = ?",
+            (book_id, source),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def enqueue_scrape_jobs(self, source: str, ignore_backoff: bool = False) -> int:
+        """Queue a job for every unscraped book on a source that isn't queued yet.
+
+        Finished jobs for books that are still unmatched (and out of backoff)
+        are queued again. Returns the number of jobs added or re-queued.
+        """
         col = "romance_io_id" if source == "romance.io" else "booknaut_id"
+        now = _utcnow().isoformat()
+        sql = f"""INSERT INTO scrape_jobs (book_id, source, status, enqueued_at)
+                  SELECT id, ?, 'pending', ? FROM books WHERE {col} IS NULL"""
+        params: List[Any] = [source, now]
+        if not ignore_backoff:
+            sql += """ AND NOT EXISTS (
+                SELECT 1 FROM scrape_attempts sa
+                WHERE sa.book_id = books.id AND sa.source = ? AND sa.next_attempt_at > ?)"""
+            params += [source, now]
+        sql += """ ON CONFLICT(book_id, source) DO UPDATE SET
+                       status='pending', worker_id=NULL, lease_expires_at=NULL,
+                       enqueued_at=excluded.enqueued_at, stage=NULL, found_source_id=NULL,
+                       found_slug=NULL, metadata_json=NULL
+                   WHERE scrape_jobs.status = 'done'"""
+        cursor = self.conn.execute(sql, params)
+        self._commit()
+        return cursor.rowcount
+
+    def count_claimable_jobs(self, source: str) -> int:
+        """Jobs on a source that are pending or whose lease has expired."""
+        row = self.conn.execute(
+            """SELECT COUNT(*) FROM scrape_jobs WHERE source = ?
+               AND (status = 'pending' OR (status = 'leased' AND lease_expires_at < ?))""",
+            (source, _utcnow().isoformat()),
+        ).fetchone()
+        return row[0]
+
+    def claim_scrape_jobs(self, source: str, worker_id: str, batch_size: int,
+                          lease: datetime.timedelta = DEFAULT_LEASE) -> List[Dict[str, Any]]:
+        """Atomically lease up to batch_size jobs and return their books, best bets first.
+
+        Books never attempted on the source come first, then books with an
+        ISBN, then retries (fewest attempts first). Jobs whose lease expired
+        (their worker crashed or hung) are claimable again. The single
+        UPDATE ... RETURNING runs under SQLite's write lock, so concurrent
+        processes never claim the same job. Each book carries its job's
+        checkpoint as job_stage/job_source_id/job_slug/job_metadata.
+        """
+        now = _utcnow()
         rows = self.conn.execute(
-            f"SELECT * FROM books WHERE {col} IS NULL"
+            f"""UPDATE scrape_jobs
+               SET status = 'leased', worker_id = ?, lease_expires_at = ?, heartbeat_at = ?
+               WHERE rowid IN (
+                   SELECT j.rowid FROM scrape_jobs j
+                   JOIN books b ON b.id = j.book_id
+                   LEFT JOIN scrape_attempts sa
+                       ON sa.book_id = j.book_id AND sa.source = j.source
+                   WHERE j.source = ?
+                   AND (j.status = 'pending' OR (j.status = 'leased' AND j.lease_expires_at < ?))
+                   ORDER BY {CLAIM_ORDER}
+                   LIMIT ?)
+               RETURNING book_id""",
+            (worker_id, (now + lease).isoformat(), now.isoformat(), source,
+             now.isoformat(), batch_size),
+        ).fetchall()
+        self._commit()
+        if not rows:
+            return []
+        ids = [row["book_id"] for row in rows]
+        placeholders = ",".join("?" * len(ids))
+        books = self.conn.execute(
+            f"""SELECT b.*, j.stage AS job_stage, j.found_source_id AS job_source_id,
+                       j.found_slug AS job_slug, j.metadata_json AS job_metadata
+                FROM books b JOIN scrape_jobs j ON j.book_id = b.id AND j.source = ?
+                LEFT JOIN scrape_attempts sa ON sa.book_id = j.book_id AND sa.source = j.source
+                WHERE b.id IN ({placeholders}) ORDER BY {CLAIM_ORDER}""",
+            [source] + ids,
+        ).fetchall()
+        return [dict(b) for b in books]
+
+    def checkpoint_scrape_job(self, book_id: int, source: str, stage: str,
+                              result: Dict[str, str],
+                              metadata: Optional[Dict[str, Any]] = None):
+        """Record how far a job got ("searched" or "fetched") so a rerun resumes there."""
+        self.conn.execute(
+            """UPDATE scrape_jobs SET stage = ?, found_source_id = ?, found_slug = ?,
+                   metadata_json = ?
+               WHERE book_id = ? AND source = ?""",
+            (stage, result["source_id"], result["slug"],
+             json.dumps(metadata) if metadata is not None else None, book_id, source),
+        )
+        self._commit()
+
+    def heartbeat_scrape_jobs(self, worker_id: str,
+                              lease: datetime.timedelta = DEFAULT_LEASE) -> int:
+        """Extend the leases on every job a worker holds. Returns jobs extended."""
+        now = _utcnow()
+        cursor = self.conn.execute(
+            """UPDATE scrape_jobs SET lease_expires_at = ?, heartbeat_at = ?
+               WHERE worker_id = ? AND status = 'leased'""",
+            ((now + lease).isoformat(), now.isoformat(), worker_id),
+        )
+        self._commit()
+        return cursor.rowcount
+
+    def complete_scrape_job(self, book_id: int, source: str):
+        """Mark a book's job finished, whatever the outcome (backoff decides retries)."""
+        self.conn.execute(
+            """UPDATE scrape_jobs SET status = 'done', worker_id = NULL, lease_expires_at = NULL,
+                   stage = NULL, found_source_id = NULL, found_slug = NULL, metadata_json = NULL
+               WHERE book_id = ? AND source = ?""",
+            (book_id, source),
+        )
+        self._commit()
+
+    def release_scrape_jobs(self, worker_id: str, book_ids: List[int]):
+        """Hand claimed but unstarted jobs back to the queue."""
+        self.conn.executemany(
+            """UPDATE scrape_jobs SET status = 'pending', worker_id = NULL, lease_expires_at = NULL
+               WHERE book_id = ? AND worker_id = ? AND status = 'leased'""",
+            [(book_id, worker_id) for book_id in book_ids],
+        )
+        self._commit()
+
+    def release_worker_jobs(self, worker_id: str) -> int:
+        """Hand every job a worker still leases back to the queue, checkpoints kept.
+
+        Called on a clean shutdown, so books interrupted mid-scrape don't sit
+        out the rest of their lease. Returns jobs released.
+        """
+        cursor = self.conn.execute(
+            """UPDATE scrape_jobs SET status = 'pending', worker_id = NULL, lease_expires_at = NULL
+               WHERE worker_id = ? AND status = 'leased'""",
+            (worker_id,),
+        )
+        self._commit()
+        return cursor.rowcount
+
+    def get_scrape_job(self, book_id: int, source: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            "SELECT * FROM scrape_jobs WHERE book_id = ? AND source = ?", (book_id, source)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def get_scraped_books(self) -> List[Dict[str, Any]]:
+        """Get all books matched on at least one source."""
+        rows = self.conn.execute(
+            "SELECT * FROM books WHERE romance_io_id IS NOT NULL OR booknaut_id IS NOT NULL"
         ).fetchall()
         return [dict(r) for r in rows]
 
+    def clear_book_metadata(self, book_id: int):
+        """Remove a book's tags and steam level so they can be rebuilt."""
+        self.conn.execute("DELETE FROM book_tags WHERE book_id = ?", (book_id,))
+        self.conn.execute("DELETE FROM book_steam WHERE book_id = ?", (book_id,))
+        self._commit()
+
     def add_discovery(self, title: str, author: str, source: str,
                       source_id: str = None, source_url: str = None,
                       genre: str = None, steam_level: int = None):
@@ -205,9 +573,14 @@ class Database:
                VALUES (?, ?, ?, ?, ?, ?, ?)""",
             (title, author, source, source_id, source_url, genre, steam_level),
         )
-        self.conn.commit()
+        self._commit()
 
     def get_discoveries(self, source: str = None, include_dismissed: bool = False) -> List[Dict[str, Any]]:
+        return list(self.iter_discoveries(source, include_dismissed))
+
+    def iter_discoveries(self, source: str = None,
+                         include_dismissed: bool = False) -> Iterator[Dict[str, Any]]:
+        """Streaming get_discoveries, newest first."""
         sql = "SELECT * FROM discoveries WHERE 1=1"
         params = []
         if source:
@@ -216,11 +589,13 @@ class Database:
         if not include_dismissed:
             sql += " AND dismissed = 0"
         sql += " ORDER BY discovered_at DESC"
-        return [dict(r) for r in self.conn.execute(sql, params).fetchall()]
+        cursor = self.conn.execute(sql, params)
+        while rows := cursor.fetchmany(ITER_PAGE_SIZE):
+            yield from (dict(r) for r in rows)
 
     def dismiss_discovery(self, discovery_id: int):
         self.conn.execute("UPDATE discoveries SET dismissed = 1 WHERE id = ?", (discovery_id,))
-        self.conn.commit()
+        self._commit()
 
     def get_tag_hash(self, booklore_id: int) -> Optional[str]:
         row = self.conn.execute(
@@ -236,22 +611,26 @@ class Database:
                    tag_hash=excluded.tag_hash, tagged_at=excluded.tagged_at""",
             (booklore_id, tag_hash),
         )
-        self.conn.commit()
+        self._commit()
 
     def upsert_book_by_path(self, file_path: str, title: str, author: str,
                             series: Optional[str] = None, series_index: Optional[str] = None,
                             series_total: Optional[int] = None):
         """Upsert a book using file_path as identity (for filesystem-discovered books)."""
-        self.execute(
-            """INSERT INTO books (file_path, title, author, series, series_index, series_total)
-               VALUES (?, ?, ?, ?, ?, ?)
-               ON CONFLICT(file_path) DO UPDATE SET
-                   title=excluded.title, author=excluded.author,
-                   series=excluded.series, series_index=excluded.series_index,
-                   series_total=excluded.series_total""",
-            (file_path, title, author, series, series_index, series_total),
-        )
-        self.conn.commit()
+        self.execute(UPSERT_BOOK_BY_PATH_SQL,
+                     (file_path, title, author, series, series_index, series_total))
+        self._commit()
+
+    def upsert_books_by_path_bulk(self, books: Iterable[Dict[str, Any]],
+                                  chunk_size: int = DEFAULT_BULK_CHUNK_SIZE) -> int:
+        """Upsert filesystem-discovered books keyed by file_path, one commit per chunk.
+
+        Each dict needs file_path/title/author; series fields are optional.
+        Returns how many rows were written.
+        """
+        rows = ((b["file_path"], b["title"], b["author"], b.get("series"),
+                 b.get("series_index"), b.get("series_total")) for b in books)
+        return self._executemany_chunked(UPSERT_BOOK_BY_PATH_SQL, rows, chunk_size)
 
     def get_book_by_path(self, file_path: str) -> Optional[Dict[str, Any]]:
         """Get a book by its file path."""
@@ -266,7 +645,7 @@ class Database:
             "UPDATE books SET series = ?, series_index = ?, series_total = ? WHERE id = ?",
             (series, series_index, series_total, book_id),
         )
-        self.conn.commit()
+        self._commit()
 
     def mark_embedded(self, book_id: int):
         """Record that a book's EPUB has been written with enriched metadata."""
@@ -274,7 +653,7 @@ class Database:
             "UPDATE books SET embedded_at = CURRENT_TIMESTAMP WHERE id = ?",
             (book_id,),
         )
-        self.conn.commit()
+        self._commit()
 
     def get_embeddable_books(self, path_prefix: Optional[str] = None,
                              force: bool = False) -> List[Dict[str, Any]]:
@@ -282,45 +661,53 @@ class Database:
 
         Returns books with their tags. Skips already-embedded books unless force=True.
         """
-        query = """
-            SELECT b.*, bs.level as steam_level, bs.label as steam_label
-            FROM books b
-            LEFT JOIN book_steam bs ON b.id = bs.book_id
-            WHERE b.file_path IS NOT NULL
-              AND b.last_scraped_at IS NOT NULL
-        """
+        return list(self.iter_embeddable_books(path_prefix, force))
+
+    def _embeddable_filter(self, path_prefix: Optional[str], force: bool):
+        where = "b.file_path IS NOT NULL AND b.last_scraped_at IS NOT NULL"
         params: List[Any] = []
         if not force:
-            query += " AND b.embedded_at IS NULL"
+            where += " AND b.embedded_at IS NULL"
         if path_prefix:
             if not path_prefix.endswith("/"):
                 path_prefix += "/"
-            query += " AND b.file_path LIKE ?"
+            where += " AND b.file_path LIKE ?"
             params.append(path_prefix + "%")
-        rows = self.execute(query, params).fetchall()
-        results = []
-        for row in rows:
-            book = dict(row)
-            book["tags"] = self.get_book_tags(book["id"])
-            results.append(book)
-        return results
+        return where, params
+
+    def iter_embeddable_books(self, path_prefix: Optional[str] = None,
+                              force: bool = False) -> Iterator[Dict[str, Any]]:
+        """Streaming get_embeddable_books, in id order."""
+        where, params = self._embeddable_filter(path_prefix, force)
+        return self._iter_books(
+            f"""SELECT b.*, bs.level as steam_level, bs.label as steam_label, {BOOK_TAGS_JSON}
+                FROM books b LEFT JOIN book_steam bs ON b.id = bs.book_id""",
+            where, params, convert=_book_with_tags,
+        )
+
+    def count_embeddable_books(self, path_prefix: Optional[str] = None,
+                               force: bool = False) -> int:
+        where, params = self._embeddable_filter(path_prefix, force)
+        # The id range mirrors the paged reads; without it the planner prefers a
+        # scan of the file_path index over the much smaller idx_books_unembedded
+        return self.execute(f"SELECT COUNT(*) FROM books b WHERE ({where}) AND b.id > 0",
+                            params).fetchone()[0]
 
     def get_enriched_books(self) -> List[Dict[str, Any]]:
         """Get all books that have been enriched with tags or steam levels."""
-        books = self.conn.execute(
-            """SELECT b.* FROM books b
-               WHERE EXISTS (SELECT 1 FROM book_tags bt WHERE bt.book_id = b.id)
-                  OR EXISTS (SELECT 1 FROM book_steam bs WHERE bs.book_id = b.id)"""
-        ).fetchall()
-        result = []
-        for book in books:
-            book_dict = dict(book)
-            book_dict["tags"] = self.get_book_tags(book["id"])
-            steam = self.get_steam_level(book["id"])
-            book_dict["steam_level"] = steam["level"] if steam else None
-            book_dict["steam_label"] = steam["label"] if steam else None
-            result.append(book_dict)
-        return result
+        return list(self.iter_enriched_books())
+
+    def iter_enriched_books(self) -> Iterator[Dict[str, Any]]:
+        """Streaming get_enriched_books, in id order."""
+        return self._iter_books(
+            f"""SELECT b.*, bs.level AS steam_level, bs.label AS steam_label, {BOOK_TAGS_JSON}
+                FROM books b LEFT JOIN book_steam bs ON bs.book_id = b.id""",
+            """bs.book_id IS NOT NULL
+               OR EXISTS (SELECT 1 FROM book_tags bt WHERE bt.book_id = b.id)""",
+            [], convert=_book_with_tags,
+        )
 
     def close(self):
+        # Lets SQLite refresh planner statistics for the indexes it actually used
+        self.conn.execute("PRAGMA optimize")
         self.conn.close()
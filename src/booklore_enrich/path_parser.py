@@ -113,12 +113,8 @@ def discover_books_from_dir(
         if parsed is None:
             continue
         books.append(parsed)
-        if db is not None:
-            db.upsert_book_by_path(
-                file_path=parsed["file_path"],
-                title=parsed["title"],
-                author=parsed["author"],
-                series=parsed.get("series"),
-                series_index=parsed.get("series_index"),
-            )
+    if db is not None:
+        if on_status:
+            on_status(f"Saving {len(books)} books to cache...")
+        db.upsert_books_by_path_bulk(books)
     return books
@@ -2,13 +2,54 @@
 # ABOUTME: Provides Playwright browser management and page content extraction.
 
 import asyncio
-import random
 import re
 import time
-from typing import Any, Dict, List, Optional
-from urllib.parse import unquote
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from urllib.parse import unquote, urljoin
+
+from booklore_enrich.archive import page_kind
+from booklore_enrich.scraper.clearance import ClearanceStore
+from booklore_enrich.scraper.http_fetch import NOT_FOUND, HttpFetcher
+from booklore_enrich.scraper.pool import (
+    DEFAULT_MAX_USES,
+    DEFAULT_POOL_SIZE,
+    ContextPool,
+    MultiEndpointPool,
+    PageSlot,
+)
+from booklore_enrich.scraper.rate_limit import (
+    CHALLENGE,
+    EMPTY,
+    ERROR,
+    OK,
+    TIMEOUT,
+    HostRateLimiter,
+)
+from booklore_enrich.scraper.readiness import ReadinessProfile, profile_for
+from booklore_enrich.scraper.watchdog import (
+    DEFAULT_MAX_NAVIGATIONS,
+    DEFAULT_MAX_RSS_MB,
+    BrowserWatchdog,
+)
+from booklore_enrich.scraper.request_filter import allowlist_for, should_block_request
+
+if TYPE_CHECKING:
+    from booklore_enrich.archive import HtmlArchive
 
 CDP_PORT = 9222
+DEFAULT_CDP_ENDPOINT = f"http://localhost:{CDP_PORT}"
+
+STEALTH_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+)
+
+
+class FetchError(Exception):
+    """Raised when a page could not be loaded (e.g. an unresolved Cloudflare challenge)."""
+
 
 KNOWN_SUBGENRES = {
     "contemporary", "contemporary-romance", "dark", "dark-romance",
@@ -50,22 +91,147 @@ def slugify(title: str, author: str) -> str:
     return text
 
 
-def parse_search_results(html: str) -> List[Dict[str, str]]:
-    """Extract book links from a search results or topic page."""
-    # Match links like /books/{24-char-hex-id}/{slug}
-    pattern = r'href="/books/([a-f0-9]{24})/([^"]+)"'
-    matches = re.findall(pattern, html)
+# Steam level from steam rating indicators, checked from most to least explicit
+STEAM_PATTERNS = [
+    (5, r"(?:Explicit and plentiful|steam[_-]?level[_-]?5|spice[_-]?5)"),
+    (4, r"(?:Explicit open door|steam[_-]?level[_-]?4|spice[_-]?4)"),
+    (3, r"(?:Open door|steam[_-]?level[_-]?3|spice[_-]?3)"),
+    (2, r"(?:Behind closed doors|steam[_-]?level[_-]?2|spice[_-]?2)"),
+    (1, r"(?:Glimpses and kisses|steam[_-]?level[_-]?1|spice[_-]?1)"),
+]
+
+STEAM_LABELS = {
+    1: "Glimpses and kisses",
+    2: "Behind closed doors",
+    3: "Open door",
+    4: "Explicit open door",
+    5: "Explicit and plentiful",
+}
+
+BOOK_URL_PATTERN = re.compile(r"/books/([a-f0-9]{24})/([^/?#\"]+)")
+CANONICAL_PATTERN = re.compile(
+    r'<link[^>]+rel="canonical"[^>]+href="([^"]+)"|<link[^>]+href="([^"]+)"[^>]+rel="canonical"'
+)
+
+# Runs inside the page and returns only what the parsers need, as compact JSON,
+# instead of shipping the whole serialized DOM across the CDP pipe. The steam
+# regexes are the same STEAM_PATTERNS, evaluated in the renderer.
+EXTRACT_JS = """
+(patterns) => {
+    const hrefs = Array.from(document.querySelectorAll('a[href]'), a => a.getAttribute('href'));
+    const html = document.documentElement.outerHTML;
+    let steam = null;
+    for (const [level, source] of patterns) {
+        if (new RegExp(source, 'i').test(html)) { steam = level; break; }
+    }
+    const canonical = document.querySelector('link[rel="canonical"]');
+    return {
+        book_hrefs: hrefs.filter(h => h.startsWith('/books/')),
+        topic_hrefs: hrefs.filter(h => h.startsWith('/topics/')),
+        steam_level: steam,
+        canonical: canonical ? canonical.getAttribute('href') : null,
+    };
+}
+"""
+
+
+def detect_steam_level(html: str) -> Optional[int]:
+    """Return the steam level (1-5) indicated anywhere in the page, if any."""
+    for level, pattern in STEAM_PATTERNS:
+        if re.search(pattern, html, re.IGNORECASE):
+            return level
+    return None
+
+
+def extract_from_html(html: str) -> Dict[str, Any]:
+    """Build the same compact extract EXTRACT_JS returns, from raw HTML."""
+    canonical = CANONICAL_PATTERN.search(html)
+    return {
+        "book_hrefs": re.findall(r'href="(/books/[^"]*)"', html),
+        "topic_hrefs": re.findall(r'href="(/topics/[^"]*)"', html),
+        "steam_level": detect_steam_level(html),
+        "canonical": (canonical.group(1) or canonical.group(2)) if canonical else None,
+    }
+
+
+def search_results_from_extract(extract: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Turn extracted /books/ hrefs into unique source_id/slug results, in page order."""
     results = []
     seen: set[str] = set()
-    for source_id, slug in matches:
+    for href in extract.get("book_hrefs", []):
+        # Match links like /books/{24-char-hex-id}/{slug}
+        match = re.fullmatch(r"/books/([a-f0-9]{24})/([^\"]+)", href)
+        if not match:
+            continue
+        source_id, slug = match.groups()
         if source_id not in seen:
             seen.add(source_id)
             results.append({"source_id": source_id, "slug": slug})
     return results
 
 
-def parse_book_page(html: str) -> Dict[str, Any]:
-    """Extract metadata from a book detail page."""
+def extract_is_usable(url: str, extract: Dict[str, Any]) -> bool:
+    """True if an extract has what its page kind is scraped for.
+
+    Used to vet plain-HTTP fetches: an empty parse may just mean the content
+    is rendered by JavaScript, so the browser gets a turn.
+    """
+    kind = page_kind(url)
+    if kind in ("search", "topic"):
+        return bool(search_results_from_extract(extract))
+    if kind == "book":
+        return bool(extract.get("topic_hrefs")) or extract.get("steam_level") is not None
+    return True
+
+
+def parse_search_results(html: str) -> List[Dict[str, str]]:
+    """Extract book links from a search results or topic page."""
+    return search_results_from_extract(extract_from_html(html))
+
+
+def archive_url(final_url: str, html: str) -> str:
+    """The URL to archive a loaded page under.
+
+    Book pages reached by a slug guess are keyed by their /books/{id}/{slug}
+    URL (from the redirect or the canonical link), which is where reparse
+    looks for them.
+    """
+    if page_kind(final_url) != "book" or BOOK_URL_PATTERN.search(final_url):
+        return final_url
+    canonical = CANONICAL_PATTERN.search(html)
+    if canonical:
+        href = urljoin(final_url, canonical.group(1) or canonical.group(2))
+        if BOOK_URL_PATTERN.search(href):
+            return href
+    return final_url
+
+
+def match_landing_page(final_url: str, canonical: Optional[str], title: str,
+                       author: str) -> Optional[Dict[str, str]]:
+    """Check whether a slug-guess navigation landed on the right book page.
+
+    The book id and canonical slug come from the final URL (after any
+    redirect) or the page's canonical link. The guess counts as a hit only
+    if that slug starts with the title's slug and mentions the author, so a
+    redirect to some other book or to a search page is rejected.
+    """
+    match = BOOK_URL_PATTERN.search(final_url)
+    if not match and canonical:
+        match = BOOK_URL_PATTERN.search(canonical)
+    if not match:
+        return None
+    source_id, slug = match.group(1), match.group(2)
+    title_slug = slugify(title, "")
+    author_words = [w for w in slugify(author, "").split("-") if len(w) > 1]
+    if not title_slug or not slug.startswith(title_slug):
+        return None
+    if author_words and author_words[-1] not in slug:
+        return None
+    return {"source_id": source_id, "slug": slug}
+
+
+def book_data_from_extract(extract: Dict[str, Any]) -> Dict[str, Any]:
+    """Build book metadata (tags, categories, steam) from a page extract."""
     data: Dict[str, Any] = {
         "tags": [],
         "steam_level": None,
@@ -76,11 +242,12 @@ def parse_book_page(html: str) -> Dict[str, Any]:
     }
 
     # Extract tags from topic links
-    tag_pattern = r'href="/topics/(?:best|most)/([^/"]+)/\d+"'
-    tag_matches = re.findall(tag_pattern, html)
-    for tag_match in tag_matches:
+    for href in extract.get("topic_hrefs", []):
+        tag_match = re.fullmatch(r"/topics/(?:best|most)/([^/\"]+)/\d+", href)
+        if not tag_match:
+            continue
         # Split comma-separated tropes and URL-decode them
-        for tag in tag_match.split(","):
+        for tag in tag_match.group(1).split(","):
             tag = unquote(tag).strip()
             # Convert spaces to hyphens for consistency
             tag = tag.replace(" ", "-").lower()
@@ -90,26 +257,10 @@ def parse_book_page(html: str) -> Dict[str, Any]:
             if tag not in data["tags"]:
                 data["tags"].append(tag)
 
-    # Extract steam level from steam rating indicators
-    steam_patterns = [
-        (5, r"(?:Explicit and plentiful|steam[_-]?level[_-]?5|spice[_-]?5)"),
-        (4, r"(?:Explicit open door|steam[_-]?level[_-]?4|spice[_-]?4)"),
-        (3, r"(?:Open door|steam[_-]?level[_-]?3|spice[_-]?3)"),
-        (2, r"(?:Behind closed doors|steam[_-]?level[_-]?2|spice[_-]?2)"),
-        (1, r"(?:Glimpses and kisses|steam[_-]?level[_-]?1|spice[_-]?1)"),
-    ]
-    steam_labels = {
-        1: "Glimpses and kisses",
-        2: "Behind closed doors",
-        3: "Open door",
-        4: "Explicit open door",
-        5: "Explicit and plentiful",
-    }
-    for level, pattern in steam_patterns:
-        if re.search(pattern, html, re.IGNORECASE):
-            data["steam_level"] = level
-            data["steam_label"] = steam_labels[level]
-            break
+    level = extract.get("steam_level")
+    if level in STEAM_LABELS:
+        data["steam_level"] = level
+        data["steam_label"] = STEAM_LABELS[level]
 
     data["categorized_tags"] = []
     for tag_name in data["tags"]:
@@ -126,12 +277,17 @@ def parse_book_page(html: str) -> Dict[str, Any]:
     return data
 
 
-def _is_cdp_available() -> bool:
-    """Check if a Chrome instance is listening on the CDP port."""
+def parse_book_page(html: str) -> Dict[str, Any]:
+    """Extract metadata from a book detail page."""
+    return book_data_from_extract(extract_from_html(html))
+
+
+def _is_cdp_available(endpoint: str = DEFAULT_CDP_ENDPOINT) -> bool:
+    """Check if a Chrome instance is listening on a CDP endpoint."""
     import httpx
 
     try:
-        resp = httpx.get(f"http://localhost:{CDP_PORT}/json/version", timeout=2)
+        resp = httpx.get(f"{endpoint.rstrip('/')}/json/version", timeout=2)
         return resp.status_code == 200
     except Exception:
         return False
@@ -140,45 +296,145 @@ def _is_cdp_available() -> bool:
 class BrowserScraper:
     """Manages a Playwright browser session for scraping."""
 
-    def __init__(self, headless: bool = True, rate_limit: float = 3.0):
+    is_remote = False
+
+    def __init__(self, headless: bool = True, rate_limit: float = 3.0,
+                 pool_size: int = DEFAULT_POOL_SIZE,
+                 context_max_uses: int = DEFAULT_MAX_USES,
+                 rate_limiter: Optional[HostRateLimiter] = None,
+                 archive: Optional["HtmlArchive"] = None,
+                 block_resources: bool = True,
+                 request_allowlist: Iterable[str] = (),
+                 extract: bool = True,
+                 clearance: Optional[ClearanceStore] = None,
+                 http_fast_path: bool = True,
+                 cdp_endpoints: Sequence[str] = (DEFAULT_CDP_ENDPOINT,),
+                 max_navigations: int = DEFAULT_MAX_NAVIGATIONS,
+                 max_rss_mb: int = DEFAULT_MAX_RSS_MB):
         self.headless = headless
         self.rate_limit = rate_limit
+        self.pool_size = pool_size
+        self.context_max_uses = context_max_uses
+        self._rate_limiter = rate_limiter or HostRateLimiter(rate_limit)
+        self._archive = archive
+        self.block_resources = block_resources
+        self.request_allowlist = tuple(request_allowlist)
+        self.extract = extract
+        self._clearance = clearance
+        self.http_fast_path = http_fast_path
+        self._http: Optional[HttpFetcher] = None
+        self.http_hits = 0
+        self.cdp_endpoints = tuple(cdp_endpoints)
         self._browser = None
+        self._cdp_browsers: Dict[str, Any] = {}
         self._stealth = None
         self._playwright = None
+        self._pool: Optional[Union[ContextPool, MultiEndpointPool]] = None
         self._cdp_mode = False
-        self._cdp_page = None
-        self._last_request_time = 0.0
+        self._watchdog = BrowserWatchdog(max_navigations, max_rss_mb)
+        self._lease_gate = asyncio.Lock()
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._in_flight = 0
+        self.recycles = 0
+        self.last_recycle_reason: Optional[str] = None
 
     async def start(self):
-        """Launch the browser, or connect to an existing Chrome via CDP."""
+        """Connect to every reachable CDP Chrome, or launch a stealth browser if none are up."""
         from playwright.async_api import async_playwright
         from playwright_stealth import Stealth
 
         self._stealth = Stealth()
         self._playwright = await async_playwright().start()
 
-        if _is_cdp_available():
-            self._browser = await self._playwright.chromium.connect_over_cdp(
-                f"http://localhost:{CDP_PORT}"
-            )
-            self._cdp_mode = True
+        for endpoint in self.cdp_endpoints:
+            if not _is_cdp_available(endpoint):
+                continue
+            try:
+                self._cdp_browsers[endpoint] = await self._playwright.chromium.connect_over_cdp(
+                    endpoint
+                )
+            except Exception:
+                continue
+
+        self._cdp_mode = bool(self._cdp_browsers)
+        if not self._cdp_mode:
+            await self._launch_browser()
+        # A CDP-connected Chrome isn't our child process, so only count its navigations
+        self._watchdog.measure_rss = not self._cdp_mode
+        await self._open_pool()
+        if self.http_fast_path:
+            self._start_http()
+
+    async def _launch_browser(self):
+        self._browser = await self._playwright.chromium.launch(
+            headless=self.headless, channel="chrome"
+        )
+
+    async def _open_pool(self):
+        """Build and warm the page pool for the connected or launched browser(s)."""
+        if self._cdp_mode:
+            # Split the page budget across the Chromes, at least one tab each
+            per_endpoint = max(1, -(-self.pool_size // len(self._cdp_browsers)))
+            self._pool = MultiEndpointPool({
+                endpoint: ContextPool(partial(self._new_cdp_slot, browser),
+                                      size=per_endpoint, max_uses=self.context_max_uses)
+                for endpoint, browser in self._cdp_browsers.items()
+            })
         else:
-            self._browser = await self._playwright.chromium.launch(
-                headless=self.headless, channel="chrome"
+            self._pool = ContextPool(
+                self._new_slot, size=self.pool_size, max_uses=self.context_max_uses
             )
-            self._cdp_mode = False
+        await self._pool.warm()
 
-    async def stop(self):
-        """Close the browser (or disconnect from CDP)."""
-        if self._cdp_page:
+    async def _restart_browser(self):
+        """Close every page (and a launched browser) and open fresh ones."""
+        await self._pool.close()
+        if not self._cdp_mode:
             try:
-                await self._cdp_page.close()
+                await self._browser.close()
             except Exception:
                 pass
-            self._cdp_page = None
+            await self._launch_browser()
+        await self._open_pool()
+
+    async def _recycle_if_due(self):
+        """Restart the browser once the watchdog says it's worn, between fetches.
+
+        New leases queue behind the gate while in-flight fetches finish, so
+        no fetch is interrupted and callers just see one slower page load.
+        """
+        reason = self._watchdog.due()
+        if reason is None:
+            return
+        while self._in_flight:
+            self._drained.clear()
+            await self._drained.wait()
+        await self._restart_browser()
+        self._watchdog.reset()
+        self.recycles += 1
+        self.last_recycle_reason = reason
+
+    def _start_http(self):
+        """Create the HTTP fast path, seeded with any persisted stealth clearance."""
+        self._http = HttpFetcher()
+        state = self._clearance.storage_state() if self._clearance else None
+        if state and not self._cdp_mode:
+            for cookie in state["cookies"]:
+                site_url = f"https://{cookie['domain'].lstrip('.')}/"
+                self._http.harvest(site_url, [cookie], STEALTH_USER_AGENT)
+
+    async def stop(self):
+        """Close the browser (or disconnect from CDP)."""
+        if self._http:
+            await self._http.close()
+            self._http = None
+        if self._pool:
+            await self._pool.close()
+            self._pool = None
         if self._browser and not self._cdp_mode:
             await self._browser.close()
+        self._cdp_browsers = {}
         if self._playwright:
             await self._playwright.stop()
 
@@ -186,141 +442,314 @@ class BrowserScraper:
     def is_cdp(self) -> bool:
         return self._cdp_mode
 
-    async def _new_page(self):
+    @property
+    def connected_endpoints(self) -> List[str]:
+        """CDP endpoints this scraper is driving (empty in stealth mode)."""
+        return list(self._cdp_browsers)
+
+    async def _new_slot(self) -> PageSlot:
         """Create a fresh context and page with stealth applied."""
+        # cf_clearance is bound to the user agent, so it must stay fixed
         ctx = await self._browser.new_context(
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+            user_agent=STEALTH_USER_AGENT,
+            storage_state=self._clearance.storage_state() if self._clearance else None,
         )
         await self._stealth.apply_stealth_async(ctx)
+        if self.block_resources:
+            await ctx.route("**/*", self._route_request)
         page = await ctx.new_page()
-        return ctx, page
-
-    async def _get_cdp_page(self):
-        """Get or create a page in the CDP-connected browser."""
-        if not self._cdp_page or self._cdp_page.is_closed():
-            ctx = self._browser.contexts[0]
-            self._cdp_page = await ctx.new_page()
-        return self._cdp_page
-
-    async def _rate_limit_wait(self):
-        """Wait with randomized delay to look human."""
-        elapsed = time.time() - self._last_request_time
-        min_wait = self.rate_limit
-        max_wait = self.rate_limit * 2.5
-        target = random.uniform(min_wait, max_wait)
-        if elapsed < target:
-            await asyncio.sleep(target - elapsed)
-        self._last_request_time = time.time()
-
-    async def _wait_past_cloudflare(self, page, max_attempts: int = 3) -> bool:
-        """Wait for Cloudflare challenge to resolve. Returns True if page loaded."""
-        for attempt in range(max_attempts):
-            title = await page.title()
-            if "just a moment" not in title.lower():
-                return True
-            await page.wait_for_timeout(5000)
-        return False
-
-    async def fetch_page(self, url: str, wait_selector: Optional[str] = None) -> str:
-        """Navigate to a URL and return the page HTML."""
-        await self._rate_limit_wait()
+        return PageSlot(ctx, page)
 
-        if self._cdp_mode:
-            return await self._fetch_page_cdp(url, wait_selector)
-        return await self._fetch_page_stealth(url, wait_selector)
+    async def _new_cdp_slot(self, browser) -> PageSlot:
+        """Open a new tab in a CDP-connected browser's existing context."""
+        ctx = browser.contexts[0]
+        page = await ctx.new_page()
+        # Route per page, so the user's other tabs in that Chrome are untouched
+        if self.block_resources:
+            await page.route("**/*", self._route_request)
+        return PageSlot(ctx, page, owns_context=False)
+
+    async def _route_request(self, route):
+        """Abort requests the parsers don't need; let everything else continue."""
+        request = route.request
+        try:
+            page_url = request.frame.url
+        except Exception:
+            page_url = ""
+        allowlist = allowlist_for(page_url, self.request_allowlist)
+        try:
+            if should_block_request(request.url, request.resource_type, page_url, allowlist):
+                await route.abort()
+            else:
+                await route.continue_()
+        except Exception:
+            # The page may have navigated away or closed mid-request
+            pass
 
-    async def _fetch_page_cdp(self, url: str, wait_selector: Optional[str] = None) -> str:
-        """Fetch a page using the CDP-connected real Chrome session."""
-        page = await self._get_cdp_page()
-        await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-        await page.wait_for_timeout(3000)
+    @asynccontextmanager
+    async def _page_lease(self):
+        """Borrow a pooled page for one fetch, so concurrent fetches never share a tab."""
+        async with self._lease_gate:
+            await self._recycle_if_due()
+            self._in_flight += 1
+        try:
+            slot = await self._pool.acquire()
+            healthy = True
+            try:
+                yield slot.page
+            except BaseException:
+                healthy = False
+                raise
+            finally:
+                await self._pool.release(slot, healthy=healthy)
+        finally:
+            self._in_flight -= 1
+            if not self._in_flight:
+                self._drained.set()
+
+    async def _rate_limit_wait(self, url: str):
+        """Wait with randomized delay to look human, shared across all workers per host."""
+        await self._rate_limiter.wait(url)
+
+    async def _wait_past_cloudflare(self, page, timeout_ms: int = 15000) -> str:
+        """Wait for a Cloudflare challenge to resolve.
+
+        Returns "clean" if no challenge was shown, "passed" if one was shown
+        and resolved, or "blocked" if it never resolved. Resolution is
+        detected as soon as the challenge title goes away, not on a fixed poll.
+        """
+        title = await page.title()
+        if "just a moment" not in title.lower():
+            return "clean"
+        try:
+            await page.wait_for_function(
+                "() => !document.title.toLowerCase().includes('just a moment')",
+                timeout=timeout_ms,
+            )
+            return "passed"
+        except Exception:
+            return "blocked"
 
-        if not await self._wait_past_cloudflare(page):
-            return ""
+    async def _wait_until_ready(self, page, profile: ReadinessProfile):
+        """Return as soon as the profile's readiness conditions are met.
 
-        if wait_selector:
+        A missing selector is not an error (a book may simply have no tags);
+        the wait is bounded by the profile's timeout either way.
+        """
+        if profile.selector:
+            try:
+                await page.wait_for_selector(
+                    profile.selector, state="attached", timeout=profile.timeout_ms
+                )
+            except Exception:
+                pass
+        if profile.network_idle:
             try:
-                await page.wait_for_selector(wait_selector, timeout=10000)
+                await page.wait_for_load_state("networkidle", timeout=profile.timeout_ms)
             except Exception:
                 pass
-        self._last_page = page
-        self._last_ctx = None
-        return await page.content()
+        if not profile.selector and not profile.network_idle:
+            await page.wait_for_timeout(profile.fallback_ms)
+
+    @property
+    def extracting(self) -> bool:
+        """True when pages are read via in-page extraction rather than full HTML.
+
+        Full HTML is only serialized when an archive needs to keep it.
+        """
+        return self.extract and self._archive is None
+
+    async def _navigate(self, page, url: str, wait_selector: Optional[str] = None) -> str:
+        """Navigate a leased page and wait until it is ready to read.
 
-    async def _fetch_page_stealth(self, url: str, wait_selector: Optional[str] = None) -> str:
-        """Fetch a page using a fresh stealth context."""
-        ctx, page = await self._new_page()
+        Returns the Cloudflare state ("clean", "passed" or "blocked"). Timeouts
+        and navigation errors are reported to the rate limiter and re-raised.
+        """
+        self._watchdog.record_navigation()
         try:
             await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            await page.wait_for_timeout(3000)
-
-            if not await self._wait_past_cloudflare(page):
-                return ""
-
-            if wait_selector:
-                try:
-                    await page.wait_for_selector(wait_selector, timeout=10000)
-                except Exception:
-                    pass
-            html = await page.content()
-            self._last_page = page
-            self._last_ctx = ctx
-            return html
-        except Exception:
-            await ctx.close()
+        except Exception as e:
+            outcome = TIMEOUT if "timeout" in type(e).__name__.lower() else ERROR
+            self._rate_limiter.record(url, outcome)
             raise
 
-    async def _close_last_context(self):
-        """Close the context from the most recent stealth fetch_page call."""
-        if hasattr(self, "_last_ctx") and self._last_ctx:
+        cloudflare = await self._wait_past_cloudflare(page)
+        await self._update_clearance(page, url, cloudflare)
+        if cloudflare == "blocked":
+            self._rate_limiter.record(url, CHALLENGE)
+            return cloudflare
+
+        await self._wait_until_ready(page, profile_for(url, wait_selector))
+        return cloudflare
+
+    async def _update_clearance(self, page, url: str, cloudflare: str):
+        """Save clearance after a passed challenge; drop it when challenges return.
+
+        CDP mode uses the user's own Chrome profile, which keeps its cookies.
+        """
+        if self._clearance is None or self._cdp_mode or cloudflare == "clean":
+            return
+        self._clearance.invalidate(url)
+        if cloudflare == "passed":
             try:
-                await self._last_ctx.close()
+                self._clearance.update(url, await page.context.storage_state())
             except Exception:
                 pass
-            self._last_ctx = None
-            self._last_page = None
+
+    async def _harvest_session(self, page, url: str):
+        """Hand the browser's cookies and user agent to the HTTP fast path."""
+        if self._http is None or self._http.has_session(url):
+            return
+        try:
+            cookies = await page.context.cookies()
+            if self._cdp_mode:
+                user_agent = await page.evaluate("navigator.userAgent")
+            else:
+                user_agent = STEALTH_USER_AGENT
+        except Exception:
+            return
+        self._http.harvest(url, cookies, user_agent)
+
+    async def _http_extract(self, url: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Try a URL over plain HTTP.
+
+        Returns the extract (None if the browser is needed) and the request's
+        outcome, or None for the outcome when no request was sent.
+        """
+        started = time.monotonic()
+        fetched, outcome = await self._http.fetch_with_outcome(url)
+        if outcome in (CHALLENGE, ERROR):
+            self._rate_limiter.record(url, outcome)
+        elif outcome is not None:
+            # A 404 or a page that needs JS is still a healthy answer from the host
+            self._rate_limiter.record(url, OK, time.monotonic() - started)
+        if fetched is None:
+            return None, outcome
+        extract = extract_from_html(fetched["html"])
+        if not extract_is_usable(url, extract):
+            return None, outcome
+        self._archive_html(fetched["url"], fetched["html"])
+        self.http_hits += 1
+        extract["url"] = fetched["url"]
+        return extract, outcome
+
+    def _record_load(self, url: str, cloudflare: str, loaded: bool, started: float):
+        """Report how a load went so the host's request spacing can adapt."""
+        if not loaded:
+            self._rate_limiter.record(url, EMPTY)
+        elif cloudflare == "passed":
+            self._rate_limiter.record(url, CHALLENGE)
+        else:
+            self._rate_limiter.record(url, OK, time.monotonic() - started)
+
+    async def _load(self, page, url: str, wait_selector: Optional[str] = None) -> str:
+        """Navigate an already-leased page to a URL and return its HTML."""
+        started = time.monotonic()
+        cloudflare = await self._navigate(page, url, wait_selector)
+        if cloudflare == "blocked":
+            return ""
+        html = await page.content()
+        self._record_load(url, cloudflare, bool(html), started)
+        self._archive_html(page.url or url, html)
+        return html
+
+    async def _load_extract(self, page, url: str) -> Optional[Dict[str, Any]]:
+        """Navigate a leased page and return its compact extract, or None if it didn't load.
+
+        Uses one page.evaluate in extraction mode; otherwise reads (and
+        archives) the full HTML and builds the same extract from it.
+        """
+        if not self.extracting:
+            html = await self._load(page, url)
+            return extract_from_html(html) if html else None
+        started = time.monotonic()
+        cloudflare = await self._navigate(page, url)
+        if cloudflare == "blocked":
+            return None
+        patterns = [[level, pattern] for level, pattern in STEAM_PATTERNS]
+        extract = await page.evaluate(EXTRACT_JS, patterns)
+        self._record_load(url, cloudflare, extract is not None, started)
+        return extract
+
+    def _archive_html(self, final_url: str, html: str):
+        """Keep a compressed copy of the raw HTML when an archive is configured."""
+        if self._archive is not None and html:
+            self._archive.store(archive_url(final_url, html), html)
+
+    async def fetch_page(self, url: str, wait_selector: Optional[str] = None) -> str:
+        """Navigate to a URL and return the page HTML."""
+        await self._rate_limit_wait(url)
+        async with self._page_lease() as page:
+            return await self._load(page, url, wait_selector)
+
+    async def fetch_extract(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return only the links/steam data the parsers need from a URL.
+
+        Server-rendered pages are tried over plain HTTP with the browser's
+        session first, and loaded in the browser only on a challenge, error or
+        empty parse; that second request waits its turn with the host again.
+        A 404 over HTTP is final. Returns None when the page didn't load.
+        """
+        await self._rate_limit_wait(url)
+        if self._http is not None and profile_for(url).server_rendered:
+            extract, outcome = await self._http_extract(url)
+            if extract is not None:
+                return extract
+            if outcome == NOT_FOUND:
+                return None
+            if outcome is not None:
+                await self._rate_limit_wait(url)
+        async with self._page_lease() as page:
+            extract = await self._load_extract(page, url)
+            if extract is not None:
+                extract["url"] = page.url
+                await self._harvest_session(page, url)
+            return extract
 
     async def search_book(
         self, base_url: str, title: str, author: str
     ) -> Optional[Dict[str, str]]:
-        """Search for a book on romance.io/booknaut and return the best match."""
+        """Search for a book on romance.io/booknaut and return the best match.
+
+        Returns None when the search ran but found nothing; raises FetchError
+        when the search page itself couldn't be loaded.
+        """
         query = f"{title} {author}"
         search_url = f"{base_url}/search?q={query}"
+        # The search readiness profile waits for the AJAX-loaded result links
+        extract = await self.fetch_extract(search_url)
+        if extract is None:
+            raise FetchError(f"Search page did not load: {search_url}")
+        results = search_results_from_extract(extract)
+        return results[0] if results else None
+
+    async def lookup_by_slug(
+        self, base_url: str, title: str, author: str
+    ) -> Optional[Dict[str, Any]]:
+        """Try the book page directly at /books/{slugify(title, author)}.
+
+        On a hit this returns the match plus the parsed page metadata, so the
+        book costs one page load instead of a search plus a book fetch.
+        Returns None on any miss; the caller falls back to search_book.
+        """
+        url = f"{base_url}/books/{slugify(title, author)}"
         try:
-            html = await self.fetch_page(search_url)
-            results = parse_search_results(html)
-            if results:
-                return results[0]
-
-            # Search results load via AJAX — wait for book links to appear
-            if hasattr(self, "_last_page") and self._last_page:
-                try:
-                    await self._last_page.wait_for_selector(
-                        'a[href*="/books/"]', timeout=10000
-                    )
-                    html = await self._last_page.content()
-                    results = parse_search_results(html)
-                    if results:
-                        return results[0]
-                except Exception:
-                    pass
+            extract = await self.fetch_extract(url)
         except Exception:
-            pass
-        finally:
-            if not self._cdp_mode:
-                await self._close_last_context()
-
-        return None
+            return None
+        if extract is None:
+            return None
+        match = match_landing_page(extract["url"], extract.get("canonical"), title, author)
+        if match is None:
+            return None
+        return {**match, "metadata": book_data_from_extract(extract)}
 
     async def scrape_book(
         self, base_url: str, source_id: str, slug: str
     ) -> Dict[str, Any]:
         """Scrape full metadata from a book page."""
         url = f"{base_url}/books/{source_id}/{slug}"
-        try:
-            html = await self.fetch_page(url)
-            return parse_book_page(html)
-        finally:
-            if not self._cdp_mode:
-                await self._close_last_context()
+        extract = await self.fetch_extract(url)
+        if extract is None:
+            raise FetchError(f"Book page did not load: {url}")
+        return book_data_from_extract(extract)
@@ -0,0 +1,93 @@
+# ABOUTME: Persists Cloudflare clearance cookies per site between scraper runs.
+# ABOUTME: New stealth contexts start with the saved storage state instead of re-earning it.
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from booklore_enrich.scraper.rate_limit import host_of
+from booklore_enrich.scraper.request_filter import site_of
+
+DEFAULT_CLEARANCE_PATH = Path.home() / ".config" / "booklore-enrich" / "clearance.json"
+
+CLEARANCE_COOKIE = "cf_clearance"
+
+# Used when the clearance cookie carries no expiry of its own
+DEFAULT_MAX_AGE_SECONDS = 12 * 60 * 60
+
+
+def _cookie_site(cookie: Dict[str, Any]) -> str:
+    return site_of(cookie.get("domain", "").lstrip("."))
+
+
+def _cookie_live(cookie: Dict[str, Any], now: float) -> bool:
+    expires = cookie.get("expires", -1)
+    return expires is None or expires < 0 or expires > now
+
+
+class ClearanceStore:
+    """Per-site Playwright cookies, saved once a Cloudflare challenge is passed.
+
+    Entries expire with their cf_clearance cookie (or after
+    `max_age_seconds` if it has no expiry). A challenge showing up again for
+    a site means its saved clearance stopped working, so it is dropped.
+    The file holds session cookies and is written owner-readable only.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CLEARANCE_PATH,
+                 max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS):
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            self._entries = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self._entries, indent=2))
+        os.chmod(self.path, 0o600)
+
+    def _live_entries(self) -> Dict[str, Dict[str, Any]]:
+        now = time.time()
+        return {site: entry for site, entry in self._entries.items()
+                if entry.get("expires_at", 0) > now}
+
+    def has(self, url: str) -> bool:
+        """True if an unexpired clearance is saved for the URL's site."""
+        return site_of(host_of(url)) in self._live_entries()
+
+    def storage_state(self) -> Optional[Dict[str, Any]]:
+        """A Playwright storage_state holding every unexpired site's cookies, or None."""
+        now = time.time()
+        cookies: List[Dict[str, Any]] = []
+        for entry in self._live_entries().values():
+            cookies.extend(c for c in entry["cookies"] if _cookie_live(c, now))
+        return {"cookies": cookies, "origins": []} if cookies else None
+
+    def update(self, url: str, state: Dict[str, Any]):
+        """Save the URL's site cookies from a context's storage_state()."""
+        site = site_of(host_of(url))
+        cookies = [c for c in state.get("cookies", []) if _cookie_site(c) == site]
+        if not cookies:
+            return
+        now = time.time()
+        expires_at = now + self.max_age_seconds
+        for cookie in cookies:
+            if cookie.get("name") == CLEARANCE_COOKIE and (cookie.get("expires") or -1) > 0:
+                expires_at = cookie["expires"]
+        self._entries[site] = {"cookies": cookies, "saved_at": now, "expires_at": expires_at}
+        self._save()
+
+    def invalidate(self, url: str):
+        """Forget the URL's site clearance after Cloudflare challenged again."""
+        if self._entries.pop(site_of(host_of(url)), None) is not None:
+            self._save()
@@ -0,0 +1,241 @@
+# ABOUTME: Long-lived scraper daemon serving fetch jobs over a local Unix socket.
+# ABOUTME: Keeps one warm BrowserScraper across CLI runs; RemoteScraper is its client.
+
+import asyncio
+import itertools
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from booklore_enrich.scraper.base import BrowserScraper, FetchError
+
+DEFAULT_SOCKET_PATH = Path.home() / ".config" / "booklore-enrich" / "scraper.sock"
+
+# Full-page HTML can be large; asyncio's default 64 KiB line limit is too small
+MAX_MESSAGE_BYTES = 32 * 1024 * 1024
+
+# BrowserScraper methods clients may call remotely
+REMOTE_METHODS = ("fetch_page", "fetch_extract", "search_book", "lookup_by_slug", "scrape_book")
+
+
+class DaemonError(Exception):
+    """Raised when the daemon can't be reached or a remote call fails unexpectedly."""
+
+
+def daemon_available(path: Path = DEFAULT_SOCKET_PATH) -> bool:
+    """Return True if a scraper daemon is accepting connections on the socket."""
+    if not path.exists():
+        return False
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(1)
+    try:
+        sock.connect(str(path))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message).encode("utf-8") + b"\n"
+
+
+class ScraperDaemon:
+    """Serves a started scraper's fetch methods as JSON-lines requests.
+
+    Each request is {"id", "method", "args"}; each response carries the same
+    id with either "result" or "error"/"error_type". Requests on a connection
+    run concurrently, so one client can keep the whole page pool busy.
+    """
+
+    def __init__(self, scraper, path: Path = DEFAULT_SOCKET_PATH):
+        self.scraper = scraper
+        self.path = path
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        """Bind the socket, replacing a stale one left by a daemon that died."""
+        if daemon_available(self.path):
+            raise DaemonError(f"A scraper daemon is already listening on {self.path}")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            self.path.unlink()
+        self._server = await asyncio.start_unix_server(
+            self._handle_client, path=str(self.path), limit=MAX_MESSAGE_BYTES
+        )
+        os.chmod(self.path, 0o600)
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def stop(self):
+        # Only remove the socket we bound, never another daemon's
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+        if self.path.exists():
+            self.path.unlink()
+
+    async def _dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one request against the scraper and build its response."""
+        response: Dict[str, Any] = {"id": request.get("id")}
+        method = request.get("method")
+        try:
+            if method == "hello":
+                response["result"] = {"cdp": self.scraper.is_cdp}
+            elif method in REMOTE_METHODS:
+                call = getattr(self.scraper, method)
+                response["result"] = await call(*request.get("args", []))
+            else:
+                raise DaemonError(f"Unknown method: {method}")
+        except Exception as e:
+            response["error"] = str(e)
+            response["error_type"] = type(e).__name__
+        return response
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def answer(request: Dict[str, Any]):
+            response = await self._dispatch(request)
+            async with write_lock:
+                writer.write(_encode(response))
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    continue
+                task = asyncio.create_task(answer(request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            # The client is gone; nobody is waiting for the rest of its fetches
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+
+class RemoteScraper:
+    """Drop-in stand-in for BrowserScraper that forwards fetches to the daemon.
+
+    Rate limiting, page pooling, request blocking and HTML archiving all
+    happen in the daemon, with the daemon's configuration.
+    """
+
+    is_remote = True
+
+    def __init__(self, path: Path = DEFAULT_SOCKET_PATH):
+        self.path = path
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._cdp_mode = False
+
+    async def start(self):
+        try:
+            self._reader, self._writer = await asyncio.open_unix_connection(
+                str(self.path), limit=MAX_MESSAGE_BYTES
+            )
+        except OSError as e:
+            raise DaemonError(f"Cannot connect to scraper daemon at {self.path}: {e}") from e
+        self._write_lock = asyncio.Lock()
+        self._reader_task = asyncio.create_task(self._read_responses())
+        hello = await self._call("hello")
+        self._cdp_mode = bool(hello.get("cdp"))
+
+    async def stop(self):
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+        if self._reader_task:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
+
+    @property
+    def is_cdp(self) -> bool:
+        return self._cdp_mode
+
+    async def _read_responses(self):
+        """Route each response line to the call waiting on its id."""
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(DaemonError("Scraper daemon closed the connection"))
+            self._pending.clear()
+
+    async def _call(self, method: str, *args) -> Any:
+        if self._writer is None:
+            raise DaemonError("RemoteScraper is not started")
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        async with self._write_lock:
+            self._writer.write(_encode({"id": request_id, "method": method, "args": list(args)}))
+            await self._writer.drain()
+        response = await future
+        if "error" in response:
+            if response.get("error_type") == "FetchError":
+                raise FetchError(response["error"])
+            raise DaemonError(f"{response.get('error_type')}: {response['error']}")
+        return response.get("result")
+
+    async def fetch_page(self, url: str, wait_selector: Optional[str] = None) -> str:
+        return await self._call("fetch_page", url, wait_selector)
+
+    async def fetch_extract(self, url: str) -> Optional[Dict[str, Any]]:
+        return await self._call("fetch_extract", url)
+
+    async def search_book(self, base_url: str, title: str, author: str) -> Optional[Dict[str, str]]:
+        return await self._call("search_book", base_url, title, author)
+
+    async def lookup_by_slug(self, base_url: str, title: str, author: str) -> Optional[Dict[str, Any]]:
+        return await self._call("lookup_by_slug", base_url, title, author)
+
+    async def scrape_book(self, base_url: str, source_id: str, slug: str) -> Dict[str, Any]:
+        return await self._call("scrape_book", base_url, source_id, slug)
+
+
+async def open_scraper(socket_path: Path = DEFAULT_SOCKET_PATH, **kwargs):
+    """Return a started scraper: the daemon's if one is running, else a local browser.
+
+    `kwargs` configure the local BrowserScraper and are ignored when the
+    daemon is used.
+    """
+    if daemon_available(socket_path):
+        scraper = RemoteScraper(socket_path)
+    else:
+        scraper = BrowserScraper(**kwargs)
+    await scraper.start()
+    return scraper
@@ -0,0 +1,92 @@
+# ABOUTME: Plain-HTTP page fetcher that reuses the browser session's cookies and user agent.
+# ABOUTME: Tried before Playwright; returns None on anything that needs a real browser.
+
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+import httpx
+
+from booklore_enrich.scraper.rate_limit import CHALLENGE, ERROR, OK, host_of
+from booklore_enrich.scraper.request_filter import site_of
+
+DEFAULT_TIMEOUT_SECONDS = 20.0
+
+# Outcome of a request for a page the site says doesn't exist
+NOT_FOUND = "not_found"
+
+CHALLENGE_MARKERS = ("<title>just a moment", "challenges.cloudflare.com", "cf-chl-")
+
+
+def is_challenge(response: httpx.Response) -> bool:
+    """True if Cloudflare answered with a challenge instead of the page."""
+    if response.headers.get("cf-mitigated") == "challenge":
+        return True
+    if response.status_code in (403, 429, 503):
+        return True
+    head = response.text[:4096].lower()
+    return any(marker in head for marker in CHALLENGE_MARKERS)
+
+
+class HttpFetcher:
+    """Fetches server-rendered pages over httpx with cookies harvested from the browser.
+
+    Only sites whose cookies have been harvested are tried; a challenge
+    response forgets the site's session until the browser harvests it again.
+    """
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT_SECONDS,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._client = httpx.AsyncClient(
+            follow_redirects=True, timeout=timeout, transport=transport,
+            headers={
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "en-US,en;q=0.9",
+            },
+        )
+        self._sites: Set[str] = set()
+
+    def has_session(self, url: str) -> bool:
+        return site_of(host_of(url)) in self._sites
+
+    def harvest(self, url: str, cookies: Iterable[Dict[str, Any]], user_agent: str):
+        """Adopt the browser's cookies for the URL's site and its user agent."""
+        site = site_of(host_of(url))
+        for cookie in cookies:
+            domain = cookie.get("domain", "")
+            if site_of(domain.lstrip(".")) != site:
+                continue
+            self._client.cookies.set(cookie["name"], cookie["value"],
+                                     domain=domain, path=cookie.get("path", "/"))
+        # Cloudflare binds clearance to the user agent that earned it
+        self._client.headers["User-Agent"] = user_agent
+        self._sites.add(site)
+
+    def forget(self, url: str):
+        self._sites.discard(site_of(host_of(url)))
+
+    async def fetch(self, url: str) -> Optional[Dict[str, str]]:
+        """Return {"url", "html"} for a clean 200 response, else None."""
+        page, _ = await self.fetch_with_outcome(url)
+        return page
+
+    async def fetch_with_outcome(self, url: str) -> Tuple[Optional[Dict[str, str]], Optional[str]]:
+        """Like fetch, plus how the request went (OK, CHALLENGE, ERROR or NOT_FOUND).
+
+        The outcome is None when nothing was sent because the site has no session.
+        """
+        if not self.has_session(url):
+            return None, None
+        try:
+            response = await self._client.get(url)
+        except httpx.HTTPError:
+            return None, ERROR
+        if is_challenge(response):
+            self.forget(url)
+            return None, CHALLENGE
+        if response.status_code in (404, 410):
+            return None, NOT_FOUND
+        if response.status_code != 200 or not response.text:
+            return None, ERROR
+        return {"url": str(response.url), "html": response.text}, OK
+
+    async def close(self):
+        await self._client.aclose()
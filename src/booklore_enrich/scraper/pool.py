@@ -0,0 +1,234 @@
+# ABOUTME: Bounded pool of reusable browser contexts and pages for the scraper.
+# ABOUTME: Pre-warms stealth contexts, health-checks them, and recycles after N uses.
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_USES = 50
+HEALTH_CHECK_TIMEOUT = 5.0
+
+# An endpoint with this many failed fetches in a row is rested for a while
+ENDPOINT_FAILURE_THRESHOLD = 3
+ENDPOINT_COOLDOWN_SECONDS = 60.0
+
+
+class PageSlot:
+    """A browser context and page checked out of a ContextPool.
+
+    Slots that don't own their context (tabs in a CDP-connected Chrome) only
+    close their page, leaving the user's browser context alone.
+    """
+
+    def __init__(self, context: Any, page: Any, owns_context: bool = True):
+        self.context = context
+        self.page = page
+        self.owns_context = owns_context
+        self.uses = 0
+
+    async def close(self):
+        """Close the slot's context (which also closes its page), or just the page."""
+        try:
+            if self.owns_context:
+                await self.context.close()
+            else:
+                await self.page.close()
+        except Exception:
+            pass
+
+
+class ContextPool:
+    """Bounded pool of pre-warmed contexts and pages, recycled across fetches.
+
+    Slots are created on demand up to `size` by `factory`. A slot is health
+    checked when it is acquired and retired after `max_uses` fetches, so a
+    long run never holds onto a context long enough for it to bloat.
+    """
+
+    def __init__(self, factory: Callable[[], Awaitable[PageSlot]],
+                 size: int = DEFAULT_POOL_SIZE, max_uses: int = DEFAULT_MAX_USES):
+        self._factory = factory
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self._idle: Deque[PageSlot] = deque()
+        # Signalled whenever a slot goes idle or is retired, so waiters can
+        # take the idle slot or open a replacement
+        self._changed = asyncio.Condition()
+        self._live = 0
+        self._closed = False
+
+    @property
+    def live(self) -> int:
+        """Number of slots currently open, idle or checked out."""
+        return self._live
+
+    async def warm(self):
+        """Open slots until the pool is full so the first fetches skip setup."""
+        while self._live < self.size:
+            self._live += 1
+            try:
+                slot = await self._factory()
+            except Exception:
+                await self._slot_gone()
+                raise
+            await self._put_idle(slot)
+
+    async def acquire(self) -> PageSlot:
+        """Check out a healthy slot, opening a new one if the pool has room."""
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: self._idle or self._live < self.size)
+                slot = self._idle.popleft() if self._idle else None
+                if slot is None:
+                    self._live += 1
+            if slot is None:
+                try:
+                    return await self._factory()
+                except Exception:
+                    await self._slot_gone()
+                    raise
+            if await self._is_healthy(slot):
+                return slot
+            await self._retire(slot)
+
+    async def release(self, slot: PageSlot, healthy: bool = True):
+        """Return a slot after a fetch; retire it if broken or worn out."""
+        slot.uses += 1
+        if self._closed or not healthy or slot.uses >= self.max_uses:
+            await self._retire(slot)
+        else:
+            await self._put_idle(slot)
+
+    async def close(self):
+        """Close every idle slot; slots still checked out close on release."""
+        self._closed = True
+        slots: List[PageSlot] = list(self._idle)
+        self._idle.clear()
+        for slot in slots:
+            await self._retire(slot)
+
+    async def _put_idle(self, slot: PageSlot):
+        async with self._changed:
+            self._idle.append(slot)
+            self._changed.notify()
+
+    async def _slot_gone(self):
+        async with self._changed:
+            self._live -= 1
+            self._changed.notify()
+
+    async def _retire(self, slot: PageSlot):
+        await self._slot_gone()
+        await slot.close()
+
+    async def _is_healthy(self, slot: PageSlot) -> bool:
+        """A slot is healthy if its page is open and its renderer still answers."""
+        try:
+            if slot.page.is_closed():
+                return False
+            await asyncio.wait_for(slot.page.evaluate("1"), HEALTH_CHECK_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+
+class _Endpoint:
+    def __init__(self, name: str, pool: ContextPool):
+        self.name = name
+        self.pool = pool
+        self.in_use = 0
+        self.failures = 0
+        self.down_until = 0.0
+        self.fetches = 0
+
+    def load(self) -> float:
+        return self.in_use / self.pool.size
+
+
+class MultiEndpointPool:
+    """Spreads fetches over one ContextPool per browser endpoint.
+
+    Each acquire goes to the least-loaded endpoint that is up and has a free
+    slot, and only queues on a full endpoint when every one is full. An endpoint
+    whose fetches fail `failure_threshold` times in a row (or whose pages
+    can't be opened) is skipped for `cooldown` seconds; if every endpoint is
+    down they are all tried anyway rather than stalling the run.
+    """
+
+    def __init__(self, pools: Dict[str, ContextPool],
+                 failure_threshold: int = ENDPOINT_FAILURE_THRESHOLD,
+                 cooldown: float = ENDPOINT_COOLDOWN_SECONDS):
+        self._endpoints = [_Endpoint(name, pool) for name, pool in pools.items()]
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._owners: Dict[int, _Endpoint] = {}
+
+    @property
+    def live(self) -> int:
+        return sum(endpoint.pool.live for endpoint in self._endpoints)
+
+    def health(self) -> List[Dict[str, Any]]:
+        """Per-endpoint status, for reporting."""
+        now = time.monotonic()
+        return [{"endpoint": e.name, "up": e.down_until <= now, "fetches": e.fetches,
+                 "in_use": e.in_use} for e in self._endpoints]
+
+    def _mark_failed(self, endpoint: _Endpoint):
+        endpoint.failures += 1
+        if endpoint.failures >= self.failure_threshold:
+            endpoint.failures = 0
+            endpoint.down_until = time.monotonic() + self.cooldown
+
+    async def warm(self):
+        results = await asyncio.gather(*(e.pool.warm() for e in self._endpoints),
+                                       return_exceptions=True)
+        for endpoint, result in zip(self._endpoints, results):
+            if isinstance(result, Exception):
+                endpoint.down_until = time.monotonic() + self.cooldown
+
+    def _pick(self, tried: Set[str]) -> Optional[_Endpoint]:
+        now = time.monotonic()
+        up = [e for e in self._endpoints if e.down_until <= now] or self._endpoints
+        candidates = [e for e in up if e.name not in tried]
+        if not candidates:
+            return None
+        free = [e for e in candidates if e.in_use < e.pool.size]
+        return min(free or candidates, key=_Endpoint.load)
+
+    async def acquire(self) -> PageSlot:
+        error: Optional[Exception] = None
+        tried: Set[str] = set()
+        while (endpoint := self._pick(tried)) is not None:
+            # Reserve the slot before awaiting (the pool's health check yields),
+            # so concurrent callers see this endpoint's load and go elsewhere
+            endpoint.in_use += 1
+            slot = None
+            try:
+                slot = await endpoint.pool.acquire()
+            except Exception as e:
+                error = e
+                tried.add(endpoint.name)
+                self._mark_failed(endpoint)
+            finally:
+                if slot is None:
+                    endpoint.in_use -= 1
+            if slot is not None:
+                self._owners[id(slot)] = endpoint
+                return slot
+        raise error or RuntimeError("No browser endpoints configured")
+
+    async def release(self, slot: PageSlot, healthy: bool = True):
+        endpoint = self._owners.pop(id(slot))
+        endpoint.in_use -= 1
+        endpoint.fetches += 1
+        if healthy:
+            endpoint.failures = 0
+        else:
+            self._mark_failed(endpoint)
+        await endpoint.pool.release(slot, healthy=healthy)
+
+    async def close(self):
+        for endpoint in self._endpoints:
+            await endpoint.pool.close()
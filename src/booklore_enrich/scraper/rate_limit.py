@@ -0,0 +1,121 @@
+# ABOUTME: Adaptive per-host request spacing shared by every scraper worker.
+# ABOUTME: Speeds up while pages load cleanly, backs off on challenges/timeouts, persists per host.
+
+import asyncio
+import json
+import random
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+DEFAULT_RATE_STATE_PATH = Path.home() / ".config" / "booklore-enrich" / "rate-state.json"
+
+# Outcomes reported by the scraper after each page load
+OK = "ok"
+CHALLENGE = "challenge"
+EMPTY = "empty"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+SPEEDUP_FACTOR = 0.9
+BACKOFF_FACTOR = 2.0
+SLOW_FACTOR = 1.25
+SLOW_LATENCY_SECONDS = 15.0
+
+
+def host_of(url: str) -> str:
+    """Return the host part of a URL, used as the rate-limit lane key."""
+    return urlparse(url).netloc.lower()
+
+
+class HostRateLimiter:
+    """Spaces requests to each host by a randomized, self-tuning delay.
+
+    Workers queue on a per-host lock, so N concurrent pages still hit a host
+    no faster than one page would. Different hosts don't wait on each other.
+
+    Each host's base delay starts at `rate_limit`. Clean, fast loads shrink it
+    gradually toward `floor`; Cloudflare challenges, empty pages, timeouts
+    and errors grow it multiplicatively up to `ceiling`. The actual wait is
+    drawn from [delay, delay * jitter].
+    """
+
+    def __init__(self, rate_limit: float = 3.0, jitter: float = 2.5,
+                 floor: Optional[float] = None, ceiling: Optional[float] = None):
+        self.rate_limit = rate_limit
+        self.jitter = jitter
+        self.floor = rate_limit if floor is None else min(floor, rate_limit)
+        self.ceiling = rate_limit * 10 if ceiling is None else max(ceiling, rate_limit)
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._locks_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._last_request: Dict[str, float] = {}
+        self._delays: Dict[str, float] = {}
+        self._changed = False
+
+    def _lock_for(self, host: str) -> asyncio.Lock:
+        # One limiter can outlive several asyncio.run() calls; locks can't
+        loop = asyncio.get_running_loop()
+        if loop is not self._locks_loop:
+            self._locks = {}
+            self._locks_loop = loop
+        if host not in self._locks:
+            self._locks[host] = asyncio.Lock()
+        return self._locks[host]
+
+    def delay_for(self, url_or_host: str) -> float:
+        """Current base delay for a host (accepts a URL or a bare host)."""
+        host = host_of(url_or_host) if "//" in url_or_host else url_or_host
+        return self._delays.get(host, self.rate_limit)
+
+    async def wait(self, url: str):
+        """Block until the URL's host may receive another request."""
+        host = host_of(url)
+        async with self._lock_for(host):
+            last: Optional[float] = self._last_request.get(host)
+            if last is not None:
+                elapsed = time.monotonic() - last
+                delay = self.delay_for(host)
+                target = random.uniform(delay, delay * self.jitter)
+                if elapsed < target:
+                    await asyncio.sleep(target - elapsed)
+            self._last_request[host] = time.monotonic()
+
+    def record(self, url: str, outcome: str, latency: Optional[float] = None):
+        """Feed back how a page load went so the host's delay can adapt."""
+        host = host_of(url)
+        delay = self.delay_for(host)
+        if outcome == OK:
+            if latency is not None and latency > SLOW_LATENCY_SECONDS:
+                delay *= SLOW_FACTOR
+            else:
+                delay *= SPEEDUP_FACTOR
+        else:
+            delay *= BACKOFF_FACTOR
+        self._delays[host] = min(self.ceiling, max(self.floor, delay))
+        self._changed = True
+
+    def load(self, path: Path = DEFAULT_RATE_STATE_PATH):
+        """Restore per-host delays saved by a previous run, clamped to the current bounds."""
+        if not path.exists():
+            return
+        try:
+            state = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return
+        for host, entry in state.items():
+            delay = float(entry.get("delay", self.rate_limit))
+            self._delays[host] = min(self.ceiling, max(self.floor, delay))
+
+    def save(self, path: Path = DEFAULT_RATE_STATE_PATH):
+        """Persist per-host delays so the next run starts where this one left off.
+
+        A limiter that recorded nothing (e.g. its fetches went to the scraper
+        daemon) leaves the file alone rather than overwriting newer state.
+        """
+        if not self._changed:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = {host: {"delay": delay, "updated_at": time.time()}
+                 for host, delay in self._delays.items()}
+        path.write_text(json.dumps(state, indent=2))
@@ -0,0 +1,60 @@
+# ABOUTME: Per-source page readiness profiles for the browser scraper.
+# ABOUTME: Says which selectors mean "search results loaded" or "book tags rendered".
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from booklore_enrich.archive import page_kind
+from booklore_enrich.scraper.rate_limit import host_of
+from booklore_enrich.scraper.request_filter import site_of
+
+
+@dataclass(frozen=True)
+class ReadinessProfile:
+    """What to wait for after navigation before reading the page.
+
+    `selector` is waited for up to `timeout_ms`; when it shows up the fetch
+    returns immediately. `network_idle` additionally waits (same budget) for
+    the network to go quiet. `fallback_ms` is a fixed sleep used only when a
+    profile has no selector to watch for. Pages that aren't `server_rendered`
+    can't be read over plain HTTP, so the scraper goes straight to the browser.
+    """
+
+    selector: Optional[str] = None
+    timeout_ms: int = 10000
+    network_idle: bool = False
+    fallback_ms: int = 3000
+    server_rendered: bool = True
+
+
+GENERIC_PROFILE = ReadinessProfile()
+
+_BOOK_LINKS = 'a[href*="/books/"]'
+_TOPIC_LINKS = 'a[href*="/topics/"]'
+
+DEFAULT_PROFILES: Dict[str, ReadinessProfile] = {
+    # Search results arrive via AJAX after DOMContentLoaded
+    "search": ReadinessProfile(selector=_BOOK_LINKS, timeout_ms=10000, server_rendered=False),
+    # Tag links are server-rendered; books with no tags just time out quickly
+    "book": ReadinessProfile(selector=_TOPIC_LINKS, timeout_ms=5000),
+    "topic": ReadinessProfile(selector=_BOOK_LINKS, timeout_ms=8000),
+    "page": GENERIC_PROFILE,
+}
+
+# Per-source overrides, keyed by site then page kind
+READINESS_PROFILES: Dict[str, Dict[str, ReadinessProfile]] = {
+    "romance.io": {},
+    "thebooknaut.com": {},
+}
+
+
+def profile_for(url: str, wait_selector: Optional[str] = None) -> ReadinessProfile:
+    """Pick the readiness profile for a URL; an explicit selector overrides it."""
+    kind = page_kind(url)
+    overrides = READINESS_PROFILES.get(site_of(host_of(url)), {})
+    profile = overrides.get(kind, DEFAULT_PROFILES.get(kind, GENERIC_PROFILE))
+    if wait_selector:
+        return ReadinessProfile(selector=wait_selector, timeout_ms=profile.timeout_ms,
+                                network_idle=profile.network_idle,
+                                server_rendered=profile.server_rendered)
+    return profile
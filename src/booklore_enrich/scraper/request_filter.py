@@ -0,0 +1,62 @@
+# ABOUTME: Decides which browser requests the scraper lets through.
+# ABOUTME: Blocks images, fonts, media, ads, analytics and third-party scripts, minus allowlists.
+
+from typing import Iterable, Optional
+
+from booklore_enrich.scraper.rate_limit import host_of
+
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+BLOCKED_HOST_PATTERNS = (
+    "google-analytics.com", "googletagmanager.com", "googlesyndication.com",
+    "googleadservices.com", "doubleclick.net", "adservice.google.",
+    "amazon-adsystem.com", "facebook.net", "connect.facebook.com",
+    "hotjar.com", "clarity.ms", "scorecardresearch.com", "quantserve.com",
+    "adnxs.com", "criteo.", "taboola.com", "outbrain.com", "pubmatic.com",
+    "rubiconproject.com", "moatads.com", "segment.io", "mixpanel.com",
+    "newrelic.com", "nr-data.net", "sentry.io",
+)
+
+# Cloudflare's challenge and bot-management endpoints must always load
+ALWAYS_ALLOWED = ("challenges.cloudflare.com", "/cdn-cgi/")
+
+# Third-party script hosts each source needs to render search results and tags
+SOURCE_ALLOWLISTS = {
+    "romance.io": ("code.jquery.com", "cdnjs.cloudflare.com", "cdn.jsdelivr.net"),
+    "thebooknaut.com": ("code.jquery.com", "cdnjs.cloudflare.com", "cdn.jsdelivr.net"),
+}
+
+
+def site_of(host: str) -> str:
+    """Approximate the registrable domain (www.romance.io -> romance.io)."""
+    parts = host.split(":")[0].split(".")
+    return ".".join(parts[-2:]) if len(parts) >= 2 else host
+
+
+def allowlist_for(page_url: str, extra: Iterable[str] = ()) -> tuple:
+    """Allowlist patterns for the source a page belongs to, plus configured extras."""
+    return SOURCE_ALLOWLISTS.get(site_of(host_of(page_url)), ()) + tuple(extra)
+
+
+def should_block_request(url: str, resource_type: str, page_url: Optional[str] = None,
+                         allowlist: Iterable[str] = ()) -> bool:
+    """Return True if the scraper doesn't need this request to parse the page.
+
+    Parsing only needs the document, its first-party scripts/XHR (search
+    results load via AJAX) and Cloudflare's challenge, so everything heavy or
+    third-party is aborted unless a pattern in `allowlist` matches the URL.
+    """
+    if any(pattern in url for pattern in ALWAYS_ALLOWED):
+        return False
+    if any(pattern in url for pattern in allowlist):
+        return False
+    if resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    host = host_of(url)
+    if any(pattern in host for pattern in BLOCKED_HOST_PATTERNS):
+        return True
+    if resource_type == "script" and page_url:
+        page_host = host_of(page_url)
+        if page_host and site_of(host) != site_of(page_host):
+            return True
+    return False
@@ -0,0 +1,97 @@
+# ABOUTME: Tracks browser wear (navigations, resident memory) to decide when to recycle it.
+# ABOUTME: Reads child-process RSS from /proc; degrades to navigation counting elsewhere.
+
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROC = Path("/proc")
+
+DEFAULT_MAX_NAVIGATIONS = 2000
+DEFAULT_MAX_RSS_MB = 2048
+# Walking /proc costs a few ms, so memory is sampled every N navigations
+RSS_CHECK_INTERVAL = 25
+
+
+def _children_by_parent(proc: Path) -> Dict[int, List[int]]:
+    children: Dict[int, List[int]] = {}
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # The command name is parenthesized and may contain spaces
+        fields = stat[stat.rfind(")") + 2:].split()
+        children.setdefault(int(fields[1]), []).append(int(entry.name))
+    return children
+
+
+def _rss_kb(proc: Path, pid: int) -> int:
+    try:
+        for line in (proc / str(pid) / "status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def descendant_rss_mb(root_pid: Optional[int] = None, proc: Path = PROC) -> Optional[float]:
+    """Total resident memory of every process descended from root_pid, in MB.
+
+    The launched Chromium (and its renderers) run under the Playwright driver,
+    itself a child of this process. Returns None when /proc isn't available.
+    """
+    if not proc.is_dir():
+        return None
+    root = os.getpid() if root_pid is None else root_pid
+    try:
+        children = _children_by_parent(proc)
+    except OSError:
+        return None
+    total_kb = 0
+    stack = list(children.get(root, []))
+    while stack:
+        pid = stack.pop()
+        total_kb += _rss_kb(proc, pid)
+        stack.extend(children.get(pid, []))
+    return total_kb / 1024
+
+
+class BrowserWatchdog:
+    """Counts navigations and samples browser memory against recycle thresholds.
+
+    A threshold of 0 disables that check. Memory is only sampled for a
+    browser this process launched; a CDP-connected Chrome isn't our child.
+    """
+
+    def __init__(self, max_navigations: int = DEFAULT_MAX_NAVIGATIONS,
+                 max_rss_mb: int = DEFAULT_MAX_RSS_MB, measure_rss: bool = True):
+        self.max_navigations = max_navigations
+        self.max_rss_mb = max_rss_mb
+        self.measure_rss = measure_rss
+        self.navigations = 0
+        self.last_rss_mb: Optional[float] = None
+        self._sampled_at = 0
+
+    def record_navigation(self):
+        self.navigations += 1
+
+    def reset(self):
+        self.navigations = 0
+        self.last_rss_mb = None
+        self._sampled_at = 0
+
+    def due(self) -> Optional[str]:
+        """Return why the browser should be recycled now, or None."""
+        if self.max_navigations and self.navigations >= self.max_navigations:
+            return f"{self.navigations} navigations"
+        if (self.max_rss_mb and self.measure_rss
+                and self.navigations - self._sampled_at >= RSS_CHECK_INTERVAL):
+            self._sampled_at = self.navigations
+            self.last_rss_mb = descendant_rss_mb()
+            if self.last_rss_mb is not None and self.last_rss_mb >= self.max_rss_mb:
+                return f"{self.last_rss_mb:.0f} MB resident"
+        return None
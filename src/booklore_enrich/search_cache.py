@@ -0,0 +1,89 @@
+# ABOUTME: Persistent cache of search results keyed by normalized title/author.
+# ABOUTME: Lives outside cache.db so repeat runs and rebuilt caches skip browser searches.
+
+import datetime
+import sqlite3
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from booklore_enrich.scraper.base import slugify
+
+DEFAULT_SEARCH_CACHE_PATH = Path.home() / ".config" / "booklore-enrich" / "search-cache.db"
+DEFAULT_NO_MATCH_TTL_DAYS = 30
+
+SEARCH_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_cache (
+    source TEXT NOT NULL,
+    query_key TEXT NOT NULL,
+    source_id TEXT,
+    slug TEXT,
+    searched_at TIMESTAMP NOT NULL,
+    expires_at TIMESTAMP,
+    PRIMARY KEY (source, query_key)
+);
+"""
+
+
+def search_key(title: str, author: str) -> str:
+    """Normalize a title/author pair so trivially different spellings share a key."""
+    return f"{slugify(title, '')}|{slugify(author, '')}"
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class SearchCache:
+    """Remembers which source_id/slug a search resolved to, per source.
+
+    Matches are kept indefinitely (book ids on romance.io/booknaut are
+    stable). "No match" results are cached too, but expire after
+    `no_match_ttl_days` so books added to a site later are picked up.
+    """
+
+    def __init__(self, path: Path = DEFAULT_SEARCH_CACHE_PATH,
+                 no_match_ttl_days: int = DEFAULT_NO_MATCH_TTL_DAYS):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.no_match_ttl_days = no_match_ttl_days
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SEARCH_CACHE_SCHEMA)
+        self.conn.commit()
+
+    def lookup(self, source: str, title: str, author: str) -> Tuple[bool, Optional[Dict[str, str]]]:
+        """Return (hit, result). A hit with a None result is a cached "no match"."""
+        row = self.conn.execute(
+            """SELECT source_id, slug, expires_at FROM search_cache
+               WHERE source = ? AND query_key = ?""",
+            (source, search_key(title, author)),
+        ).fetchone()
+        if row is None:
+            return False, None
+        source_id, slug, expires_at = row
+        if expires_at is not None and expires_at <= _utcnow().isoformat():
+            return False, None
+        if source_id is None:
+            return True, None
+        return True, {"source_id": source_id, "slug": slug}
+
+    def store(self, source: str, title: str, author: str,
+              result: Optional[Dict[str, str]]):
+        """Record a search outcome; pass None to record "no match"."""
+        now = _utcnow()
+        if result:
+            source_id, slug, expires_at = result["source_id"], result["slug"], None
+        else:
+            source_id, slug = None, None
+            expires_at = (now + datetime.timedelta(days=self.no_match_ttl_days)).isoformat()
+        self.conn.execute(
+            """INSERT INTO search_cache (source, query_key, source_id, slug, searched_at, expires_at)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT(source, query_key) DO UPDATE SET
+                   source_id=excluded.source_id, slug=excluded.slug,
+                   searched_at=excluded.searched_at, expires_at=excluded.expires_at""",
+            (source, search_key(title, author), source_id, slug, now.isoformat(), expires_at),
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
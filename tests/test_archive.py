@@ -0,0 +1,70 @@
+# ABOUTME: Tests for the compressed raw-HTML archive.
+# ABOUTME: Covers content addressing, codecs, prefix lookup, and TTL pruning.
+
+import datetime
+
+import pytest
+
+from booklore_enrich.archive import HtmlArchive, page_kind
+
+BOOK_URL = "https://www.romance.io/books/abc123def456789012345678/cool-book"
+
+
+def test_page_kind():
+    assert page_kind(BOOK_URL) == "book"
+    assert page_kind("https://www.romance.io/search?q=x") == "search"
+    assert page_kind("https://www.romance.io/topics/best/slow-burn/1") == "topic"
+
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma"])
+def test_store_and_load_roundtrip(tmp_path, codec):
+    archive = HtmlArchive(tmp_path / "archive.db", codec=codec)
+    archive.store(BOOK_URL, "<html>tags</html>")
+    assert archive.latest(BOOK_URL) == "<html>tags</html>"
+
+
+def test_identical_html_stored_once(tmp_path):
+    archive = HtmlArchive(tmp_path / "archive.db")
+    archive.store(BOOK_URL, "<html>same</html>")
+    archive.store(BOOK_URL + "-other", "<html>same</html>")
+    assert archive.conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 1
+    assert archive.conn.execute("SELECT COUNT(*) FROM fetches").fetchone()[0] == 2
+
+
+def test_empty_html_not_stored(tmp_path):
+    archive = HtmlArchive(tmp_path / "archive.db")
+    assert archive.store(BOOK_URL, "") is None
+    assert archive.latest(BOOK_URL) is None
+
+
+def test_latest_returns_newest_fetch(tmp_path):
+    archive = HtmlArchive(tmp_path / "archive.db")
+    archive.store(BOOK_URL, "<html>v1</html>")
+    archive.store(BOOK_URL, "<html>v2</html>")
+    assert archive.latest(BOOK_URL) == "<html>v2</html>"
+
+
+def test_latest_with_prefix_matches_book_id(tmp_path):
+    archive = HtmlArchive(tmp_path / "archive.db")
+    archive.store(BOOK_URL, "<html>book</html>")
+    url, html = archive.latest_with_prefix(
+        "https://www.romance.io/books/abc123def456789012345678/"
+    )
+    assert url == BOOK_URL
+    assert html == "<html>book</html>"
+
+
+def test_expired_fetches_are_ignored_and_pruned(tmp_path):
+    archive = HtmlArchive(tmp_path / "archive.db", ttl_days=30)
+    archive.store(BOOK_URL, "<html>old</html>")
+    old = (datetime.datetime.now(datetime.timezone.utc)
+           - datetime.timedelta(days=31)).isoformat()
+    archive.conn.execute("UPDATE fetches SET fetched_at = ?", (old,))
+    assert archive.latest(BOOK_URL) is None
+    assert archive.prune() == 1
+    assert archive.conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 0
+
+
+def test_unknown_codec_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        HtmlArchive(tmp_path / "archive.db", codec="brotli")
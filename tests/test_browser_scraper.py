@@ -0,0 +1,277 @@
+# ABOUTME: Tests for BrowserScraper's fetch logic against fake Playwright pages.
+# ABOUTME: Covers readiness waits, Cloudflare handling, and rate-limit feedback without a browser.
+
+import httpx
+
+from booklore_enrich.archive import HtmlArchive
+from booklore_enrich.scraper.base import EXTRACT_JS, BrowserScraper, extract_from_html
+from booklore_enrich.scraper.clearance import ClearanceStore
+from booklore_enrich.scraper.http_fetch import HttpFetcher
+from booklore_enrich.scraper.pool import ContextPool, PageSlot
+from booklore_enrich.scraper.rate_limit import HostRateLimiter
+from booklore_enrich.scraper.readiness import profile_for
+
+BOOK_URL = "https://www.romance.io/books/abc123def456789012345678/cool-book"
+BOOK_HTML = '<a href="/topics/best/slow-burn/1">Slow Burn</a>'
+SEARCH_HTML = '<a href="/books/abc123def456789012345678/cool-book">Cool Book</a>'
+
+
+class FakePage:
+    """Minimal async stand-in for a Playwright page."""
+
+    def __init__(self, html="", title="Book", challenge_clears=True):
+        self.html = html
+        self._title = title
+        self.challenge_clears = challenge_clears
+        self.url = "about:blank"
+        self.calls = []
+        self.context = FakeContext([
+            {"name": "cf_clearance", "value": "token", "domain": ".romance.io",
+             "path": "/", "expires": 4102444800},
+        ])
+
+    def is_closed(self):
+        return False
+
+    async def evaluate(self, expr, arg=None):
+        if expr == EXTRACT_JS:
+            self.calls.append(("extract", None))
+            return extract_from_html(self.html)
+        return 1
+
+    async def goto(self, url, **kwargs):
+        self.calls.append(("goto", url))
+        self.url = url
+
+    async def title(self):
+        return self._title
+
+    async def wait_for_function(self, expr, timeout=None):
+        self.calls.append(("wait_for_function", timeout))
+        if not self.challenge_clears:
+            raise TimeoutError("challenge never cleared")
+        self._title = "Book"
+
+    async def wait_for_selector(self, selector, **kwargs):
+        self.calls.append(("wait_for_selector", selector))
+
+    async def wait_for_load_state(self, state, **kwargs):
+        self.calls.append(("wait_for_load_state", state))
+
+    async def wait_for_timeout(self, ms):
+        self.calls.append(("wait_for_timeout", ms))
+
+    async def content(self):
+        self.calls.append(("content", None))
+        return self.html
+
+
+class FakeContext:
+    def __init__(self, cookies=()):
+        self.cookies = list(cookies)
+
+    async def storage_state(self):
+        return {"cookies": self.cookies, "origins": []}
+
+    async def close(self):
+        pass
+
+
+def make_scraper(page, **kwargs):
+    """A BrowserScraper whose pool hands out the given fake page."""
+    scraper = BrowserScraper(rate_limit=0.0, **kwargs)
+
+    async def factory():
+        return PageSlot(FakeContext(), page)
+
+    scraper._pool = ContextPool(factory, size=1)
+    return scraper
+
+
+def test_profile_for_kinds():
+    assert profile_for(BOOK_URL).selector == 'a[href*="/topics/"]'
+    assert profile_for("https://www.romance.io/search?q=x").selector == 'a[href*="/books/"]'
+    assert profile_for("https://example.com/").selector is None
+    assert profile_for(BOOK_URL, wait_selector="h1").selector == "h1"
+
+
+async def test_fetch_returns_when_ready_without_fixed_sleep():
+    page = FakePage(BOOK_HTML)
+    scraper = make_scraper(page)
+    assert await scraper.fetch_page(BOOK_URL) == BOOK_HTML
+    assert ("wait_for_selector", 'a[href*="/topics/"]') in page.calls
+    assert not any(call[0] == "wait_for_timeout" for call in page.calls)
+
+
+async def test_generic_page_falls_back_to_fixed_sleep():
+    page = FakePage("<html></html>")
+    scraper = make_scraper(page)
+    await scraper.fetch_page("https://example.com/")
+    assert ("wait_for_timeout", 3000) in page.calls
+
+
+async def test_search_book_uses_search_profile():
+    page = FakePage(SEARCH_HTML)
+    scraper = make_scraper(page)
+    result = await scraper.search_book("https://www.romance.io", "Cool Book", "Author")
+    assert result == {"source_id": "abc123def456789012345678", "slug": "cool-book"}
+    assert ("wait_for_selector", 'a[href*="/books/"]') in page.calls
+
+
+async def test_resolved_challenge_backs_off_rate_limit():
+    page = FakePage(BOOK_HTML, title="Just a moment...")
+    limiter = HostRateLimiter(rate_limit=2.0)
+    scraper = make_scraper(page, rate_limiter=limiter)
+    assert await scraper.fetch_page(BOOK_URL) == BOOK_HTML
+    assert limiter.delay_for(BOOK_URL) == 4.0
+
+
+async def test_unresolved_challenge_returns_empty():
+    page = FakePage(BOOK_HTML, title="Just a moment...", challenge_clears=False)
+    scraper = make_scraper(page)
+    assert await scraper.fetch_page(BOOK_URL) == ""
+
+
+async def test_scrape_book_uses_in_page_extraction():
+    page = FakePage(BOOK_HTML)
+    scraper = make_scraper(page)
+    data = await scraper.scrape_book("https://www.romance.io", "abc123def456789012345678", "cool-book")
+    assert data["tags"] == ["slow-burn"]
+    assert ("extract", None) in page.calls
+    assert ("content", None) not in page.calls
+
+
+async def test_scrape_book_keeps_full_html_when_archiving(tmp_path):
+    page = FakePage(BOOK_HTML)
+    archive = HtmlArchive(tmp_path / "archive.db")
+    scraper = make_scraper(page, archive=archive)
+    data = await scraper.scrape_book("https://www.romance.io", "abc123def456789012345678", "cool-book")
+    assert data["tags"] == ["slow-burn"]
+    assert ("content", None) in page.calls
+    assert archive.latest(BOOK_URL) == BOOK_HTML
+
+
+async def test_slug_guess_hit_archived_under_book_id_url(tmp_path):
+    html = ('<link rel="canonical" href="/books/abc123def456789012345678/cool-book-jane-doe">'
+            + BOOK_HTML)
+    page = FakePage(html)
+    archive = HtmlArchive(tmp_path / "archive.db")
+    scraper = make_scraper(page, archive=archive)
+    hit = await scraper.lookup_by_slug("https://www.romance.io", "Cool Book", "Jane Doe")
+    assert hit["source_id"] == "abc123def456789012345678"
+    archived = archive.latest_with_prefix(
+        "https://www.romance.io/books/abc123def456789012345678/")
+    assert archived is not None and archived[1] == html
+
+
+async def test_passed_challenge_saves_clearance(tmp_path):
+    store = ClearanceStore(tmp_path / "clearance.json")
+    page = FakePage(BOOK_HTML, title="Just a moment...")
+    await make_scraper(page, clearance=store).fetch_page(BOOK_URL)
+    assert store.has(BOOK_URL)
+    assert store.storage_state()["cookies"][0]["name"] == "cf_clearance"
+
+
+async def test_blocked_challenge_drops_clearance(tmp_path):
+    store = ClearanceStore(tmp_path / "clearance.json")
+    store.update(BOOK_URL, await FakeContext([
+        {"name": "cf_clearance", "value": "old", "domain": ".romance.io", "expires": -1},
+    ]).storage_state())
+    page = FakePage(BOOK_HTML, title="Just a moment...", challenge_clears=False)
+    await make_scraper(page, clearance=store).fetch_page(BOOK_URL)
+    assert not store.has(BOOK_URL)
+
+
+def with_http(scraper, body, status=200):
+    scraper._http = HttpFetcher(transport=httpx.MockTransport(
+        lambda request: httpx.Response(status, text=body)))
+    scraper._http.harvest(BOOK_URL, [], "UA/1")
+    return scraper
+
+
+async def test_http_fast_path_skips_the_browser():
+    page = FakePage(BOOK_HTML)
+    scraper = with_http(make_scraper(page), BOOK_HTML)
+    data = await scraper.scrape_book("https://www.romance.io", "abc123def456789012345678", "cool-book")
+    assert "slow-burn" in data["tags"]
+    assert page.calls == []
+    assert scraper.http_hits == 1
+
+
+async def test_empty_http_parse_escalates_to_browser():
+    page = FakePage(BOOK_HTML)
+    scraper = with_http(make_scraper(page), "<html>rendered by js</html>")
+    data = await scraper.scrape_book("https://www.romance.io", "abc123def456789012345678", "cool-book")
+    assert "slow-burn" in data["tags"]
+    assert ("goto", BOOK_URL) in page.calls
+    assert scraper.http_hits == 0
+
+
+def spy_on_limiter(scraper):
+    """Record every limiter wait and outcome the scraper reports."""
+    events = []
+    limiter = scraper._rate_limiter
+    wait, record = limiter.wait, limiter.record
+
+    async def spy_wait(url):
+        events.append(("wait", url))
+        await wait(url)
+
+    def spy_record(url, outcome, latency=None):
+        events.append(("record", outcome))
+        record(url, outcome, latency)
+
+    limiter.wait, limiter.record = spy_wait, spy_record
+    return events
+
+
+async def test_browser_escalation_waits_on_the_limiter_again():
+    page = FakePage(BOOK_HTML)
+    scraper = with_http(make_scraper(page), "<html>rendered by js</html>")
+    events = spy_on_limiter(scraper)
+    await scraper.scrape_book("https://www.romance.io", "abc123def456789012345678", "cool-book")
+    assert [e for e in events if e[0] == "wait"] == [("wait", BOOK_URL)] * 2
+
+
+async def test_http_challenge_is_reported_to_the_limiter():
+    page = FakePage(BOOK_HTML)
+    scraper = with_http(make_scraper(page), "blocked", status=403)
+    events = spy_on_limiter(scraper)
+    await scraper.scrape_book("https://www.romance.io", "abc123def456789012345678", "cool-book")
+    assert events[1] == ("record", "challenge")
+    assert not scraper._http.has_session(BOOK_URL)
+
+
+async def test_search_skips_the_http_tier():
+    page = FakePage(SEARCH_HTML)
+    requests = []
+    scraper = make_scraper(page)
+    scraper._http = HttpFetcher(transport=httpx.MockTransport(
+        lambda request: requests.append(request) or httpx.Response(200, text=SEARCH_HTML)))
+    scraper._http.harvest(BOOK_URL, [], "UA/1")
+    result = await scraper.search_book("https://www.romance.io", "Cool Book", "Author")
+    assert result["source_id"] == "abc123def456789012345678"
+    assert requests == []
+
+
+async def test_http_404_is_final():
+    page = FakePage(BOOK_HTML)
+    scraper = with_http(make_scraper(page), "not here", status=404)
+    assert await scraper.lookup_by_slug("https://www.romance.io", "Cool Book", "Jane Doe") is None
+    assert page.calls == []
+
+
+async def test_browser_recycled_between_fetches_after_max_navigations():
+    page = FakePage(BOOK_HTML)
+    scraper = make_scraper(page, max_navigations=2, max_rss_mb=0)
+    restarts = []
+
+    async def restart():
+        restarts.append(scraper._watchdog.navigations)
+
+    scraper._restart_browser = restart
+    for _ in range(3):
+        assert await scraper.fetch_page(BOOK_URL)
+    assert restarts == [2]
+    assert scraper.recycles == 1
+    assert scraper._watchdog.navigations == 1
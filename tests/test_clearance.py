@@ -0,0 +1,55 @@
+# ABOUTME: Tests for the persisted Cloudflare clearance store.
+# ABOUTME: Covers per-site cookie filtering, expiry, invalidation and reload from disk.
+
+import time
+
+from booklore_enrich.scraper.clearance import ClearanceStore
+
+ROMANCE = "https://www.romance.io/books/abc/x"
+BOOKNAUT = "https://www.thebooknaut.com/search?q=x"
+
+
+def state(*cookies):
+    return {"cookies": list(cookies), "origins": []}
+
+
+def cookie(name, domain, expires=-1):
+    return {"name": name, "value": "v", "domain": domain, "path": "/", "expires": expires}
+
+
+def test_update_keeps_only_the_sites_cookies(tmp_path):
+    store = ClearanceStore(tmp_path / "clearance.json")
+    store.update(ROMANCE, state(cookie("cf_clearance", ".romance.io"),
+                                cookie("_ga", ".google.com")))
+    assert [c["domain"] for c in store.storage_state()["cookies"]] == [".romance.io"]
+    assert store.has(ROMANCE)
+    assert not store.has(BOOKNAUT)
+
+
+def test_state_survives_reload(tmp_path):
+    path = tmp_path / "clearance.json"
+    ClearanceStore(path).update(ROMANCE, state(cookie("cf_clearance", "www.romance.io")))
+    assert ClearanceStore(path).has(ROMANCE)
+    assert path.stat().st_mode & 0o077 == 0
+
+
+def test_expired_clearance_is_ignored(tmp_path):
+    store = ClearanceStore(tmp_path / "clearance.json")
+    store.update(ROMANCE, state(cookie("cf_clearance", ".romance.io", time.time() - 10)))
+    assert not store.has(ROMANCE)
+    assert store.storage_state() is None
+
+
+def test_clearance_without_expiry_uses_max_age(tmp_path):
+    store = ClearanceStore(tmp_path / "clearance.json", max_age_seconds=-1)
+    store.update(ROMANCE, state(cookie("cf_clearance", ".romance.io")))
+    assert not store.has(ROMANCE)
+
+
+def test_invalidate_drops_only_that_site(tmp_path):
+    store = ClearanceStore(tmp_path / "clearance.json")
+    store.update(ROMANCE, state(cookie("cf_clearance", ".romance.io")))
+    store.update(BOOKNAUT, state(cookie("cf_clearance", ".thebooknaut.com")))
+    store.invalidate(ROMANCE)
+    assert not store.has(ROMANCE)
+    assert store.has(BOOKNAUT)
@@ -62,9 +62,45 @@ def test_scrape_has_from_dir_option():
     assert "--from-dir" in result.output
 
 
+def test_scrape_has_budget_options():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["scrape", "--help"])
+    assert "--max-duration" in result.output
+    assert "--max-requests" in result.output
+
+
+def test_scrape_rejects_bad_duration():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["scrape", "--max-duration", "soon"])
+    assert result.exit_code != 0
+    assert "--max-duration" in result.output
+
+
+def test_scrape_rejects_non_positive_duration():
+    runner = CliRunner()
+    for value in ("-5m", "0", "0s"):
+        result = runner.invoke(cli, ["scrape", "--max-duration", value])
+        assert result.exit_code != 0
+        assert "must be positive" in result.output
+
+
 def test_embed_command_exists():
     runner = CliRunner()
     result = runner.invoke(cli, ["embed", "--help"])
     assert result.exit_code == 0
     assert "--dry-run" in result.output
     assert "--force" in result.output
+
+
+def test_reparse_command_exists():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["reparse", "--help"])
+    assert result.exit_code == 0
+    assert "archived HTML" in result.output
+
+
+def test_scraper_daemon_command_exists():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["scraper-daemon", "--help"])
+    assert result.exit_code == 0
+    assert "warm browser" in result.output
@@ -65,3 +65,26 @@ def test_get_password_from_env(monkeypatch):
 def test_get_password_env_takes_priority(monkeypatch):
     monkeypatch.setenv("BOOKLORE_PASSWORD", "from-env")
     assert get_password() == "from-env"
+
+
+def test_archive_config_roundtrip(tmp_path):
+    config_file = tmp_path / "config.toml"
+    config = Config(archive_enabled=False, archive_ttl_days=7, archive_compression="lzma")
+    save_config(config, config_file)
+    loaded = load_config(config_file)
+    assert loaded.archive_enabled is False
+    assert loaded.archive_ttl_days == 7
+    assert loaded.archive_compression == "lzma"
+
+
+def test_persist_clearance_roundtrip(tmp_path):
+    config_file = tmp_path / "config.toml"
+    save_config(Config(persist_clearance=False), config_file)
+    assert load_config(config_file).persist_clearance is False
+
+
+def test_cdp_endpoints_roundtrip(tmp_path):
+    config_file = tmp_path / "config.toml"
+    endpoints = ["http://localhost:9222", "http://scraper-box:9223"]
+    save_config(Config(cdp_endpoints=endpoints), config_file)
+    assert load_config(config_file).cdp_endpoints == endpoints
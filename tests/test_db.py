@@ -15,6 +15,7 @@ def test_database_creates_tables(tmp_path):
     assert "discoveries" in table_names
     assert "discovery_preferences" in table_names
     assert "tag_cache" in table_names
+    assert "scrape_attempts" in table_names
 
 
 def test_upsert_and_get_book(tmp_path):
@@ -55,14 +56,14 @@ def test_set_steam_level(tmp_path):
     assert steam["label"] == "Explicit open door"
 
 
-def test_get_unscraped_books(tmp_path):
+def test_enqueue_scrape_jobs_skips_matched_books(tmp_path):
     db = Database(tmp_path / "test.db")
     db.upsert_book(booklore_id=1, title="Book A", author="Author")
     db.upsert_book(booklore_id=2, title="Book B", author="Author")
     db.mark_scraped(db.get_book_by_booklore_id(1)["id"], source="romance.io", source_id="abc123")
-    unscraped = db.get_unscraped_books(source="romance.io")
-    assert len(unscraped) == 1
-    assert unscraped[0]["title"] == "Book B"
+    assert db.enqueue_scrape_jobs("romance.io") == 1
+    claimed = db.claim_scrape_jobs("romance.io", "w1", 10)
+    assert [b["title"] for b in claimed] == ["Book B"]
 
 
 def test_add_discovery(tmp_path):
@@ -106,6 +107,25 @@ def test_get_all_books_with_tags(tmp_path):
     assert enriched[0]["steam_level"] == 3
 
 
+def test_enriched_and_embeddable_books_use_one_query(tmp_path):
+    db = Database(tmp_path / "test.db")
+    tag = db.get_or_create_tag("slow-burn", "trope", "romance.io")
+    for i in range(5):
+        db.upsert_book_by_path(f"/nas/{i}.epub", title=f"Book {i}", author="Author")
+        book = db.get_book_by_path(f"/nas/{i}.epub")
+        db.add_book_tag(book["id"], tag)
+        db.mark_scraped(book["id"], "romance.io", f"{i:024x}")
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    enriched = db.get_enriched_books()
+    embeddable = db.get_embeddable_books()
+    db.conn.set_trace_callback(None)
+    assert len(statements) == 2
+    assert len(enriched) == len(embeddable) == 5
+    assert embeddable[0]["tags"] == db.get_book_tags(embeddable[0]["id"])
+    assert enriched[0]["steam_level"] is None
+
+
 def test_compute_tag_hash_consistent_regardless_of_order():
     """Same tags in different order should produce the same hash."""
     hash1 = compute_tag_hash(["slow-burn", "enemies-to-lovers", "spice-4"])
@@ -293,3 +313,255 @@ def test_migration_adds_missing_columns(tmp_path):
     # Existing data should survive
     book = db.get_book_by_booklore_id(1)
     assert book["title"] == "Old Book"
+
+
+def test_backoff_delay_doubles_and_caps():
+    from booklore_enrich.db import BACKOFF_MAX, backoff_delay
+    import datetime
+    assert backoff_delay("not_found", 1) == datetime.timedelta(days=1)
+    assert backoff_delay("not_found", 3) == datetime.timedelta(days=4)
+    assert backoff_delay("error", 1) == datetime.timedelta(hours=1)
+    assert backoff_delay("not_found", 50) == BACKOFF_MAX
+
+
+def test_unmatched_book_skipped_during_backoff(tmp_path):
+    db = Database(tmp_path / "test.db")
+    db.upsert_book(booklore_id=1, title="Not Romance", author="Author")
+    book = db.get_book_by_booklore_id(1)
+    db.record_scrape_attempt(book["id"], "romance.io", "not_found")
+    assert db.enqueue_scrape_jobs("romance.io") == 0
+    # Backoff is per source
+    assert db.enqueue_scrape_jobs("booknaut") == 1
+    assert db.enqueue_scrape_jobs("romance.io", ignore_backoff=True) == 1
+
+
+def test_record_scrape_attempt_counts_attempts(tmp_path):
+    db = Database(tmp_path / "test.db")
+    db.upsert_book(booklore_id=1, title="Book", author="Author")
+    book = db.get_book_by_booklore_id(1)
+    db.record_scrape_attempt(book["id"], "romance.io", "not_found")
+    db.record_scrape_attempt(book["id"], "romance.io", "error")
+    attempt = db.get_scrape_attempt(book["id"], "romance.io")
+    assert attempt["attempts"] == 2
+    assert attempt["last_outcome"] == "error"
+    assert attempt["next_attempt_at"] > attempt["last_attempt_at"]
+
+
+def test_expired_backoff_makes_book_eligible_again(tmp_path):
+    db = Database(tmp_path / "test.db")
+    db.upsert_book(booklore_id=1, title="Book", author="Author")
+    book = db.get_book_by_booklore_id(1)
+    db.record_scrape_attempt(book["id"], "romance.io", "not_found")
+    db.execute("UPDATE scrape_attempts SET next_attempt_at = '2000-01-01T00:00:00+00:00'")
+    assert db.enqueue_scrape_jobs("romance.io") == 1
+
+
+def test_mark_scraped_clears_attempts(tmp_path):
+    db = Database(tmp_path / "test.db")
+    db.upsert_book(booklore_id=1, title="Book", author="Author")
+    book = db.get_book_by_booklore_id(1)
+    db.record_scrape_attempt(book["id"], "romance.io", "error")
+    db.mark_scraped(book["id"], "romance.io", "abc")
+    assert db.get_scrape_attempt(book["id"], "romance.io") is None
+
+
+def test_upsert_books_bulk_in_chunks(tmp_path):
+    db = Database(tmp_path / "test.db")
+    books = [{"booklore_id": i, "title": f"Book {i}", "author": "Author"} for i in range(5)]
+    assert db.upsert_books_bulk(iter(books), chunk_size=2) == 5
+    db.upsert_books_bulk([{"booklore_id": 3, "title": "Renamed", "author": "Author",
+                           "isbn": "123"}])
+    assert db.execute("SELECT COUNT(*) FROM books").fetchone()[0] == 5
+    book = db.get_book_by_booklore_id(3)
+    assert book["title"] == "Renamed"
+    assert book["isbn"] == "123"
+
+
+def test_upsert_books_by_path_bulk_keeps_ids(tmp_path):
+    db = Database(tmp_path / "test.db")
+    books = [{"file_path": f"/lib/{i}.epub", "title": f"Book {i}", "author": "Author"}
+             for i in range(3)]
+    assert db.upsert_books_by_path_bulk(books, chunk_size=2) == 3
+    first_id = db.get_book_by_path("/lib/0.epub")["id"]
+    db.upsert_books_by_path_bulk([{"file_path": "/lib/0.epub", "title": "Book 0",
+                                   "author": "Author", "series": "Saga",
+                                   "series_index": "1"}])
+    book = db.get_book_by_path("/lib/0.epub")
+    assert book["id"] == first_id
+    assert book["series"] == "Saga"
+
+
+def test_iter_embeddable_books_pages_while_caller_writes(tmp_path):
+    from booklore_enrich.db import ITER_PAGE_SIZE
+    db = Database(tmp_path / "test.db")
+    count = ITER_PAGE_SIZE * 2 + 7
+    db.upsert_books_by_path_bulk(
+        {"file_path": f"/nas/{i}.epub", "title": f"Book {i}", "author": "Author"}
+        for i in range(count))
+    db.execute("UPDATE books SET last_scraped_at = CURRENT_TIMESTAMP")
+    db.conn.commit()
+    assert db.count_embeddable_books() == count
+    seen = []
+    for book in db.iter_embeddable_books():
+        seen.append(book["id"])
+        db.mark_embedded(book["id"])
+    assert len(seen) == len(set(seen)) == count
+    assert db.count_embeddable_books() == 0
+    assert list(db.iter_embeddable_books()) == []
+
+
+def test_managed_indexes_created_and_used(tmp_path):
+    from booklore_enrich.db import INDEXES
+    db = Database(tmp_path / "test.db")
+    db.execute("DROP INDEX idx_books_unembedded")
+    db.close()
+    db = Database(tmp_path / "test.db")
+    names = {row[0] for row in db.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index'").fetchall()}
+    assert set(INDEXES) <= names
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    db.count_embeddable_books()
+    db.conn.set_trace_callback(None)
+    plan = db.execute(f"EXPLAIN QUERY PLAN {statements[0]}")
+    assert "idx_books_unembedded" in plan.fetchone()[3]
+
+
+def test_transaction_commits_once_at_the_end(tmp_path):
+    db = Database(tmp_path / "test.db")
+    other = Database(tmp_path / "test.db")
+    with db.transaction():
+        db.upsert_book(booklore_id=1, title="Book", author="Author")
+        tag_id = db.get_or_create_tag("slow-burn", "trope", "romance.io")
+        db.add_book_tag(db.get_book_by_booklore_id(1)["id"], tag_id)
+        assert other.get_book_by_booklore_id(1) is None
+    assert other.get_book_by_booklore_id(1) is not None
+
+
+def test_transaction_rolls_back_on_error(tmp_path):
+    import pytest
+    db = Database(tmp_path / "test.db")
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.upsert_book(booklore_id=1, title="Book", author="Author")
+            raise RuntimeError("boom")
+    assert db.get_book_by_booklore_id(1) is None
+
+
+def test_nested_transaction_rolls_back_only_inner_block(tmp_path):
+    db = Database(tmp_path / "test.db")
+    with db.transaction():
+        db.upsert_book(booklore_id=1, title="Kept", author="Author")
+        try:
+            with db.transaction():
+                db.upsert_book(booklore_id=2, title="Dropped", author="Author")
+                raise ValueError("inner")
+        except ValueError:
+            pass
+    assert db.get_book_by_booklore_id(1) is not None
+    assert db.get_book_by_booklore_id(2) is None
+
+
+def _queue_books(tmp_path, count):
+    db = Database(tmp_path / "test.db")
+    for i in range(count):
+        db.upsert_book(booklore_id=i, title=f"Book {i}", author="Author")
+    db.enqueue_scrape_jobs("romance.io")
+    return db
+
+
+def test_enqueue_scrape_jobs_is_idempotent(tmp_path):
+    db = _queue_books(tmp_path, 3)
+    assert db.enqueue_scrape_jobs("romance.io") == 0
+    assert db.count_claimable_jobs("romance.io") == 3
+    assert db.count_claimable_jobs("booknaut") == 0
+
+
+def test_workers_never_claim_the_same_job(tmp_path):
+    db = _queue_books(tmp_path, 5)
+    # A second connection stands in for another scrape process
+    other = Database(tmp_path / "test.db")
+    first = db.claim_scrape_jobs("romance.io", "worker-a", 3)
+    second = other.claim_scrape_jobs("romance.io", "worker-b", 3)
+    assert len(first) == 3 and len(second) == 2
+    assert not {b["id"] for b in first} & {b["id"] for b in second}
+    assert db.claim_scrape_jobs("romance.io", "worker-a", 3) == []
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    import datetime
+    db = _queue_books(tmp_path, 1)
+    db.claim_scrape_jobs("romance.io", "crashed", 1, lease=datetime.timedelta(seconds=-1))
+    reclaimed = db.claim_scrape_jobs("romance.io", "worker-b", 1)
+    assert len(reclaimed) == 1
+    assert db.get_scrape_job(reclaimed[0]["id"], "romance.io")["worker_id"] == "worker-b"
+
+
+def test_heartbeat_extends_lease(tmp_path):
+    import datetime
+    db = _queue_books(tmp_path, 1)
+    book = db.claim_scrape_jobs("romance.io", "worker-a", 1,
+                                lease=datetime.timedelta(seconds=-1))[0]
+    assert db.heartbeat_scrape_jobs("worker-a") == 1
+    assert db.claim_scrape_jobs("romance.io", "worker-b", 1) == []
+    assert db.get_scrape_job(book["id"], "romance.io")["status"] == "leased"
+
+
+def test_completed_job_requeued_only_when_book_still_unmatched(tmp_path):
+    db = _queue_books(tmp_path, 2)
+    first, second = db.claim_scrape_jobs("romance.io", "worker-a", 2)
+    db.mark_scraped(first["id"], "romance.io", "abc")
+    for book in (first, second):
+        db.complete_scrape_job(book["id"], "romance.io")
+    assert db.enqueue_scrape_jobs("romance.io") == 1
+    assert [b["id"] for b in db.claim_scrape_jobs("romance.io", "worker-a", 5)] == [second["id"]]
+
+
+def test_claim_prefers_fresh_books_with_isbn(tmp_path):
+    db = Database(tmp_path / "test.db")
+    db.upsert_book(booklore_id=1, title="Retried twice", author="A")
+    db.upsert_book(booklore_id=2, title="Retried once", author="A")
+    db.upsert_book(booklore_id=3, title="Fresh", author="A")
+    db.upsert_book(booklore_id=4, title="Fresh with ISBN", author="A", isbn="444")
+    for _ in range(2):
+        db.record_scrape_attempt(db.get_book_by_booklore_id(1)["id"], "romance.io", "unmatched")
+    db.record_scrape_attempt(db.get_book_by_booklore_id(2)["id"], "romance.io", "unmatched")
+    db.enqueue_scrape_jobs("romance.io", ignore_backoff=True)
+    # Priority decides both which jobs a batch takes and the order it hands them out
+    assert [b["title"] for b in db.claim_scrape_jobs("romance.io", "worker-a", 3)] == [
+        "Fresh with ISBN", "Fresh", "Retried once"]
+    assert [b["title"] for b in db.claim_scrape_jobs("romance.io", "worker-a", 3)] == [
+        "Retried twice"]
+
+
+def test_release_returns_unstarted_jobs(tmp_path):
+    db = _queue_books(tmp_path, 2)
+    claimed = db.claim_scrape_jobs("romance.io", "worker-a", 2)
+    db.release_scrape_jobs("worker-a", [claimed[1]["id"]])
+    assert db.count_claimable_jobs("romance.io") == 1
+
+
+def test_release_worker_jobs_keeps_checkpoints(tmp_path):
+    db = _queue_books(tmp_path, 3)
+    mine = db.claim_scrape_jobs("romance.io", "worker-a", 2)
+    db.claim_scrape_jobs("romance.io", "worker-b", 1)
+    db.checkpoint_scrape_job(mine[0]["id"], "romance.io", "searched",
+                             {"source_id": "a" * 24, "slug": "s"})
+    assert db.release_worker_jobs("worker-a") == 2
+    assert db.count_claimable_jobs("romance.io") == 2
+    assert db.get_scrape_job(mine[0]["id"], "romance.io")["stage"] == "searched"
+
+
+def test_scrape_jobs_checkpoint_columns_migrated(tmp_path):
+    import sqlite3
+    path = tmp_path / "test.db"
+    conn = sqlite3.connect(str(path))
+    conn.execute("""CREATE TABLE scrape_jobs (book_id INTEGER NOT NULL, source TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending', worker_id TEXT,
+                    lease_expires_at TIMESTAMP, heartbeat_at TIMESTAMP,
+                    enqueued_at TIMESTAMP NOT NULL, PRIMARY KEY (book_id, source))""")
+    conn.commit()
+    conn.close()
+    db = Database(path)
+    cols = {row[1] for row in db.execute("PRAGMA table_info(scrape_jobs)").fetchall()}
+    assert {"stage", "found_source_id", "found_slug", "metadata_json"} <= cols
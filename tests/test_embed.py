@@ -113,3 +113,25 @@ def test_embed_dry_run_does_not_modify(tmp_path, monkeypatch):
     # Not marked as embedded
     updated = db.get_book_by_path(str(epub_path))
     assert updated["embedded_at"] is None
+
+
+def test_embed_writes_files_outside_a_transaction(tmp_path, monkeypatch):
+    """EPUB rewrites don't hold the cache's write lock; marks land afterwards."""
+    db = Database(tmp_path / "cache.db")
+    for name in ("One", "Two"):
+        epub_path = tmp_path / "books" / "Author" / f"{name}.epub"
+        _make_test_epub(epub_path)
+        db.upsert_book_by_path(str(epub_path), name, "Author")
+        book = db.get_book_by_path(str(epub_path))
+        db.mark_scraped(book["id"], source="romance.io", source_id=name)
+    monkeypatch.setattr("booklore_enrich.commands.embed.Database", lambda: db)
+    in_transaction = []
+
+    def spy_write(file_path, **kwargs):
+        in_transaction.append(db.conn.in_transaction)
+
+    monkeypatch.setattr("booklore_enrich.commands.embed.write_epub_metadata", spy_write)
+    run_embed(directory=str(tmp_path / "books"))
+
+    assert in_transaction == [False, False]
+    assert db.count_embeddable_books(path_prefix=str(tmp_path / "books")) == 0
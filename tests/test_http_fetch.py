@@ -0,0 +1,56 @@
+# ABOUTME: Tests for the plain-HTTP fetch fast path and its challenge detection.
+# ABOUTME: Uses httpx's MockTransport in place of romance.io/booknaut.
+
+import httpx
+
+from booklore_enrich.scraper.http_fetch import HttpFetcher
+
+BOOK_URL = "https://www.romance.io/books/abc123def456789012345678/cool-book"
+COOKIES = [{"name": "cf_clearance", "value": "token", "domain": ".romance.io", "path": "/"}]
+
+
+def fetcher_for(handler):
+    return HttpFetcher(transport=httpx.MockTransport(handler))
+
+
+async def test_no_request_without_a_harvested_session():
+    requests = []
+    fetcher = fetcher_for(lambda request: requests.append(request) or httpx.Response(200))
+    assert await fetcher.fetch(BOOK_URL) is None
+    assert requests == []
+    await fetcher.close()
+
+
+async def test_sends_harvested_cookies_and_user_agent():
+    seen = {}
+
+    def handler(request):
+        seen["cookie"] = request.headers.get("cookie")
+        seen["ua"] = request.headers.get("user-agent")
+        return httpx.Response(200, text="<html>book</html>")
+
+    fetcher = fetcher_for(handler)
+    fetcher.harvest(BOOK_URL, COOKIES + [{"name": "x", "value": "y", "domain": ".other.com"}], "UA/1")
+    fetched = await fetcher.fetch(BOOK_URL)
+    assert fetched == {"url": BOOK_URL, "html": "<html>book</html>"}
+    assert seen == {"cookie": "cf_clearance=token", "ua": "UA/1"}
+    await fetcher.close()
+
+
+async def test_challenge_forgets_the_session():
+    fetcher = fetcher_for(lambda request: httpx.Response(
+        403, text="<title>Just a moment...</title>", headers={"cf-mitigated": "challenge"}))
+    fetcher.harvest(BOOK_URL, COOKIES, "UA/1")
+    assert await fetcher.fetch(BOOK_URL) is None
+    assert not fetcher.has_session(BOOK_URL)
+    await fetcher.close()
+
+
+async def test_fetch_outcomes():
+    statuses = iter([404, 500, 200])
+    fetcher = fetcher_for(lambda request: httpx.Response(next(statuses), text="<html>x</html>"))
+    fetcher.harvest(BOOK_URL, COOKIES, "UA/1")
+    assert (await fetcher.fetch_with_outcome(BOOK_URL))[1] == "not_found"
+    assert (await fetcher.fetch_with_outcome(BOOK_URL))[1] == "error"
+    assert (await fetcher.fetch_with_outcome(BOOK_URL))[1] == "ok"
+    await fetcher.close()
@@ -0,0 +1,95 @@
+# ABOUTME: Tests for the shared, adaptive per-host rate limiter.
+# ABOUTME: Verifies per-host spacing, outcome-driven delay changes, and persistence.
+
+import asyncio
+import time
+
+from booklore_enrich.scraper.rate_limit import (
+    CHALLENGE,
+    EMPTY,
+    OK,
+    TIMEOUT,
+    HostRateLimiter,
+    host_of,
+)
+
+
+def test_host_of():
+    assert host_of("https://www.romance.io/books/abc/slug") == "www.romance.io"
+
+
+async def test_concurrent_requests_to_one_host_are_spaced():
+    limiter = HostRateLimiter(rate_limit=0.05, jitter=1.0)
+    start = time.monotonic()
+    await asyncio.gather(*(limiter.wait("https://a.example/x") for _ in range(3)))
+    # First request goes immediately, the next two wait one interval each
+    assert time.monotonic() - start >= 0.1
+
+
+async def test_different_hosts_do_not_wait_on_each_other():
+    limiter = HostRateLimiter(rate_limit=0.2, jitter=1.0)
+    start = time.monotonic()
+    await asyncio.gather(
+        limiter.wait("https://a.example/x"),
+        limiter.wait("https://b.example/x"),
+    )
+    assert time.monotonic() - start < 0.1
+
+
+def test_clean_loads_speed_up_toward_floor():
+    limiter = HostRateLimiter(rate_limit=3.0, floor=1.0)
+    for _ in range(50):
+        limiter.record("https://a.example/x", OK, latency=4.0)
+    assert limiter.delay_for("a.example") == 1.0
+
+
+def test_challenges_back_off_up_to_ceiling():
+    limiter = HostRateLimiter(rate_limit=3.0, ceiling=10.0)
+    limiter.record("https://a.example/x", CHALLENGE)
+    assert limiter.delay_for("a.example") == 6.0
+    limiter.record("https://a.example/x", TIMEOUT)
+    assert limiter.delay_for("a.example") == 10.0
+    # Other hosts are unaffected
+    assert limiter.delay_for("b.example") == 3.0
+
+
+def test_slow_loads_back_off_gently():
+    limiter = HostRateLimiter(rate_limit=4.0)
+    limiter.record("https://a.example/x", OK, latency=30.0)
+    assert limiter.delay_for("a.example") == 5.0
+
+
+def test_state_persists_across_runs(tmp_path):
+    path = tmp_path / "rate-state.json"
+    limiter = HostRateLimiter(rate_limit=3.0, ceiling=30.0)
+    limiter.record("https://a.example/x", EMPTY)
+    limiter.save(path)
+    restored = HostRateLimiter(rate_limit=3.0, ceiling=30.0)
+    restored.load(path)
+    assert restored.delay_for("a.example") == 6.0
+
+
+def test_loaded_state_is_clamped_to_current_bounds(tmp_path):
+    path = tmp_path / "rate-state.json"
+    path.write_text('{"a.example": {"delay": 100.0}}')
+    limiter = HostRateLimiter(rate_limit=3.0, ceiling=20.0)
+    limiter.load(path)
+    assert limiter.delay_for("a.example") == 20.0
+
+
+def test_limiter_reusable_across_event_loops():
+    limiter = HostRateLimiter(rate_limit=0.01, jitter=1.0)
+
+    async def burst():
+        await asyncio.gather(*(limiter.wait("https://a.example/x") for _ in range(2)))
+
+    asyncio.run(burst())
+    asyncio.run(burst())
+
+
+def test_save_without_records_leaves_state_alone(tmp_path):
+    path = tmp_path / "rate-state.json"
+    path.write_text('{"www.romance.io": {"delay": 9.0}}')
+    limiter = HostRateLimiter(rate_limit=3.0)
+    limiter.save(path)
+    assert "9.0" in path.read_text()
@@ -0,0 +1,79 @@
+# ABOUTME: Tests for the reparse command that rebuilds metadata from archived HTML.
+# ABOUTME: Verifies tags/steam are rebuilt offline and partial archives are skipped.
+
+import pytest
+
+from booklore_enrich.archive import HtmlArchive
+from booklore_enrich.commands import reparse
+from booklore_enrich.commands.reparse import reparse_book
+from booklore_enrich.db import Database
+
+ROMANCE_ID = "abc123def456789012345678"
+BOOKNAUT_ID = "def456abc123789012345678"
+
+BOOK_HTML = '''
+<a href="/topics/best/enemies-to-lovers/1">Enemies to Lovers</a>
+<a href="/topics/best/contemporary/1">Contemporary</a>
+<span>Open door</span>
+'''
+
+
+def _scraped_book(db):
+    db.upsert_book(booklore_id=1, title="Book", author="Author")
+    book = db.get_book_by_booklore_id(1)
+    old_tag = db.get_or_create_tag("stale-tag", "trope", "romance.io")
+    db.add_book_tag(book["id"], old_tag)
+    db.mark_scraped(book["id"], "romance.io", ROMANCE_ID)
+    return db.get_book_by_booklore_id(1)
+
+
+def test_reparse_rebuilds_tags_and_steam(tmp_path):
+    db = Database(tmp_path / "cache.db")
+    archive = HtmlArchive(tmp_path / "archive.db")
+    book = _scraped_book(db)
+    archive.store(f"https://www.romance.io/books/{ROMANCE_ID}/book-author", BOOK_HTML)
+
+    assert reparse_book(db, archive, book) == "reparsed"
+
+    tags = {t["name"]: t["category"] for t in db.get_book_tags(book["id"])}
+    assert tags == {"enemies-to-lovers": "trope", "contemporary": "subgenre"}
+    assert db.get_steam_level(book["id"])["level"] == 3
+
+
+def test_reparse_skips_book_missing_a_source_page(tmp_path):
+    db = Database(tmp_path / "cache.db")
+    archive = HtmlArchive(tmp_path / "archive.db")
+    book = _scraped_book(db)
+    db.mark_scraped(book["id"], "booknaut", BOOKNAUT_ID)
+    book = db.get_book_by_booklore_id(1)
+    archive.store(f"https://www.romance.io/books/{ROMANCE_ID}/book-author", BOOK_HTML)
+
+    assert reparse_book(db, archive, book) == "missing"
+    assert [t["name"] for t in db.get_book_tags(book["id"])] == ["stale-tag"]
+
+
+def test_reparse_keeps_scrape_bookkeeping(tmp_path):
+    db = Database(tmp_path / "cache.db")
+    archive = HtmlArchive(tmp_path / "archive.db")
+    book = _scraped_book(db)
+    db.record_scrape_attempt(book["id"], "romance.io", "error")
+    archive.store(f"https://www.romance.io/books/{ROMANCE_ID}/book-author", BOOK_HTML)
+
+    assert reparse_book(db, archive, book) == "reparsed"
+    assert db.get_book_by_booklore_id(1)["last_scraped_at"] == book["last_scraped_at"]
+    assert db.get_scrape_attempt(book["id"], "romance.io")["attempts"] == 1
+
+
+def test_reparse_rolls_back_when_rebuild_fails(tmp_path, monkeypatch):
+    db = Database(tmp_path / "cache.db")
+    archive = HtmlArchive(tmp_path / "archive.db")
+    book = _scraped_book(db)
+    archive.store(f"https://www.romance.io/books/{ROMANCE_ID}/book-author", BOOK_HTML)
+
+    def broken_parser(html):
+        raise ValueError("parser bug")
+
+    monkeypatch.setattr(reparse, "parse_book_page", broken_parser)
+    with pytest.raises(ValueError):
+        reparse_book(db, archive, book)
+    assert [t["name"] for t in db.get_book_tags(book["id"])] == ["stale-tag"]
@@ -0,0 +1,53 @@
+# ABOUTME: Tests for the scraper's request interception rules.
+# ABOUTME: Verifies heavy/third-party requests are blocked and Cloudflare is never blocked.
+
+from booklore_enrich.scraper.request_filter import (
+    allowlist_for,
+    should_block_request,
+    site_of,
+)
+
+PAGE = "https://www.romance.io/books/abc123def456789012345678/cool-book"
+
+
+def test_site_of():
+    assert site_of("www.romance.io") == "romance.io"
+    assert site_of("cdn.thebooknaut.com") == "thebooknaut.com"
+
+
+def test_blocks_heavy_resource_types():
+    for resource_type in ("image", "font", "media"):
+        assert should_block_request("https://www.romance.io/x.png", resource_type, PAGE)
+
+
+def test_allows_document_and_first_party_xhr():
+    assert not should_block_request(PAGE, "document", PAGE)
+    assert not should_block_request("https://www.romance.io/json/search", "xhr", PAGE)
+    assert not should_block_request("https://static.romance.io/app.js", "script", PAGE)
+
+
+def test_blocks_analytics_and_ads():
+    assert should_block_request("https://www.google-analytics.com/collect", "xhr", PAGE)
+    assert should_block_request("https://securepubads.g.doubleclick.net/tag.js", "script", PAGE)
+
+
+def test_blocks_third_party_scripts():
+    assert should_block_request("https://widgets.example.com/w.js", "script", PAGE)
+
+
+def test_never_blocks_cloudflare_challenge():
+    assert not should_block_request(
+        "https://challenges.cloudflare.com/turnstile/v0/api.js", "script", PAGE)
+    assert not should_block_request(
+        "https://www.romance.io/cdn-cgi/challenge-platform/h/b/orchestrate/jsch/v1", "script", PAGE)
+
+
+def test_source_allowlist_lets_needed_scripts_through():
+    allowlist = allowlist_for(PAGE)
+    assert not should_block_request(
+        "https://code.jquery.com/jquery-3.7.1.min.js", "script", PAGE, allowlist)
+
+
+def test_configured_allowlist_extends_source_allowlist():
+    allowlist = allowlist_for(PAGE, extra=["widgets.example.com"])
+    assert not should_block_request("https://widgets.example.com/w.js", "script", PAGE, allowlist)
@@ -1,8 +1,23 @@
 # ABOUTME: Tests for the scrape command orchestration logic.
 # ABOUTME: Verifies book syncing from BookLore to cache and scrape coordination.
 
-from booklore_enrich.commands.scrape import sync_books_to_cache
+import asyncio
+
+from rich.progress import Progress
+
+from booklore_enrich.commands.scrape import (
+    BudgetedScraper,
+    JobClaimer,
+    RunBudget,
+    SlugGuesser,
+    parse_duration,
+    run_pipeline,
+    run_workers,
+    scrape_books_from_source,
+    sync_books_to_cache,
+)
 from booklore_enrich.db import Database
+from booklore_enrich.search_cache import SearchCache
 
 
 def test_sync_books_to_cache(tmp_path):
@@ -72,3 +87,381 @@ def test_update_book_series_from_scrape(tmp_path):
     assert updated["series"] == "My Series (Corrected)"
     assert updated["series_index"] == "1"
     assert updated["series_total"] == 5
+
+
+class FakeScraper:
+    """Stands in for BrowserScraper; tracks how many books are in flight."""
+
+    def __init__(self, results, guesses=None):
+        self.results = results
+        self.guesses = guesses or {}
+        self.searches = 0
+        self.book_fetches = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def search_book(self, base_url, title, author):
+        self.searches += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return self.results.get(title)
+
+    async def lookup_by_slug(self, base_url, title, author):
+        return self.guesses.get(title)
+
+    async def scrape_book(self, base_url, source_id, slug):
+        self.book_fetches += 1
+        return {
+            "categorized_tags": [{"name": "slow-burn", "category": "trope"}],
+            "steam_level": 3,
+            "steam_label": "Open door",
+        }
+
+
+async def scrape_one(db, scraper, book, **kwargs):
+    """Run one book through the pipeline and return its outcome."""
+    done = []
+    await run_pipeline(db, scraper, "romance.io", [book], 1,
+                       on_done=lambda _book, outcome: done.append(outcome), **kwargs)
+    return done[0]
+
+
+async def test_pipeline_stores_metadata(tmp_path):
+    db = Database(tmp_path / "test.db")
+    db.upsert_book(booklore_id=1, title="Found", author="Author")
+    book = db.get_book_by_booklore_id(1)
+    scraper = FakeScraper({"Found": {"source_id": "a" * 24, "slug": "found-author"}})
+    outcome = await scrape_one(db, scraper, book)
+    assert outcome == "found"
+    assert db.get_steam_level(book["id"])["level"] == 3
+    assert db.get_book_by_booklore_id(1)["romance_io_id"] == "a" * 24
+
+
+async def test_pipeline_skips_unmatched(tmp_path):
+    db = Database(tmp_path / "test.db")
+    db.upsert_book(booklore_id=1, title="Missing", author="Author")
+    book = db.get_book_by_booklore_id(1)
+    outcome = await scrape_one(db, FakeScraper({}), book)
+    assert outcome == "skipped"
+    assert db.get_scrape_attempt(book["id"], "romance.io")["last_outcome"] == "not_found"
+    assert db.enqueue_scrape_jobs("romance.io") == 0
+
+
+async def test_run_workers_respects_concurrency(tmp_path):
+    db = Database(tmp_path / "test.db")
+    for i in range(6):
+        db.upsert_book(booklore_id=i, title=f"Book {i}", author="Author")
+    books = [db.get_book_by_booklore_id(i) for i in range(6)]
+    scraper = FakeScraper({b["title"]: {"source_id": f"{i:024x}", "slug": "s"}
+                           for i, b in enumerate(books)})
+
+    async def handle(book):
+        return await scrape_one(db, scraper, book)
+
+    counts = await run_workers(books, 3, handle)
+    assert counts["found"] == 6
+    assert scraper.max_in_flight == 3
+    assert db.enqueue_scrape_jobs("romance.io") == 0
+
+
+async def test_search_cache_skips_repeat_searches(tmp_path):
+    db = Database(tmp_path / "test.db")
+    cache = SearchCache(tmp_path / "search.db")
+    db.upsert_book(booklore_id=1, title="Missing", author="Author")
+    book = db.get_book_by_booklore_id(1)
+    scraper = FakeScraper({})
+    assert await scrape_one(db, scraper, book, search_cache=cache) == "skipped"
+    assert await scrape_one(db, scraper, book, search_cache=cache) == "skipped"
+    assert scraper.searches == 1
+    # Only the real search counts towards the book's backoff
+    assert db.get_scrape_attempt(book["id"], "romance.io")["attempts"] == 1
+
+
+async def test_slug_guess_hit_skips_search_and_book_fetch(tmp_path):
+    db = Database(tmp_path / "test.db")
+    db.upsert_book(booklore_id=1, title="Guessed", author="Author")
+    book = db.get_book_by_booklore_id(1)
+    guessed = {
+        "source_id": "b" * 24, "slug": "guessed-author",
+        "metadata": {"categorized_tags": [{"name": "dark", "category": "subgenre"}]},
+    }
+    scraper = FakeScraper({}, guesses={"Guessed": guessed})
+    outcome = await scrape_one(db, scraper, book, guesser=SlugGuesser())
+    assert outcome == "found"
+    assert scraper.searches == 0
+    assert scraper.book_fetches == 0
+    assert [t["name"] for t in db.get_book_tags(book["id"])] == ["dark"]
+
+
+async def test_slug_guess_miss_falls_back_to_search(tmp_path):
+    db = Database(tmp_path / "test.db")
+    db.upsert_book(booklore_id=1, title="Found", author="Author")
+    book = db.get_book_by_booklore_id(1)
+    scraper = FakeScraper({"Found": {"source_id": "a" * 24, "slug": "found-author"}})
+    guesser = SlugGuesser()
+    outcome = await scrape_one(db, scraper, book, guesser=guesser)
+    assert outcome == "found"
+    assert scraper.searches == 1
+    assert (guesser.hits, guesser.attempts) == (0, 1)
+
+
+def test_slug_guesser_turns_off_below_break_even():
+    guesser = SlugGuesser(probe=4, min_hit_rate=0.5)
+    for hit in (True, False, False, False):
+        assert guesser.enabled
+        guesser.record(hit)
+    assert not guesser.enabled
+
+
+async def test_sources_share_one_scraper_concurrently(tmp_path):
+    db = Database(tmp_path / "test.db")
+    for i in range(3):
+        db.upsert_book(booklore_id=i, title=f"Book {i}", author="Author")
+    books = [db.get_book_by_booklore_id(i) for i in range(3)]
+    scraper = FakeScraper({b["title"]: {"source_id": "a" * 24, "slug": "s"} for b in books})
+    with Progress(disable=True) as progress:
+        summaries = await asyncio.gather(*(
+            scrape_books_from_source(db, scraper, source, books, 1, progress)
+            for source in ("romance.io", "booknaut")
+        ))
+    # Each source runs one book at a time, but the two overlap
+    assert scraper.max_in_flight == 2
+    assert summaries[0].startswith("  romance.io: 3 scraped")
+    assert summaries[1].startswith("  booknaut: 3 scraped")
+
+
+class SlowBookScraper(FakeScraper):
+    """Book page fetches also take time and count as in flight."""
+
+    async def scrape_book(self, base_url, source_id, slug):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return await super().scrape_book(base_url, source_id, slug)
+
+
+async def test_pipeline_caps_scraper_calls_at_concurrency(tmp_path):
+    db = Database(tmp_path / "test.db")
+    for i in range(4):
+        db.upsert_book(booklore_id=i, title=f"Book {i}", author="Author")
+    books = [db.get_book_by_booklore_id(i) for i in range(4)]
+    results = {b["title"]: {"source_id": f"{i:024x}", "slug": "s"} for i, b in enumerate(books)}
+    del results["Book 2"]
+    scraper = SlowBookScraper(results)
+    done = []
+    counts = await run_pipeline(db, scraper, "romance.io", books, 2,
+                                on_done=lambda book, outcome: done.append(outcome))
+    assert counts == {"found": 3, "skipped": 1, "failed": 0}
+    assert sorted(done) == ["found", "found", "found", "skipped"]
+    # Searches and book fetches together never hold more than two pages
+    assert scraper.max_in_flight == 2
+    assert scraper.book_fetches == 3
+    assert db.enqueue_scrape_jobs("romance.io") == 0
+
+
+async def test_pipeline_records_fetch_errors(tmp_path):
+    db = Database(tmp_path / "test.db")
+    db.upsert_book(booklore_id=1, title="Broken", author="Author")
+    books = [db.get_book_by_booklore_id(1)]
+
+    class BrokenScraper(FakeScraper):
+        async def scrape_book(self, base_url, source_id, slug):
+            raise RuntimeError("page crashed")
+
+    scraper = BrokenScraper({"Broken": {"source_id": "a" * 24, "slug": "broken"}})
+    counts = await run_pipeline(db, scraper, "romance.io", books, 2)
+    assert counts["failed"] == 1
+    assert db.get_scrape_attempt(books[0]["id"], "romance.io")["last_outcome"] == "error"
+
+
+async def test_two_workers_split_the_job_queue(tmp_path):
+    db = Database(tmp_path / "test.db")
+    for i in range(6):
+        db.upsert_book(booklore_id=i, title=f"Book {i}", author="Author")
+    db.enqueue_scrape_jobs("romance.io")
+    other = Database(tmp_path / "test.db")
+    scraper = FakeScraper({f"Book {i}": {"source_id": f"{i:024x}", "slug": "s"} for i in range(6)})
+    counts = await asyncio.gather(
+        run_pipeline(db, scraper, "romance.io", JobClaimer(db, "romance.io", "a", batch_size=2), 1),
+        run_pipeline(other, scraper, "romance.io", JobClaimer(other, "romance.io", "b", batch_size=2), 1),
+    )
+    assert counts[0]["found"] + counts[1]["found"] == 6
+    assert counts[0]["found"] and counts[1]["found"]
+    assert scraper.searches == 6
+
+
+def test_job_claimer_respects_limit_and_releases_leftovers(tmp_path):
+    db = Database(tmp_path / "test.db")
+    for i in range(5):
+        db.upsert_book(booklore_id=i, title=f"Book {i}", author="Author")
+    db.enqueue_scrape_jobs("romance.io")
+    claimer = JobClaimer(db, "romance.io", "a", limit=3, batch_size=2)
+    next(claimer)
+    assert claimer.claimed == 2
+    claimer.release()
+    assert db.count_claimable_jobs("romance.io") == 4
+    # Only one more book fits under the limit
+    assert len(list(claimer)) == 1
+    assert claimer.claimed == 3
+
+
+class RunnableScraper(FakeScraper):
+    """FakeScraper with the lifecycle surface run_scrape drives."""
+
+    is_remote = False
+    is_cdp = True
+    connected_endpoints = ["http://localhost:9222"]
+
+    def __init__(self, results):
+        super().__init__(results)
+        self.stopped = False
+
+    async def stop(self):
+        self.stopped = True
+
+
+def test_run_scrape_from_dir_end_to_end(tmp_path, monkeypatch):
+    from booklore_enrich.commands import scrape
+    from booklore_enrich.config import Config, scraper_options
+    from booklore_enrich.scraper import daemon
+    from booklore_enrich.scraper.rate_limit import HostRateLimiter
+
+    epub = tmp_path / "books" / "Jane Doe" / "Standalone" / "Cool Book.epub"
+    epub.parent.mkdir(parents=True)
+    epub.write_text("fake epub")
+    db_path = tmp_path / "cache.db"
+    # A recent miss on romance.io is only retried because of ignore_backoff
+    db = Database(db_path)
+    db.upsert_book_by_path(str(epub), "Cool Book", "Jane Doe")
+    db.record_scrape_attempt(db.get_book_by_path(str(epub))["id"], "romance.io", "not_found")
+    db.close()
+    config = Config(archive_enabled=False, persist_clearance=False, max_concurrent=2)
+    scraper = RunnableScraper({"Cool Book": {"source_id": "a" * 24, "slug": "cool-book"}})
+    opened = {}
+    limiter = HostRateLimiter(0, jitter=0)
+    saved = []
+
+    async def fake_open_scraper(**kwargs):
+        opened.update(kwargs)
+        return scraper
+
+    monkeypatch.setattr(scrape, "Database", lambda: Database(db_path))
+    monkeypatch.setattr(scrape, "load_config", lambda: config)
+    monkeypatch.setattr(scrape, "SearchCache",
+                        lambda **kwargs: SearchCache(tmp_path / "search.db", **kwargs))
+    monkeypatch.setattr(scrape, "make_rate_limiter", lambda config, rate_limit=None: limiter)
+    monkeypatch.setattr(limiter, "save", lambda *args: saved.append(True))
+    monkeypatch.setattr(daemon, "open_scraper", fake_open_scraper)
+
+    scrape.run_scrape(from_dir=str(tmp_path / "books"), ignore_backoff=True, max_requests=100)
+
+    assert scraper.stopped
+    assert opened["rate_limiter"] is limiter and saved
+    assert set(scraper_options(config)) <= set(opened)
+    book = Database(db_path).get_book_by_path(str(epub))
+    assert book["romance_io_id"] == "a" * 24
+    assert book["booknaut_id"] == "a" * 24
+    assert Database(db_path).get_book_tags(book["id"])
+    hit, result = SearchCache(tmp_path / "search.db").lookup("romance.io", "Cool Book", "Jane Doe")
+    assert hit and result["source_id"] == "a" * 24
+
+
+async def test_interrupted_run_releases_in_flight_leases(tmp_path, monkeypatch):
+    from booklore_enrich.commands.scrape import scrape_sources
+    from booklore_enrich.scraper import daemon
+
+    db = Database(tmp_path / "test.db")
+    db.upsert_book(booklore_id=1, title="Slow", author="Author")
+    started = asyncio.Event()
+
+    class HangingScraper(RunnableScraper):
+        async def scrape_book(self, base_url, source_id, slug):
+            started.set()
+            await asyncio.Event().wait()
+
+    scraper = HangingScraper({"Slow": {"source_id": "a" * 24, "slug": "slow"}})
+
+    async def fake_open_scraper(**kwargs):
+        return scraper
+
+    monkeypatch.setattr(daemon, "open_scraper", fake_open_scraper)
+    run = asyncio.create_task(scrape_sources(db, ["romance.io"], 0, True, 0))
+    await started.wait()
+    run.cancel()
+    await asyncio.gather(run, return_exceptions=True)
+
+    job = db.get_scrape_job(db.get_book_by_booklore_id(1)["id"], "romance.io")
+    assert (job["status"], job["worker_id"], job["stage"]) == ("pending", None, "searched")
+    assert scraper.stopped
+
+
+def test_parse_duration():
+    assert parse_duration("90") == 90
+    assert parse_duration("45s") == 45
+    assert parse_duration("30m") == 1800
+    assert parse_duration("2h") == 7200
+
+
+def test_budget_stops_claiming_and_leaves_jobs_queued(tmp_path):
+    db = Database(tmp_path / "test.db")
+    for i in range(5):
+        db.upsert_book(booklore_id=i, title=f"Book {i}", author="Author")
+    db.enqueue_scrape_jobs("romance.io")
+    budget = RunBudget(max_requests=2)
+    claimer = JobClaimer(db, "romance.io", "a", batch_size=5, budget=budget)
+    next(claimer)
+    budget.spend(2)
+    assert budget.exhausted
+    assert list(claimer) == []
+    claimer.release()
+    assert db.count_claimable_jobs("romance.io") == 4
+
+
+async def test_budget_defers_fetches_once_spent(tmp_path):
+    db = Database(tmp_path / "test.db")
+    for i in range(3):
+        db.upsert_book(booklore_id=i, title=f"Book {i}", author="Author")
+    db.enqueue_scrape_jobs("romance.io")
+    budget = RunBudget(max_requests=1)
+    scraper = BudgetedScraper(
+        FakeScraper({f"Book {i}": {"source_id": f"{i:024x}", "slug": "s"} for i in range(3)}),
+        budget)
+    claimer = JobClaimer(db, "romance.io", "a", batch_size=1, budget=budget)
+    counts = await run_pipeline(db, scraper, "romance.io", claimer, 1, budget=budget,
+                                defer=claimer.defer)
+    # The one search spent the budget, so its book was checkpointed, not fetched
+    assert counts["found"] == 0
+    assert scraper.book_fetches == 0
+    claimer.release()
+    assert db.count_claimable_jobs("romance.io") == 3
+    book = db.get_book_by_booklore_id(0)
+    assert db.get_scrape_job(book["id"], "romance.io")["stage"] == "searched"
+
+
+async def test_restart_resumes_from_checkpoints(tmp_path):
+    import datetime
+    db = Database(tmp_path / "test.db")
+    for i in range(2):
+        db.upsert_book(booklore_id=i, title=f"Book {i}", author="Author")
+    db.enqueue_scrape_jobs("romance.io")
+    # A previous run searched one book, fetched the other, then crashed
+    searched, fetched = db.claim_scrape_jobs("romance.io", "crashed", 2,
+                                             lease=datetime.timedelta(seconds=-1))
+    db.checkpoint_scrape_job(searched["id"], "romance.io", "searched",
+                             {"source_id": "a" * 24, "slug": "book-0"})
+    db.checkpoint_scrape_job(fetched["id"], "romance.io", "fetched",
+                             {"source_id": "b" * 24, "slug": "book-1"},
+                             {"categorized_tags": [{"name": "slow-burn", "category": "trope"}],
+                              "steam_level": 2})
+
+    scraper = FakeScraper({})
+    counts = await run_pipeline(db, scraper, "romance.io", JobClaimer(db, "romance.io", "b"), 1)
+    assert counts["found"] == 2
+    assert scraper.searches == 0
+    assert scraper.book_fetches == 1
+    assert db.get_book_by_booklore_id(1)["romance_io_id"] == "b" * 24
+    assert db.get_steam_level(fetched["id"])["level"] == 2
+    assert db.get_scrape_job(fetched["id"], "romance.io")["stage"] is None
@@ -1,7 +1,14 @@
 # ABOUTME: Tests for the base scraper HTML parsing utilities.
 # ABOUTME: Tests parse logic against static HTML without needing a live browser.
 
-from booklore_enrich.scraper.base import parse_book_page, parse_search_results, slugify
+from booklore_enrich.scraper.base import (
+    book_data_from_extract,
+    extract_from_html,
+    match_landing_page,
+    parse_book_page,
+    parse_search_results,
+    slugify,
+)
 
 
 def test_slugify_basic():
@@ -62,3 +69,59 @@ def test_parse_book_page_categorizes_tags():
     assert "enemies-to-lovers" in names_by_cat.get("trope", [])
     assert "alpha-male" in names_by_cat.get("hero-type", [])
     assert "competent-heroine" in names_by_cat.get("heroine-type", [])
+
+
+def test_match_landing_page_from_redirected_url():
+    url = "https://www.romance.io/books/abc123def456789012345678/fix-her-up-tessa-bailey"
+    match = match_landing_page(url, None, "Fix Her Up", "Tessa Bailey")
+    assert match == {"source_id": "abc123def456789012345678", "slug": "fix-her-up-tessa-bailey"}
+
+
+def test_match_landing_page_from_canonical_link():
+    canonical = "https://www.romance.io/books/abc123def456789012345678/fix-her-up-tessa-bailey"
+    match = match_landing_page("https://www.romance.io/books/fix-her-up-tessa-bailey", canonical,
+                               "Fix Her Up", "Tessa Bailey")
+    assert match["source_id"] == "abc123def456789012345678"
+
+
+def test_match_landing_page_rejects_other_book():
+    url = "https://www.romance.io/books/abc123def456789012345678/some-other-book-tessa-bailey"
+    assert match_landing_page(url, None, "Fix Her Up", "Tessa Bailey") is None
+
+
+def test_match_landing_page_rejects_wrong_author():
+    url = "https://www.romance.io/books/abc123def456789012345678/fix-her-up-someone-else"
+    assert match_landing_page(url, None, "Fix Her Up", "Tessa Bailey") is None
+
+
+def test_match_landing_page_rejects_non_book_page():
+    assert match_landing_page("https://www.romance.io/search?q=x", None,
+                              "Fix Her Up", "Tessa Bailey") is None
+
+
+def test_extract_from_html_keeps_only_needed_structures():
+    html = '''
+    <link rel="canonical" href="https://www.romance.io/books/abc123def456789012345678/cool-book">
+    <a href="/books/abc123def456789012345678/cool-book">Cool Book</a>
+    <a href="/topics/best/slow-burn/1">Slow Burn</a>
+    <a href="/about">About</a>
+    <div class="steam-level-4"></div>
+    '''
+    extract = extract_from_html(html)
+    assert extract["book_hrefs"] == ["/books/abc123def456789012345678/cool-book"]
+    assert extract["topic_hrefs"] == ["/topics/best/slow-burn/1"]
+    assert extract["steam_level"] == 4
+    assert extract["canonical"].endswith("/cool-book")
+
+
+def test_book_data_from_in_page_extract():
+    """The JSON shape returned by EXTRACT_JS parses the same as full HTML."""
+    extract = {
+        "book_hrefs": [],
+        "topic_hrefs": ["/topics/best/enemies%20to%20lovers,contemporary/1", "/topics/best/{x}/1"],
+        "steam_level": 2,
+    }
+    data = book_data_from_extract(extract)
+    assert data["tags"] == ["enemies-to-lovers", "contemporary"]
+    assert data["steam_level"] == 2
+    assert data["steam_label"] == "Behind closed doors"
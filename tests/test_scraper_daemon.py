@@ -0,0 +1,94 @@
+# ABOUTME: Tests for the scraper daemon and its RemoteScraper client.
+# ABOUTME: Runs the daemon on a temporary Unix socket in front of a fake scraper.
+
+import asyncio
+
+import pytest
+
+from booklore_enrich.scraper.base import FetchError
+from booklore_enrich.scraper.daemon import (
+    DaemonError,
+    RemoteScraper,
+    ScraperDaemon,
+    daemon_available,
+)
+
+
+class FakeScraper:
+    is_cdp = True
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def search_book(self, base_url, title, author):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.02)
+        self.in_flight -= 1
+        return {"source_id": "a" * 24, "slug": f"{title}-{author}"}
+
+    async def scrape_book(self, base_url, source_id, slug):
+        raise FetchError(f"Book page did not load: {slug}")
+
+
+async def start_daemon(tmp_path):
+    daemon = ScraperDaemon(FakeScraper(), tmp_path / "scraper.sock")
+    await daemon.start()
+    client = RemoteScraper(daemon.path)
+    await client.start()
+    return daemon, client
+
+
+async def test_remote_call_round_trip(tmp_path):
+    daemon, client = await start_daemon(tmp_path)
+    try:
+        assert client.is_cdp
+        result = await client.search_book("https://www.romance.io", "title", "author")
+        assert result == {"source_id": "a" * 24, "slug": "title-author"}
+    finally:
+        await client.stop()
+        await daemon.stop()
+
+
+async def test_remote_fetch_errors_are_reraised(tmp_path):
+    daemon, client = await start_daemon(tmp_path)
+    try:
+        with pytest.raises(FetchError):
+            await client.scrape_book("https://www.romance.io", "a" * 24, "slug")
+    finally:
+        await client.stop()
+        await daemon.stop()
+
+
+async def test_requests_on_one_connection_run_concurrently(tmp_path):
+    daemon, client = await start_daemon(tmp_path)
+    try:
+        results = await asyncio.gather(*(
+            client.search_book("https://www.romance.io", f"t{i}", "a") for i in range(3)
+        ))
+        assert [r["slug"] for r in results] == ["t0-a", "t1-a", "t2-a"]
+        assert daemon.scraper.max_in_flight == 3
+    finally:
+        await client.stop()
+        await daemon.stop()
+
+
+async def test_socket_removed_on_stop(tmp_path):
+    daemon, client = await start_daemon(tmp_path)
+    assert daemon_available(daemon.path)
+    await client.stop()
+    await daemon.stop()
+    assert not daemon.path.exists()
+    assert not daemon_available(daemon.path)
+
+
+async def test_second_daemon_refuses_to_start(tmp_path):
+    daemon, client = await start_daemon(tmp_path)
+    try:
+        with pytest.raises(DaemonError):
+            await ScraperDaemon(FakeScraper(), daemon.path).start()
+        assert daemon_available(daemon.path)
+    finally:
+        await client.stop()
+        await daemon.stop()
@@ -0,0 +1,182 @@
+# ABOUTME: Tests for the reusable browser context pool.
+# ABOUTME: Uses fake contexts/pages so no live browser is needed.
+
+import asyncio
+
+from booklore_enrich.scraper.pool import ContextPool, MultiEndpointPool, PageSlot
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+        self.broken = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def evaluate(self, expr):
+        if self.broken:
+            raise RuntimeError("renderer crashed")
+        return 1
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+def _factory(created):
+    async def make():
+        slot = PageSlot(FakeContext(), FakePage())
+        created.append(slot)
+        return slot
+    return make
+
+
+async def test_warm_opens_full_pool():
+    created = []
+    pool = ContextPool(_factory(created), size=3)
+    await pool.warm()
+    assert len(created) == 3
+    assert pool.live == 3
+
+
+async def test_slots_are_reused_across_fetches():
+    created = []
+    pool = ContextPool(_factory(created), size=1)
+    first = await pool.acquire()
+    await pool.release(first)
+    second = await pool.acquire()
+    assert second is first
+    assert len(created) == 1
+
+
+async def test_slot_recycled_after_max_uses():
+    created = []
+    pool = ContextPool(_factory(created), size=1, max_uses=2)
+    slot = await pool.acquire()
+    await pool.release(slot)
+    slot = await pool.acquire()
+    await pool.release(slot)
+    assert slot.context.closed
+    fresh = await pool.acquire()
+    assert fresh is not slot
+    assert len(created) == 2
+
+
+async def test_unhealthy_slot_is_replaced_on_acquire():
+    created = []
+    pool = ContextPool(_factory(created), size=1)
+    slot = await pool.acquire()
+    await pool.release(slot)
+    slot.page.broken = True
+    fresh = await pool.acquire()
+    assert fresh is not slot
+    assert slot.context.closed
+    assert pool.live == 1
+
+
+async def test_failed_fetch_retires_slot():
+    created = []
+    pool = ContextPool(_factory(created), size=1)
+    slot = await pool.acquire()
+    await pool.release(slot, healthy=False)
+    assert slot.context.closed
+    assert pool.live == 0
+
+
+async def test_acquire_blocks_when_pool_exhausted():
+    created = []
+    pool = ContextPool(_factory(created), size=1)
+    slot = await pool.acquire()
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    await pool.release(slot)
+    assert await asyncio.wait_for(waiter, 1) is slot
+
+
+async def test_waiter_gets_a_slot_after_a_retire():
+    created = []
+    pool = ContextPool(_factory(created), size=1)
+    slot = await pool.acquire()
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    await pool.release(slot, healthy=False)
+    fresh = await asyncio.wait_for(waiter, 1)
+    assert fresh is not slot
+    assert pool.live == 1
+    assert len(created) == 2
+
+
+async def test_close_closes_idle_slots():
+    created = []
+    pool = ContextPool(_factory(created), size=2)
+    await pool.warm()
+    await pool.close()
+    assert all(s.context.closed for s in created)
+    assert pool.live == 0
+
+
+def _failing_factory():
+    async def make():
+        raise RuntimeError("browser disconnected")
+    return make
+
+
+async def test_multi_endpoint_pool_spreads_load():
+    created_a, created_b = [], []
+    pool = MultiEndpointPool({"a": ContextPool(_factory(created_a), size=2),
+                              "b": ContextPool(_factory(created_b), size=2)})
+    first = await pool.acquire()
+    second = await pool.acquire()
+    assert len(created_a) == 1 and len(created_b) == 1
+    await pool.release(first)
+    await pool.release(second)
+    assert [e["fetches"] for e in pool.health()] == [1, 1]
+
+
+async def test_multi_endpoint_pool_spreads_concurrent_fetches():
+    class SlowPage(FakePage):
+        async def evaluate(self, expr):
+            await asyncio.sleep(0.01)
+            return 1
+
+    def slow_factory(created):
+        async def make():
+            slot = PageSlot(FakeContext(), SlowPage())
+            created.append(slot)
+            return slot
+        return make
+
+    created_a, created_b = [], []
+    pool = MultiEndpointPool({"a": ContextPool(slow_factory(created_a), size=2),
+                              "b": ContextPool(slow_factory(created_b), size=2)})
+    await pool.warm()
+    slots = await asyncio.wait_for(asyncio.gather(*(pool.acquire() for _ in range(4))), 1)
+    assert [e["in_use"] for e in pool.health()] == [2, 2]
+    assert {id(s) for s in slots} == {id(s) for s in created_a + created_b}
+
+
+async def test_multi_endpoint_pool_skips_dead_endpoint():
+    created = []
+    pool = MultiEndpointPool({"dead": ContextPool(_failing_factory(), size=1),
+                              "live": ContextPool(_factory(created), size=1)},
+                             failure_threshold=1)
+    slot = await pool.acquire()
+    assert slot is created[0]
+    assert [e["up"] for e in pool.health()] == [False, True]
+
+
+async def test_multi_endpoint_pool_rests_endpoint_after_failed_fetches():
+    pool = MultiEndpointPool({"a": ContextPool(_factory([]), size=1),
+                              "b": ContextPool(_factory([]), size=1)},
+                             failure_threshold=2)
+    for _ in range(2):
+        slot = await pool.acquire()
+        await pool.release(slot, healthy=False)
+    assert [e["up"] for e in pool.health()] == [False, True]
@@ -0,0 +1,43 @@
+# ABOUTME: Tests for the persistent search-result cache.
+# ABOUTME: Covers key normalization, match/no-match storage, and no-match expiry.
+
+import datetime
+
+from booklore_enrich.search_cache import SearchCache, search_key
+
+MATCH = {"source_id": "abc123def456789012345678", "slug": "cool-book-author"}
+
+
+def test_search_key_normalizes_case_and_punctuation():
+    assert search_key("It's A Test!", "O'Brien") == search_key("its a test", "OBRIEN")
+
+
+def test_search_key_keeps_title_and_author_apart():
+    assert search_key("A B", "C") != search_key("A", "B C")
+
+
+def test_lookup_miss(tmp_path):
+    cache = SearchCache(tmp_path / "search.db")
+    assert cache.lookup("romance.io", "Book", "Author") == (False, None)
+
+
+def test_store_and_lookup_match(tmp_path):
+    cache = SearchCache(tmp_path / "search.db")
+    cache.store("romance.io", "Book", "Author", MATCH)
+    assert cache.lookup("romance.io", "book", "author") == (True, MATCH)
+    assert cache.lookup("booknaut", "Book", "Author") == (False, None)
+
+
+def test_match_survives_reopen(tmp_path):
+    SearchCache(tmp_path / "search.db").store("romance.io", "Book", "Author", MATCH)
+    assert SearchCache(tmp_path / "search.db").lookup("romance.io", "Book", "Author") == (True, MATCH)
+
+
+def test_no_match_cached_until_expiry(tmp_path):
+    cache = SearchCache(tmp_path / "search.db", no_match_ttl_days=30)
+    cache.store("romance.io", "Book", "Author", None)
+    assert cache.lookup("romance.io", "Book", "Author") == (True, None)
+    past = (datetime.datetime.now(datetime.timezone.utc)
+            - datetime.timedelta(days=1)).isoformat()
+    cache.conn.execute("UPDATE search_cache SET expires_at = ?", (past,))
+    assert cache.lookup("romance.io", "Book", "Author") == (False, None)
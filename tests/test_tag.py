@@ -7,6 +7,7 @@ from click.testing import CliRunner
 
 from booklore_enrich.cli import cli
 from booklore_enrich.commands.tag import (
+    build_plans,
     build_shelf_plan,
     build_tag_plan,
     run_tag,
@@ -50,6 +51,23 @@ def test_build_shelf_plan_maps_books(tmp_path):
     assert 2 in etl_shelf["booklore_ids"]
 
 
+def test_build_plans_reads_the_cache_once(tmp_path):
+    db = _setup_enriched_db(tmp_path)
+    reads = []
+    iter_enriched_books = db.iter_enriched_books
+
+    def counting_iter(*args, **kwargs):
+        reads.append(1)
+        return iter_enriched_books(*args, **kwargs)
+
+    db.iter_enriched_books = counting_iter
+    shelf_plan, tag_plan = build_plans(db)
+    assert len(reads) == 1
+    db.iter_enriched_books = iter_enriched_books
+    assert shelf_plan == build_shelf_plan(db)
+    assert tag_plan == build_tag_plan(db)
+
+
 def test_build_tag_plan(tmp_path):
     db = _setup_enriched_db(tmp_path)
     plan = build_tag_plan(db)
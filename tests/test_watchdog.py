@@ -0,0 +1,57 @@
+# ABOUTME: Tests for the browser wear watchdog and /proc memory sampling.
+# ABOUTME: Builds a fake /proc tree so RSS totals are deterministic.
+
+from booklore_enrich.scraper import watchdog
+from booklore_enrich.scraper.watchdog import BrowserWatchdog, descendant_rss_mb
+
+
+def fake_proc(tmp_path, processes):
+    """processes: {pid: (ppid, rss_kb)}"""
+    for pid, (ppid, rss_kb) in processes.items():
+        entry = tmp_path / str(pid)
+        entry.mkdir()
+        (entry / "stat").write_text(f"{pid} (chrome (renderer)) S {ppid} 1 1 0")
+        (entry / "status").write_text(f"Name:\tchrome\nVmRSS:\t{rss_kb} kB\n")
+    return tmp_path
+
+
+def test_descendant_rss_sums_the_whole_subtree(tmp_path):
+    proc = fake_proc(tmp_path, {
+        100: (1, 50_000),       # this process, not counted
+        200: (100, 10_240),     # playwright driver
+        300: (200, 102_400),    # chromium
+        301: (300, 204_800),    # renderer
+        999: (1, 512_000),      # unrelated
+    })
+    assert descendant_rss_mb(100, proc) == 310.0
+
+
+def test_descendant_rss_without_proc(tmp_path):
+    assert descendant_rss_mb(100, tmp_path / "missing") is None
+
+
+def test_due_after_max_navigations():
+    dog = BrowserWatchdog(max_navigations=3, max_rss_mb=0)
+    for _ in range(2):
+        dog.record_navigation()
+    assert dog.due() is None
+    dog.record_navigation()
+    assert dog.due() == "3 navigations"
+    dog.reset()
+    assert dog.due() is None
+
+
+def test_due_when_memory_crosses_threshold(monkeypatch):
+    monkeypatch.setattr(watchdog, "descendant_rss_mb", lambda: 4096.0)
+    dog = BrowserWatchdog(max_navigations=0, max_rss_mb=2048)
+    for _ in range(watchdog.RSS_CHECK_INTERVAL):
+        dog.record_navigation()
+    assert dog.due() == "4096 MB resident"
+
+
+def test_memory_not_sampled_for_cdp_browsers(monkeypatch):
+    monkeypatch.setattr(watchdog, "descendant_rss_mb", lambda: 4096.0)
+    dog = BrowserWatchdog(max_navigations=0, max_rss_mb=2048, measure_rss=False)
+    for _ in range(watchdog.RSS_CHECK_INTERVAL):
+        dog.record_navigation()
+    assert dog.due() is None